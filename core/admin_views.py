@@ -1,10 +1,9 @@
 from rest_framework import viewsets, views
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Count, Q
-from django.utils import timezone
-from datetime import timedelta
-from .models import TeamMember
+from .cache import cache_stats
+from .dashboard import Dashboard
 from .permissions import IsAdminUser
 
 
@@ -16,71 +15,12 @@ class AdminDashboardViewSet(viewsets.ViewSet):
     
     def list(self, request):
         """Get admin dashboard statistics"""
-        from interactions.models import Interaction
-        from volunteers.models import Volunteer
-        
-        # Team statistics
-        total_team_members = TeamMember.objects.count()
-        active_team_members = TeamMember.objects.filter(is_active=True).count()
-        admin_users = TeamMember.objects.filter(role='admin').count()
-        
-        # Interaction statistics
-        total_interactions = Interaction.objects.count()
-        
-        # Recent activity (last 30 days)
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        recent_interactions = Interaction.objects.filter(
-            interaction_date__gte=thirty_days_ago
-        ).count()
-        
-        # Follow-up statistics
-        pending_followups = Interaction.objects.filter(
-            needs_followup=True,
-            followup_completed=False
-        ).count()
-        
-        overdue_followups = Interaction.objects.filter(
-            needs_followup=True,
-            followup_completed=False,
-            followup_date__lt=timezone.now().date()
-        ).count()
-        
-        # Volunteer statistics
-        total_volunteers = Volunteer.objects.count()
-        
-        # Team member activity
-        team_activity = TeamMember.objects.annotate(
-            interaction_count=Count('interactions')
-        ).filter(is_active=True).order_by('-interaction_count')[:5]
-        
-        team_activity_data = [
-            {
-                'id': member.id,
-                'name': member.full_name,
-                'interaction_count': member.interaction_count
-            }
-            for member in team_activity
-        ]
-        
-        return Response({
-            'team': {
-                'total': total_team_members,
-                'active': active_team_members,
-                'admins': admin_users,
-            },
-            'interactions': {
-                'total': total_interactions,
-                'last_30_days': recent_interactions,
-            },
-            'followups': {
-                'pending': pending_followups,
-                'overdue': overdue_followups,
-            },
-            'volunteers': {
-                'total': total_volunteers,
-            },
-            'team_activity': team_activity_data,
-        })
+        return Response(Dashboard(request.user).panel('admin'))
+
+    @action(detail=False, methods=['get'])
+    def cache(self, request):
+        """Statistics cache hit/miss counts for the worker serving this request"""
+        return Response(cache_stats())
 
 
 class SettingsView(views.APIView):
@@ -0,0 +1,63 @@
+"""
+Cache for dashboard and admin statistics.
+
+Entries live in Django's default cache (local memory unless CACHE_BACKEND
+says otherwise) under keys carrying the `stats` DataVersion. Interaction,
+volunteer and team member writes and finished PCO syncs bump that
+version, which orphans every cached entry at once; the timeout only
+bounds how long orphans take up space. Keys also carry today's date,
+since "this month" and "overdue" move at midnight.
+"""
+import threading
+from collections import Counter
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from .models import DataVersion
+
+STATS_VERSION = 'stats'
+KEY_PREFIX = 'stats'
+
+_counts = Counter()
+_counts_lock = threading.Lock()
+_missing = object()
+
+
+def stats_changed():
+    """Invalidate cached statistics once the writing transaction commits"""
+    DataVersion.bump_on_commit(STATS_VERSION)
+
+
+def stats_version():
+    return DataVersion.current(STATS_VERSION)
+
+
+def stats_key(name, *parts, version):
+    suffix = ':'.join(str(part) for part in parts)
+    return f'{KEY_PREFIX}:{version}:{timezone.now().date().isoformat()}:{name}:{suffix}'
+
+
+def get_or_compute(key, compute):
+    """The cached value for `key`, computing and storing it on a miss"""
+    value = cache.get(key, _missing)
+    hit = value is not _missing
+    with _counts_lock:
+        _counts['hits' if hit else 'misses'] += 1
+    if not hit:
+        value = compute()
+        cache.set(key, value, getattr(settings, 'STATS_CACHE_TIMEOUT', 86400))
+    return value
+
+
+def cache_stats():
+    """Hit and miss counts of this process since it started"""
+    with _counts_lock:
+        hits, misses = _counts['hits'], _counts['misses']
+    lookups = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / lookups, 3) if lookups else None,
+        'version': stats_version(),
+        'backend': settings.CACHES['default']['BACKEND'].rsplit('.', 1)[-1],
+    }
@@ -0,0 +1,293 @@
+"""
+Dashboard panels.
+
+Each panel is a method of Dashboard returning the data one
+/api/dashboard/<panel>/ endpoint serves. Panels share their aggregate
+queries: every interaction counter on the dashboard comes from a single
+conditional aggregate() over interactions, and the volunteer totals and
+engagement buckets from one pass over volunteers joined to their
+engagement rollup. Trends, team activity and personal stats read the
+daily interaction rollup rather than every interaction.
+/api/dashboard/bundle/?panels=... serves several
+panels in one request, so that work is done once. Panel data is cached
+until the next write (see core/cache.py).
+"""
+from datetime import date, timedelta
+from django.db.models import Count, F, Max, Q, Sum
+from django.db.models.functions import Coalesce, Trunc
+from django.utils import timezone
+from django.utils.functional import cached_property
+from rest_framework.exceptions import ValidationError
+from volunteers.models import Volunteer
+from interactions.models import DailyInteractionRollup, Interaction
+from .cache import get_or_compute, stats_key, stats_version
+from .models import TeamMember
+from .params import int_param
+
+PANELS = [
+    'overview', 'trends', 'team_activity', 'volunteers_need_checkin',
+    'recent_interactions', 'upcoming_followups', 'my_stats', 'engagement_metrics',
+]
+# Panels that differ per user, and the query parameters each panel reads
+USER_PANELS = {'my_stats'}
+PANEL_PARAMS = {
+    'trends': ('granularity', 'start', 'end', 'topic'),
+    'team_activity': ('start', 'end'),
+    'recent_interactions': ('limit',),
+    'upcoming_followups': ('days',),
+}
+# Integer parameters: (default, minimum, maximum); out of range values are clamped
+INT_PARAMS = {
+    'limit': (10, 1, 100),
+    'days': (7, 0, 365),
+}
+GRANULARITIES = ['week', 'month', 'quarter']
+ALL_TOPICS = DailyInteractionRollup.ALL_TOPICS
+
+
+class Dashboard:
+    """Dashboard panels for one request; shared aggregates run at most once"""
+
+    def __init__(self, user, params=None):
+        self.user = user
+        self.params = params or {}
+        self.today = timezone.now().date()
+        self.thirty_days_ago = self.today - timedelta(days=30)
+
+    def panels(self, names):
+        """{panel: data} for each name in `names`"""
+        return {name: self.panel(name) for name in names}
+
+    def panel(self, name):
+        """One panel's data, from the stats cache unless something was written since"""
+        parts = [self.user.pk if name in USER_PANELS else '']
+        # Integer parameters go in normalized, so the keys stay bounded
+        parts += [
+            self._int_param(param) if param in INT_PARAMS else self.params.get(param, '')
+            for param in PANEL_PARAMS.get(name, ())
+        ]
+        key = stats_key(name, *parts, version=self.version)
+        return get_or_compute(key, getattr(self, name))
+
+    @cached_property
+    def version(self):
+        return stats_version()
+
+    # Shared aggregates
+
+    @cached_property
+    def interaction_counts(self):
+        """Every interaction counter the panels use, in one pass"""
+        open_followup = Q(needs_followup=True, followup_completed=False)
+        return Interaction.objects.aggregate(
+            total=Count('pk'),
+            this_month=Count('pk', filter=Q(interaction_date__gte=self.thirty_days_ago)),
+            pending_followups=Count('pk', filter=open_followup),
+            overdue_followups=Count('pk', filter=open_followup & Q(followup_date__lt=self.today)),
+        )
+
+    @cached_property
+    def volunteer_counts(self):
+        """
+        Volunteer total and engagement buckets in one pass over the
+        engagement rollup; volunteers without a rollup row have never
+        been contacted
+        """
+        sixty_days_ago = self.today - timedelta(days=60)
+        last = 'engagement__last_interaction_date'
+        return Volunteer.objects.aggregate(
+            total=Count('pk'),
+            never_contacted=Count('pk', filter=Q(engagement__isnull=True)),
+            at_risk=Count('pk', filter=Q(**{f'{last}__lt': sixty_days_ago})),
+            moderately_engaged=Count('pk', filter=Q(**{
+                f'{last}__gte': sixty_days_ago, f'{last}__lt': self.thirty_days_ago})),
+            highly_engaged=Count('pk', filter=Q(**{f'{last}__gte': self.thirty_days_ago})),
+            total_interactions=Sum('engagement__interaction_count'),
+        )
+
+    def _int_param(self, name):
+        return int_param(self.params, name, *INT_PARAMS[name])
+
+    def _date_param(self, name, default=None):
+        value = self.params.get(name)
+        if not value:
+            return default
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise ValidationError({name: 'Expected a date as YYYY-MM-DD.'})
+
+    def _date_range(self, prefix=''):
+        """Q for ?start=/?end= (inclusive) on the rollup date field at `prefix`"""
+        start, end = self._date_param('start'), self._date_param('end')
+        condition = Q()
+        if start:
+            condition &= Q(**{f'{prefix}date__gte': start})
+        if end:
+            condition &= Q(**{f'{prefix}date__lte': end})
+        return condition
+
+    # Panels
+
+    def overview(self):
+        counts = self.interaction_counts
+        return {
+            'total_volunteers': self.volunteer_counts['total'],
+            'total_interactions': counts['total'],
+            'interactions_this_month': counts['this_month'],
+            'pending_followups': counts['pending_followups'],
+            'overdue_followups': counts['overdue_followups'],
+            'active_team_members': TeamMember.objects.filter(is_active=True).count(),
+        }
+
+    def trends(self):
+        """
+        Interactions per ?granularity= (week, month or quarter; default
+        month) from ?start= (default 6 months ago) to ?end=, optionally for
+        one ?topic=. Each entry is keyed by the granularity.
+        """
+        granularity = self.params.get('granularity') or 'month'
+        if granularity not in GRANULARITIES:
+            raise ValidationError({'granularity': f'Expected one of {", ".join(GRANULARITIES)}.'})
+
+        rollups = DailyInteractionRollup.objects.filter(
+            topic=self.params.get('topic', ALL_TOPICS),
+            date__gte=self._date_param('start', self.today - timedelta(days=180)),
+        )
+        end = self._date_param('end')
+        if end:
+            rollups = rollups.filter(date__lte=end)
+        return list(rollups.annotate(
+            **{granularity: Trunc('date', granularity)}
+        ).values(granularity).annotate(
+            interaction_count=Sum('interaction_count')
+        ).order_by(granularity))
+
+    def team_activity(self):
+        """Active team members' interactions, all-time or between ?start= and ?end="""
+        days = Q(daily_rollups__topic=ALL_TOPICS)
+        return list(TeamMember.objects.filter(
+            is_active=True
+        ).annotate(
+            total_interactions=Coalesce(Sum(
+                'daily_rollups__interaction_count',
+                filter=days & self._date_range('daily_rollups__')
+            ), 0),
+            interactions_this_month=Coalesce(Sum(
+                'daily_rollups__interaction_count',
+                filter=days & Q(daily_rollups__date__gte=self.thirty_days_ago)
+            ), 0),
+            last_interaction_date=Max('daily_rollups__date', filter=days)
+        ).values(
+            'id', 'first_name', 'last_name',
+            'total_interactions', 'interactions_this_month', 'last_interaction_date'
+        ).order_by('-total_interactions'))
+
+    def volunteers_need_checkin(self):
+        """Volunteers with no contact in 30+ days, read from the engagement rollup"""
+        return list(Volunteer.objects.filter(
+            Q(engagement__last_interaction_date__lt=self.thirty_days_ago) |
+            Q(engagement__last_interaction_date__isnull=True)
+        ).annotate(
+            last_interaction_date=F('engagement__last_interaction_date'),
+            total_interactions=Coalesce('engagement__interaction_count', 0)
+        ).values(
+            'id', 'first_name', 'last_name', 'email', 'phone',
+            'last_interaction_date', 'total_interactions'
+        ).order_by('last_interaction_date')[:20])
+
+    def recent_interactions(self):
+        from interactions.serializers import InteractionSerializer
+
+        recent = Interaction.objects.select_related(
+            'volunteer', 'team_member'
+        ).defer('search_vector').order_by('-created_at')[:self._int_param('limit')]
+        return list(InteractionSerializer(recent, many=True).data)
+
+    def upcoming_followups(self):
+        from interactions.serializers import InteractionSerializer
+
+        end_date = self.today + timedelta(days=self._int_param('days'))
+        upcoming = Interaction.objects.filter(
+            needs_followup=True,
+            followup_completed=False,
+            followup_date__lte=end_date,
+            followup_date__gte=self.today
+        ).select_related('volunteer', 'team_member').defer('search_vector').order_by('followup_date')
+        return list(InteractionSerializer(upcoming, many=True).data)
+
+    def my_stats(self):
+        counts = DailyInteractionRollup.objects.filter(
+            team_member=self.user, topic=ALL_TOPICS
+        ).aggregate(
+            total=Coalesce(Sum('interaction_count'), 0),
+            this_month=Coalesce(Sum(
+                'interaction_count', filter=Q(date__gte=self.thirty_days_ago)), 0),
+            this_week=Coalesce(Sum(
+                'interaction_count', filter=Q(date__gte=self.today - timedelta(days=7))), 0),
+            pending_followups=Coalesce(Sum('open_followup_count'), 0),
+            last_interaction_date=Max('date'),
+        )
+        return {
+            'total_interactions': counts['total'],
+            'interactions_this_month': counts['this_month'],
+            'interactions_this_week': counts['this_week'],
+            'my_pending_followups': counts['pending_followups'],
+            # Distinct over all time, which daily tallies can't add up to
+            'volunteers_contacted': Interaction.objects.filter(
+                team_member=self.user).values('volunteer').distinct().count(),
+            'last_interaction_date': counts['last_interaction_date'],
+        }
+
+    def engagement_metrics(self):
+        counts = self.volunteer_counts
+        total_volunteers = counts['total']
+        total_interactions = counts['total_interactions'] or 0
+        return {
+            'never_contacted': counts['never_contacted'],
+            'at_risk': counts['at_risk'],
+            'moderately_engaged': counts['moderately_engaged'],
+            'highly_engaged': counts['highly_engaged'],
+            'avg_interactions_per_volunteer': round(
+                total_interactions / total_volunteers if total_volunteers > 0 else 0,
+                2
+            ),
+        }
+
+    def admin(self):
+        """Admin dashboard statistics"""
+        counts = self.interaction_counts
+        team = TeamMember.objects.aggregate(
+            total=Count('pk'),
+            active=Count('pk', filter=Q(is_active=True)),
+            admins=Count('pk', filter=Q(role='admin')),
+        )
+        team_activity = TeamMember.objects.annotate(
+            interaction_count=Coalesce(Sum(
+                'daily_rollups__interaction_count',
+                filter=Q(daily_rollups__topic=ALL_TOPICS)
+            ), 0)
+        ).filter(is_active=True).order_by('-interaction_count')[:5]
+
+        return {
+            'team': team,
+            'interactions': {
+                'total': counts['total'],
+                'last_30_days': counts['this_month'],
+            },
+            'followups': {
+                'pending': counts['pending_followups'],
+                'overdue': counts['overdue_followups'],
+            },
+            'volunteers': {
+                'total': self.volunteer_counts['total'],
+            },
+            'team_activity': [
+                {
+                    'id': member.id,
+                    'name': member.full_name,
+                    'interaction_count': member.interaction_count
+                }
+                for member in team_activity
+            ],
+        }
@@ -0,0 +1,37 @@
+# core/management/commands/warm_stats_cache.py
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core.cache import cache_stats
+from core.dashboard import PANELS, USER_PANELS, Dashboard
+from core.models import TeamMember
+
+
+class Command(BaseCommand):
+    help = ('Pre-compute the cached dashboard and admin statistics (shared panels, '
+            'plus per-user panels for every active team member), e.g. after a deploy')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('Warming statistics cache...'))
+        if settings.CACHES['default']['BACKEND'].endswith('LocMemCache'):
+            self.stdout.write(self.style.WARNING(
+                '⚠️  Local-memory cache: entries only live in this process, so web '
+                'workers will not see them. Set CACHE_BACKEND to a file or database cache.'))
+
+        before = cache_stats()
+        start = time.perf_counter()
+        shared = Dashboard(None)
+        shared.panels([name for name in PANELS if name not in USER_PANELS] + ['admin'])
+
+        members = TeamMember.objects.filter(is_active=True)
+        for member in members:
+            Dashboard(member).panels(USER_PANELS)
+
+        after = cache_stats()
+        computed = after['misses'] - before['misses']
+        cached = after['hits'] - before['hits']
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Warmed {len(PANELS) - len(USER_PANELS) + 1} shared panels and '
+            f'{len(USER_PANELS)} per-user panels for {len(members)} team members '
+            f'in {time.perf_counter() - start:.2f}s '
+            f'({computed} computed, {cached} already cached)'))
@@ -1,5 +1,8 @@
+import threading
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
 
 class TeamMember(AbstractUser):
     """
@@ -28,4 +31,58 @@ class TeamMember(AbstractUser):
     
     @property
     def is_admin(self):
-        return self.role == 'admin'
\ No newline at end of file
+        return self.role == 'admin'
+
+
+class DataVersion(models.Model):
+    """
+    Named counters bumped whenever the data they describe changes, so
+    process-local caches (one per gunicorn worker) can tell they're stale
+    with a single primary-key lookup
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'data_versions'
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+    # Per thread: {name: token of the bump the current transaction awaits}
+    _pending = threading.local()
+
+    @classmethod
+    def bump(cls, name):
+        """Advance a counter now; writers want bump_on_commit()"""
+        updated = cls.objects.filter(name=name).update(
+            version=F('version') + 1, updated_at=timezone.now())
+        if not updated:
+            cls.objects.get_or_create(name=name, defaults={'version': 1})
+
+    @classmethod
+    def bump_on_commit(cls, name):
+        """
+        Advance a counter once the current transaction commits (right away
+        outside one). Bumping inside the transaction would hold the row's
+        lock until commit, serializing every writer, and let readers see
+        the new version before the new rows. Every callback of a
+        transaction carries the same token and only the first to run
+        bumps, so a transaction bumps once however many writes it makes;
+        callbacks dropped by a rollback never ran, so they can't stop a
+        later transaction's bump.
+        """
+        pending = cls._pending.__dict__
+        token = pending.setdefault(name, object())
+
+        def bump():
+            if pending.get(name) is token:
+                del pending[name]
+                cls.bump(name)
+
+        transaction.on_commit(bump)
+
+    @classmethod
+    def current(cls, name):
+        return cls.objects.filter(name=name).values_list('version', flat=True).first() or 0
@@ -0,0 +1,172 @@
+"""
+API pagination.
+
+Page numbers stay the default (?page=N) so existing clients keep working.
+Views that declare `keyset_ordering` also accept ?cursor= (empty for the
+first page), which seeks on an indexed composite key instead of using
+OFFSET and skips the COUNT(*), so every page costs the same however deep
+the client goes. Totals are opt-in with ?count=exact or ?count=estimate
+(the Postgres planner's row estimate).
+"""
+import base64
+import binascii
+import json
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimated_count(queryset):
+    """
+    Row count from the query planner on Postgres (no scan); an exact
+    COUNT(*) on other databases
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset (cursor) mode.
+
+    A view opts in with `keyset_ordering`, a unique, non-null key such as
+    ('last_name', 'first_name', 'id'); prefix a field with '-' for
+    descending. In cursor mode the results always follow that ordering,
+    overriding ?ordering= and search ranking.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.keyset = getattr(view, 'keyset_ordering', None)
+        self.count_mode = request.query_params.get(self.count_query_param)
+        if self.keyset and self.cursor_query_param in request.query_params:
+            return self._paginate_keyset(queryset, request)
+        self.keyset = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({
+            'count': self.count,
+            'next': self.next_link,
+            'previous': self.previous_link,
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema['properties']['count']['nullable'] = True
+        return schema
+
+    # Keyset mode
+
+    def _paginate_keyset(self, queryset, request):
+        page_size = self.get_page_size(request)
+        position, backwards = self._decode_cursor(request.query_params[self.cursor_query_param])
+
+        ordering = [field if not backwards else self._flip(field) for field in self.keyset]
+        page = queryset.order_by(*ordering)
+        try:
+            if position is not None:
+                page = page.filter(self._after(position, ordering))
+            rows = list(page[:page_size + 1])
+        except (TypeError, ValueError, DjangoValidationError):
+            # Well-formed but tampered: values the key's fields can't hold
+            raise ValidationError({self.cursor_query_param: self.invalid_cursor_message})
+
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backwards:
+            rows.reverse()
+
+        # Going forwards there is a previous page whenever we started
+        # after some position, and vice versa
+        has_next = has_more if not backwards else position is not None
+        has_previous = position is not None if not backwards else has_more
+        self.next_link = self._link(rows[-1], False) if rows and has_next else None
+        self.previous_link = self._link(rows[0], True) if rows and has_previous else None
+        if position is not None and not rows:
+            # Stepped past the end (rows deleted since); offer the way back
+            self.previous_link = self._url(self._encode_cursor(position, True))
+
+        self.count = None
+        if self.count_mode == 'exact':
+            self.count = queryset.count()
+        elif self.count_mode == 'estimate':
+            self.count = estimated_count(queryset)
+        return rows
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def _after(position, ordering):
+        """
+        Rows strictly after `position` in `ordering`, as
+        (a > A) OR (a = A AND b > B) OR ... plus a redundant a >= A so the
+        database can range-scan the leading index column
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        leading = ordering[0]
+        lookup = 'lte' if leading.startswith('-') else 'gte'
+        return Q(**{f'{leading.lstrip("-")}__{lookup}': position[0]}) & condition
+
+    def _position(self, row):
+        return [self._plain(getattr(row, field.lstrip('-'))) for field in self.keyset]
+
+    @staticmethod
+    def _plain(value):
+        return value.isoformat() if hasattr(value, 'isoformat') else value
+
+    def _link(self, row, backwards):
+        return self._url(self._encode_cursor(self._position(row), backwards))
+
+    def _url(self, cursor):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    @staticmethod
+    def _encode_cursor(position, backwards):
+        payload = json.dumps({'p': position, 'b': backwards}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def _decode_cursor(self, cursor):
+        """(position or None for the first page, backwards)"""
+        if not cursor:
+            return None, False
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            position, backwards = payload['p'], bool(payload.get('b'))
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError, binascii.Error):
+            raise ValidationError({self.cursor_query_param: self.invalid_cursor_message})
+        if (not isinstance(position, list) or len(position) != len(self.keyset)
+                or not all(isinstance(value, (str, int, float)) for value in position)):
+            raise ValidationError({self.cursor_query_param: self.invalid_cursor_message})
+        return position, backwards
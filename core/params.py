@@ -0,0 +1,18 @@
+"""
+Query parameter parsing shared by the API views
+"""
+from rest_framework.exceptions import ValidationError
+
+
+def int_param(params, name, default, minimum, maximum):
+    """
+    Integer query parameter `name`, clamped to [minimum, maximum]. Missing
+    or blank gives `default`; anything that isn't a whole number is a 400.
+    """
+    value = params.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        return min(max(int(value), minimum), maximum)
+    except ValueError:
+        raise ValidationError({name: 'Expected a whole number.'})
@@ -1,9 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 from .models import TeamMember
+from .sparse import SparseFieldsSerializerMixin
 
-class TeamMemberSerializer(serializers.ModelSerializer):
-    """Serializer for team member details"""
+class TeamMemberSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
+    """Serializer for team member details (supports ?fields= and ?omit=)"""
     full_name = serializers.ReadOnlyField()
     interaction_count = serializers.SerializerMethodField()
     
@@ -15,8 +16,16 @@ class TeamMemberSerializer(serializers.ModelSerializer):
             'interaction_count'
         ]
         read_only_fields = ['id', 'created_at']
+        compact_fields = ['id', 'username', 'full_name', 'role', 'is_active']
+        field_sources = {
+            'full_name': ('first_name', 'last_name'),
+            'interaction_count': (),
+        }
     
     def get_interaction_count(self, obj):
+        # Views annotate this to avoid a COUNT per team member
+        if hasattr(obj, 'annotated_interaction_count'):
+            return obj.annotated_interaction_count
         return obj.interactions.count()
 
 class TeamMemberCreateSerializer(serializers.ModelSerializer):
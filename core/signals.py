@@ -0,0 +1,21 @@
+"""
+Invalidate cached statistics on team member writes. Interactions and
+volunteers do the same in their own apps' signals.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .cache import stats_changed
+from .models import TeamMember
+
+
+@receiver(post_save, sender=TeamMember)
+def team_member_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Logins only touch last_login, which no statistic reads
+    if raw or (update_fields is not None and set(update_fields) <= {'last_login'}):
+        return
+    stats_changed()
+
+
+@receiver(post_delete, sender=TeamMember)
+def team_member_deleted(sender, instance, **kwargs):
+    stats_changed()
@@ -0,0 +1,157 @@
+"""
+Sparse fieldsets for API responses.
+
+GET endpoints whose serializer uses SparseFieldsSerializerMixin accept
+?fields=a,b to return only those fields, ?omit=a,b to drop some, and
+?fields=compact for the serializer's compact profile (what a list row
+needs, without long text columns). Views using SparseFieldsViewMixin also
+narrow the SQL with only() to the columns and joins the selected fields
+read, so unused columns and joins are never fetched.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+COMPACT = 'compact'
+
+
+def _names(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def select_fields(serializer_class, available, query_params):
+    """
+    The field names `query_params` select from `available` (in serializer
+    order), or None when the request didn't narrow the fields
+    """
+    fields = _names(query_params.get(FIELDS_PARAM, ''))
+    omit = _names(query_params.get(OMIT_PARAM, ''))
+    if not fields and not omit:
+        return None
+
+    if fields == [COMPACT]:
+        fields = list(getattr(serializer_class.Meta, 'compact_fields', available))
+    unknown = [name for name in fields + omit if name not in available]
+    if unknown:
+        raise ValidationError({
+            FIELDS_PARAM: f'Unknown fields: {", ".join(unknown)}. '
+                          f'Available: {", ".join(available)}'
+        })
+    keep = set(fields or available) - set(omit)
+    return [name for name in available if name in keep]
+
+
+class SparseFieldsSerializerMixin:
+    """
+    ModelSerializer mixin honouring ?fields= and ?omit= on GET requests.
+
+    Meta.compact_fields lists the compact profile. Meta.field_sources maps
+    fields that aren't plain model columns (properties, annotations,
+    method fields) to the model paths they read; () for annotations.
+    Nested uses of the serializer always render every field.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected = self.selected_fields(fields)
+        if selected is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in selected}
+
+    def selected_fields(self, fields):
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS or not self._is_root():
+            return None
+        return select_fields(type(self), list(fields), request.query_params)
+
+    def _is_root(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+
+def model_paths(serializer_class, field_names):
+    """
+    only() paths covering the model data `field_names` of
+    `serializer_class` read, or None if some field can't be mapped (then
+    nothing should be deferred)
+    """
+    meta = serializer_class.Meta
+    model = meta.model
+    field_sources = getattr(meta, 'field_sources', {})
+    declared = serializer_class._declared_fields
+    paths = set()
+    for name in field_names:
+        if name in field_sources:
+            paths.update(field_sources[name])
+            continue
+        field = declared.get(name)
+        source = field.source if field is not None and field.source else name
+        if source == '*':
+            return None
+        path = source.replace('.', '__')
+        if not _is_model_path(model, path):
+            return None
+        paths.add(path)
+    return paths
+
+
+def _is_model_path(model, path):
+    """Whether `path` is a concrete field, following foreign keys"""
+    *relations, name = path.split('__')
+    for relation in relations:
+        try:
+            field = model._meta.get_field(relation)
+        except FieldDoesNotExist:
+            return False
+        if not field.many_to_one and not field.one_to_one:
+            return False
+        model = field.related_model
+    try:
+        return model._meta.get_field(name).concrete
+    except FieldDoesNotExist:
+        return False
+
+
+class SparseFieldsViewMixin:
+    """
+    ViewSet mixin that narrows the SELECT to what the sparse fieldset
+    reads. Relations traversed by dotted sources stay select_related; the
+    rest are dropped. Fields in `keyset_ordering` are always loaded.
+    """
+
+    def requested_fields(self):
+        """Serializer field names the request selected, or None for all of them"""
+        if not hasattr(self, '_requested_fields'):
+            serializer_class = self.get_serializer_class()
+            self._requested_fields = None
+            if issubclass(serializer_class, SparseFieldsSerializerMixin):
+                serializer = serializer_class(context=self.get_serializer_context())
+                self._requested_fields = serializer.selected_fields(
+                    list(serializer_class().get_fields()))
+        return self._requested_fields
+
+    def wants_field(self, *names):
+        """Whether any of `names` will be rendered"""
+        fields = self.requested_fields()
+        return fields is None or any(name in fields for name in names)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.requested_fields()
+        if fields is None:
+            return queryset
+        paths = model_paths(self.get_serializer_class(), fields)
+        if paths is None:
+            return queryset
+
+        paths.update(field.lstrip('-') for field in getattr(self, 'keyset_ordering', None) or ())
+        relations = {path.rsplit('__', 1)[0] for path in paths if '__' in path}
+        queryset = queryset.select_related(None)
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset.only(*paths)
@@ -0,0 +1,142 @@
+from datetime import date, timedelta
+from django.db import transaction
+from django.test import TestCase, override_settings
+from rest_framework.test import APITestCase
+from interactions.models import Interaction
+from volunteers.models import Volunteer
+from .cache import STATS_VERSION, stats_changed
+from .models import DataVersion, TeamMember
+from .pagination import KeysetPagination
+
+
+@override_settings(ALLOWED_HOSTS=['*'], SECURE_SSL_REDIRECT=False)
+class DashboardParamTests(APITestCase):
+
+    def setUp(self):
+        self.client.force_authenticate(TeamMember.objects.create(username='member'))
+
+    def test_non_numeric_params_are_rejected(self):
+        for param, panel in [('limit', 'recent_interactions'), ('days', 'upcoming_followups')]:
+            response = self.client.get('/api/dashboard/bundle/', {'panels': panel, param: 'abc'})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(param, response.data)
+
+    def test_out_of_range_params_are_clamped(self):
+        response = self.client.get('/api/dashboard/bundle/', {
+            'panels': 'recent_interactions,upcoming_followups', 'limit': '-1', 'days': '100000'})
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(ALLOWED_HOSTS=['*'], SECURE_SSL_REDIRECT=False)
+class TeamMemberQueryBudgetTests(APITestCase):
+
+    def test_list(self):
+        admin = TeamMember.objects.create(username='admin', role='admin')
+        self.client.force_authenticate(admin)
+        for page_size in (3, 40):
+            TeamMember.objects.bulk_create([
+                TeamMember(username=f'member{page_size}-{i}') for i in range(page_size)])
+            with self.assertNumQueries(2):  # count + page
+                response = self.client.get('/api/team-members/', {'page_size': page_size})
+            self.assertEqual(len(response.data['results']), page_size)
+
+
+@override_settings(ALLOWED_HOSTS=['*'], SECURE_SSL_REDIRECT=False)
+class KeysetPaginationTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = TeamMember.objects.create(username='member')
+        # Duplicate names throughout, so pages can only split on the id
+        cls.volunteers = Volunteer.objects.bulk_create([
+            Volunteer(first_name=['Ann', 'Bob'][i % 2], last_name=['Smith', 'Jones'][i % 3 > 0])
+            for i in range(11)])
+        volunteer = cls.volunteers[0]
+        start = date(2024, 1, 1)
+        Interaction.objects.bulk_create([
+            Interaction(volunteer=volunteer, team_member=cls.member,
+                        interaction_date=start + timedelta(days=i // 3),
+                        discussion_notes='Checked in')
+            for i in range(10)])
+
+    def setUp(self):
+        self.client.force_authenticate(self.member)
+
+    def walk(self, response, link='next'):
+        """The ids on every page from `response` on, following `link`"""
+        self.assertEqual(response.status_code, 200)
+        pages = [[row['id'] for row in response.data['results']]]
+        while response.data[link]:
+            response = self.client.get(response.data[link])
+            self.assertEqual(response.status_code, 200)
+            pages.append([row['id'] for row in response.data['results']])
+        return pages, response
+
+    def first_page(self, url):
+        return self.client.get(url, {'page_size': 3, 'cursor': ''})
+
+    def test_volunteer_pages_split_ties_on_id(self):
+        expected = list(Volunteer.objects.order_by(
+            'last_name', 'first_name', 'id').values_list('id', flat=True))
+
+        pages, _ = self.walk(self.first_page('/api/volunteers/'))
+
+        self.assertEqual([len(page) for page in pages], [3, 3, 3, 2])
+        self.assertEqual(sum(pages, []), expected)
+
+    def test_previous_links_walk_back_to_the_first_page(self):
+        forward, last = self.walk(self.first_page('/api/volunteers/'))
+
+        backward, _ = self.walk(last, link='previous')
+
+        self.assertEqual(backward[::-1], forward)
+
+    def test_interactions_follow_date_then_id_descending(self):
+        expected = list(Interaction.objects.order_by(
+            '-interaction_date', '-id').values_list('id', flat=True))
+
+        pages, _ = self.walk(self.first_page('/api/interactions/'))
+
+        self.assertEqual(sum(pages, []), expected)
+
+    def test_invalid_and_tampered_cursors_are_rejected(self):
+        encode = KeysetPagination._encode_cursor
+        for url, cursor in [
+            ('/api/volunteers/', 'not a cursor!'),
+            ('/api/volunteers/', encode(['Smith', 'Ann'], False)),         # too short
+            ('/api/volunteers/', encode(['Smith', 'Ann', {'id': 1}], False)),
+            ('/api/volunteers/', encode(['Smith', 'Ann', 'abc'], False)),
+            ('/api/interactions/', encode(['not-a-date', 1], False)),
+        ]:
+            with self.subTest(url=url, cursor=cursor):
+                response = self.client.get(url, {'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('cursor', response.data)
+
+
+class StatsVersionTests(TestCase):
+
+    def test_one_bump_per_transaction_after_commit(self):
+        before = DataVersion.current(STATS_VERSION)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                stats_changed()
+                stats_changed()
+                self.assertEqual(DataVersion.current(STATS_VERSION), before)
+        self.assertEqual(DataVersion.current(STATS_VERSION), before + 1)
+
+    def test_rolled_back_writes_dont_hold_back_later_bumps(self):
+        before = DataVersion.current(STATS_VERSION)
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    stats_changed()
+                    raise ValueError
+            except ValueError:
+                pass
+        self.assertEqual(DataVersion.current(STATS_VERSION), before)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                stats_changed()
+        self.assertEqual(DataVersion.current(STATS_VERSION), before + 1)
@@ -3,15 +3,17 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.contrib.auth import update_session_auth_hash
+from django.db.models import Count
 from .models import TeamMember
 from .serializers import (
     TeamMemberSerializer, TeamMemberCreateSerializer,
     ChangePasswordSerializer, UserProfileSerializer
 )
 from .permissions import IsAdminUser
+from .sparse import SparseFieldsViewMixin
 
 
-class TeamMemberViewSet(viewsets.ModelViewSet):
+class TeamMemberViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing team members (admin only)
     """
@@ -25,7 +27,10 @@ class TeamMemberViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Get all team members, optionally filtered"""
-        queryset = TeamMember.objects.all().order_by('-created_at')
+        queryset = TeamMember.objects.order_by('-created_at')
+        if self.wants_field('interaction_count'):
+            queryset = queryset.annotate(
+                annotated_interaction_count=Count('interactions'))
 
         # Optional filtering
         is_active = self.request.query_params.get('is_active', None)
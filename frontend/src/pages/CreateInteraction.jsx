@@ -17,35 +17,57 @@ export default function CreateInteraction() {
     followup_notes: '',
   });
 
-  const [volunteers, setVolunteers] = useState([]);
+  const [volunteerQuery, setVolunteerQuery] = useState('');
+  const [volunteerOptions, setVolunteerOptions] = useState([]);
+  const [selectedVolunteer, setSelectedVolunteer] = useState(null);
   const [loading, setLoading] = useState(false);
   const [errors, setErrors] = useState({});
 
   useEffect(() => {
-    loadVolunteers();
+    if (preselectedVolunteerId) {
+      loadPreselectedVolunteer();
+    }
   }, []);
 
-  const loadVolunteers = async () => {
+  // Ask the server-side prefix index as the user types
+  useEffect(() => {
+    const q = volunteerQuery.trim();
+    if (!q) {
+      setVolunteerOptions([]);
+      return;
+    }
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        const response = await volunteersAPI.autocomplete(q);
+        if (!cancelled) setVolunteerOptions(response.data.results || []);
+      } catch (error) {
+        console.error('Error searching volunteers:', error);
+        if (!cancelled) setVolunteerOptions([]);
+      }
+    }, 150);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [volunteerQuery]);
+
+  const loadPreselectedVolunteer = async () => {
     try {
-      let allVolunteers = [];
-      let nextUrl = null;
-      let page = 1;
-      
-      // Fetch all pages of volunteers
-      do {
-        const response = await volunteersAPI.getAll({ page, limit: 100 });
-        allVolunteers = [...allVolunteers, ...(response.data.results || [])];
-        nextUrl = response.data.next;
-        page++;
-      } while (nextUrl);
-      
-      setVolunteers(allVolunteers);
+      const response = await volunteersAPI.getById(preselectedVolunteerId);
+      setSelectedVolunteer({ id: response.data.id, name: response.data.full_name });
     } catch (error) {
-      console.error('Error loading volunteers:', error);
-      setVolunteers([]);
+      console.error('Error loading volunteer:', error);
     }
   };
 
+  const selectVolunteer = (volunteer) => {
+    setSelectedVolunteer(volunteer);
+    setFormData(prev => ({ ...prev, volunteer: volunteer ? volunteer.id : '' }));
+    setVolunteerQuery('');
+    setVolunteerOptions([]);
+  };
+
   const handleChange = (e) => {
     const { name, value, type, checked } = e.target;
     setFormData(prev => ({
@@ -56,6 +78,10 @@ export default function CreateInteraction() {
 
   const handleSubmit = async (e) => {
     e.preventDefault();
+    if (!formData.volunteer) {
+      setErrors({ volunteer: 'Please select a volunteer.' });
+      return;
+    }
     setLoading(true);
     setErrors({});
 
@@ -96,18 +122,47 @@ export default function CreateInteraction() {
         {/* Volunteer */}
         <div>
           <label className="label">Volunteer *</label>
-          <select 
-            name="volunteer" 
-            value={formData.volunteer} 
-            onChange={handleChange} 
-            className="input" 
-            required
-          >
-            <option value="">Select a volunteer...</option>
-            {(volunteers || []).map(v => (
-              <option key={v.id} value={v.id}>{v.full_name}</option>
-            ))}
-          </select>
+          {selectedVolunteer ? (
+            <div className="input flex items-center justify-between">
+              <span>{selectedVolunteer.name}</span>
+              <button
+                type="button"
+                onClick={() => selectVolunteer(null)}
+                className="text-sm text-gray-500 hover:text-gray-700"
+              >
+                Change
+              </button>
+            </div>
+          ) : (
+            <div className="relative">
+              <input
+                type="text"
+                value={volunteerQuery}
+                onChange={(e) => setVolunteerQuery(e.target.value)}
+                className="input"
+                placeholder="Search by name, email or phone..."
+                autoComplete="off"
+              />
+              {volunteerOptions.length > 0 && (
+                <ul className="absolute z-10 mt-1 w-full bg-white border border-gray-200 rounded-lg shadow-lg max-h-64 overflow-y-auto">
+                  {volunteerOptions.map(v => (
+                    <li key={v.id}>
+                      <button
+                        type="button"
+                        onClick={() => selectVolunteer(v)}
+                        className="w-full text-left px-4 py-2 hover:bg-gray-50"
+                      >
+                        <span className="text-gray-900">{v.name}</span>
+                        {v.teams.length > 0 && (
+                          <span className="ml-2 text-xs text-gray-500">{v.teams.join(', ')}</span>
+                        )}
+                      </button>
+                    </li>
+                  ))}
+                </ul>
+              )}
+            </div>
+          )}
           {errors.volunteer && (
             <p className="text-[#C55A5A] text-sm mt-1">{errors.volunteer}</p>
           )}
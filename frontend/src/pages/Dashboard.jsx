@@ -1,9 +1,13 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { Link } from 'react-router-dom';
 import { dashboardAPI, volunteersAPI } from '../services/api';
 import { FiUsers, FiMessageSquare, FiAlertCircle, FiClock, FiTrendingUp } from 'react-icons/fi';
 import { format } from 'date-fns';
 
+// Poll a sync job every 2s for up to 5 minutes
+const SYNC_POLL_MS = 2000;
+const SYNC_MAX_POLLS = 150;
+
 export default function Dashboard() {
   const [overview, setOverview] = useState(null);
   const [myStats, setMyStats] = useState(null);
@@ -11,24 +15,28 @@ export default function Dashboard() {
   const [upcomingFollowups, setUpcomingFollowups] = useState([]);
   const [loading, setLoading] = useState(true);
   const [syncing, setSyncing] = useState(false);
+  const mounted = useRef(true);
 
   useEffect(() => {
+    mounted.current = true;
     loadDashboardData();
+    return () => {
+      // Stops any sync polling
+      mounted.current = false;
+    };
   }, []);
 
   const loadDashboardData = async () => {
     try {
-      const [overviewRes, myStatsRes, recentRes, followupsRes] = await Promise.all([
-        dashboardAPI.getOverview(),
-        dashboardAPI.getMyStats(),
-        dashboardAPI.getRecentInteractions(5),
-        dashboardAPI.getUpcomingFollowups(7),
-      ]);
+      const { data } = await dashboardAPI.getBundle(
+        ['overview', 'my_stats', 'recent_interactions', 'upcoming_followups'],
+        { limit: 5, days: 7 }
+      );
 
-      setOverview(overviewRes.data.overview);
-      setMyStats(myStatsRes.data.my_stats);
-      setRecentInteractions(recentRes.data.recent_interactions);
-      setUpcomingFollowups(followupsRes.data.upcoming_followups);
+      setOverview(data.overview);
+      setMyStats(data.my_stats);
+      setRecentInteractions(data.recent_interactions);
+      setUpcomingFollowups(data.upcoming_followups);
     } catch (error) {
       console.error('Error loading dashboard:', error);
     } finally {
@@ -39,13 +47,33 @@ export default function Dashboard() {
   const handleSync = async () => {
     setSyncing(true);
     try {
-      await volunteersAPI.sync();
-      alert('Volunteers synced successfully!');
-      loadDashboardData();
+      // The sync runs in the background; poll the job until it finishes
+      let { data: job } = await volunteersAPI.sync();
+      for (let polls = 0; job.status === 'queued' || job.status === 'running'; polls++) {
+        if (polls >= SYNC_MAX_POLLS) {
+          alert(job.status === 'queued'
+            ? 'Sync is still queued; no sync worker has picked it up yet. Check back later.'
+            : 'Sync is still running in the background. Check back later.');
+          return;
+        }
+        await new Promise((resolve) => setTimeout(resolve, SYNC_POLL_MS));
+        if (!mounted.current) return;
+        ({ data: job } = await volunteersAPI.getSyncJob(job.id));
+      }
+      if (!mounted.current) return;
+
+      if (job.status === 'failed') {
+        alert('Sync failed: ' + job.error);
+      } else {
+        alert('Volunteers synced successfully!');
+        loadDashboardData();
+      }
     } catch (error) {
-      alert('Sync failed: ' + (error.response?.data?.error || error.message));
+      if (mounted.current) {
+        alert('Sync failed: ' + (error.response?.data?.error || error.message));
+      }
     } finally {
-      setSyncing(false);
+      if (mounted.current) setSyncing(false);
     }
   };
 
@@ -23,7 +23,8 @@ export default function Volunteers() {
       const response = await volunteersAPI.getAll({ 
         page, 
         search,
-        show_archived: showArchived 
+        show_archived: showArchived,
+        fields: 'compact'
       });
       setVolunteers(response.data.results || []);
       setPagination({
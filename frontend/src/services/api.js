@@ -71,6 +71,7 @@ export const authAPI = {
 // Volunteers API
 export const volunteersAPI = {
   getAll: (params) => api.get('/volunteers/', { params }),
+  autocomplete: (q, limit = 10) => api.get('/volunteers/autocomplete/', { params: { q, limit } }),
   getById: (id) => api.get(`/volunteers/${id}/`),
   getHistory: (id) => api.get(`/volunteers/${id}/history/`),
   getSummary: (id) => api.get(`/volunteers/${id}/summary/`),
@@ -78,7 +79,8 @@ export const volunteersAPI = {
   create: (data) => api.post('/volunteers/', data),
   update: (id, data) => api.put(`/volunteers/${id}/`, data),
   delete: (id) => api.delete(`/volunteers/${id}/`),
-  sync: () => api.post('/volunteers/sync/'),
+  sync: (options = {}) => api.post('/volunteers/sync/', options),
+  getSyncJob: (jobId) => api.get(`/volunteers/sync/${jobId}/`),
 };
 
 // Interactions API
@@ -95,9 +97,11 @@ export const interactionsAPI = {
 
 // Dashboard API
 export const dashboardAPI = {
+  getBundle: (panels, params = {}) =>
+    api.get('/dashboard/bundle/', { params: { panels: panels.join(','), ...params } }),
   getOverview: () => api.get('/dashboard/overview/'),
-  getTrends: () => api.get('/dashboard/trends/'),
-  getTeamActivity: () => api.get('/dashboard/team-activity/'),
+  getTrends: (params) => api.get('/dashboard/trends/', { params }),
+  getTeamActivity: (params) => api.get('/dashboard/team-activity/', { params }),
   getVolunteersNeedCheckin: () => api.get('/dashboard/volunteers-need-checkin/'),
   getRecentInteractions: (limit = 10) => api.get('/dashboard/recent-interactions/', { params: { limit } }),
   getUpcomingFollowups: (days = 7) => api.get('/dashboard/upcoming-followups/', { params: { days } }),
@@ -105,6 +109,11 @@ export const dashboardAPI = {
   getEngagementMetrics: () => api.get('/dashboard/engagement-metrics/'),
 };
 
+// Analytics API
+export const analyticsAPI = {
+  pivot: (params) => api.get('/analytics/pivot/', { params }),
+};
+
 // Team Members API (Admin only)
 export const teamAPI = {
   getAll: () => api.get('/team-members/'),
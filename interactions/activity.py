@@ -0,0 +1,114 @@
+"""
+Maintenance of the DailyInteractionRollup table
+"""
+from collections import defaultdict
+from django.db import transaction
+from django.utils import timezone
+from .models import DailyInteractionRollup, Interaction
+
+ALL_TOPICS = DailyInteractionRollup.ALL_TOPICS
+TALLY_FIELDS = [
+    'interaction_count', 'followup_count', 'open_followup_count', 'completed_followup_count',
+]
+SOURCE_FIELDS = ['interaction_date', 'team_member_id', 'topics', 'needs_followup', 'followup_completed']
+TOPIC_LENGTH = DailyInteractionRollup._meta.get_field('topic').max_length
+
+
+def _topics(topics):
+    """Distinct non-blank topic names of an interaction"""
+    if not isinstance(topics, list):
+        return []
+    names = (str(topic).strip()[:TOPIC_LENGTH] for topic in topics)
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def tally(rows):
+    """
+    {(date, team_member_id, topic): [counts in TALLY_FIELDS order]} for
+    rows of SOURCE_FIELDS values
+    """
+    tallies = defaultdict(lambda: [0] * len(TALLY_FIELDS))
+    for day, team_member_id, topics, needs_followup, completed in rows:
+        counts = (
+            1,
+            needs_followup,
+            needs_followup and not completed,
+            needs_followup and completed,
+        )
+        for topic in [ALL_TOPICS] + _topics(topics):
+            totals = tallies[day, team_member_id, topic]
+            for i, count in enumerate(counts):
+                totals[i] += count
+    return tallies
+
+
+def refresh_daily_activity(day, team_member_id):
+    """
+    Recompute one team member's rollup rows for one day from their
+    interactions. The day's all-topics row is locked first so concurrent
+    writers apply one after the other, as in refresh_engagement(). Rows
+    of deleted team members (team_member_id None) can't be locked; only
+    edits to their old interactions reach them.
+    """
+    with transaction.atomic():
+        rollups = DailyInteractionRollup.objects.filter(date=day, team_member_id=team_member_id)
+        if team_member_id is not None:
+            DailyInteractionRollup.objects.get_or_create(
+                date=day, team_member_id=team_member_id, topic=ALL_TOPICS)
+            list(rollups.filter(topic=ALL_TOPICS).select_for_update())
+
+        tallies = tally(Interaction.objects.filter(
+            interaction_date=day, team_member_id=team_member_id
+        ).values_list(*SOURCE_FIELDS))
+
+        now = timezone.now()
+        stale, to_update = [], []
+        for row in rollups:
+            counts = tallies.pop((day, team_member_id, row.topic), None)
+            if counts is None:
+                stale.append(row.pk)
+            elif [getattr(row, field) for field in TALLY_FIELDS] != counts:
+                for field, count in zip(TALLY_FIELDS, counts):
+                    setattr(row, field, count)
+                row.updated_at = now
+                to_update.append(row)
+
+        if stale:
+            DailyInteractionRollup.objects.filter(pk__in=stale).delete()
+        if to_update:
+            DailyInteractionRollup.objects.bulk_update(to_update, TALLY_FIELDS + ['updated_at'])
+        if tallies:
+            DailyInteractionRollup.objects.bulk_create([
+                DailyInteractionRollup(
+                    date=day, team_member_id=team_member_id, topic=topic,
+                    **dict(zip(TALLY_FIELDS, counts)))
+                for (_, _, topic), counts in tallies.items()
+            ])
+
+
+def rebuild_daily_activity(start=None, end=None, batch_size=1000):
+    """
+    Recompute the rollup from scratch, for every day or the days between
+    `start` and `end` inclusive. Returns the row count.
+    """
+    interactions = Interaction.objects.order_by()
+    rollups = DailyInteractionRollup.objects.all()
+    if start:
+        interactions = interactions.filter(interaction_date__gte=start)
+        rollups = rollups.filter(date__gte=start)
+    if end:
+        interactions = interactions.filter(interaction_date__lte=end)
+        rollups = rollups.filter(date__lte=end)
+
+    tallies = tally(interactions.values_list(*SOURCE_FIELDS).iterator(chunk_size=5000))
+    rows = [
+        DailyInteractionRollup(
+            date=day, team_member_id=team_member_id, topic=topic,
+            **dict(zip(TALLY_FIELDS, counts)))
+        for (day, team_member_id, topic), counts in tallies.items()
+    ]
+
+    with transaction.atomic():
+        rollups.delete()
+        DailyInteractionRollup.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
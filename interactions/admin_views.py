@@ -1,9 +1,9 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q
 from .models import Interaction
-from .serializers import InteractionSerializer
+from .search import search_interactions
+from .serializers import InteractionSearchSerializer, InteractionSerializer
 from core.permissions import IsAdminUser
 
 
@@ -12,24 +12,20 @@ class InteractionAdminViewSet(viewsets.ModelViewSet):
     ViewSet for admin interaction management (edit/delete)
     Separate from regular InteractionViewSet to have different permissions
     """
-    serializer_class = InteractionSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
+    keyset_ordering = ('-interaction_date', '-id')
     
     def get_queryset(self):
         """Get all interactions with optional filtering"""
         queryset = Interaction.objects.all().select_related(
             'volunteer', 'team_member'
-        ).order_by('-interaction_date')
+        ).defer('search_vector').order_by('-interaction_date')
         
-        # Search functionality
-        search = self.request.query_params.get('search', None)
-        if search:
-            queryset = queryset.filter(
-                Q(volunteer__full_name__icontains=search) |
-                Q(discussion_notes__icontains=search) |
-                Q(team_member__first_name__icontains=search) |
-                Q(team_member__last_name__icontains=search)
-            )
+        # Full-text search, best match first (?search= is the older name)
+        q = self._search_query()
+        if q:
+            queryset = search_interactions(queryset, q).order_by(
+                '-search_rank', '-interaction_date')
         
         # Filter by volunteer
         volunteer_id = self.request.query_params.get('volunteer', None)
@@ -48,6 +44,20 @@ class InteractionAdminViewSet(viewsets.ModelViewSet):
         
         return queryset
     
+    def _search_query(self):
+        params = self.request.query_params
+        return (params.get('q') or params.get('search') or '').strip()
+    
+    def get_serializer_class(self):
+        if self.action == 'list' and self._search_query():
+            return InteractionSearchSerializer
+        return InteractionSerializer
+    
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['q'] = self._search_query()
+        return context
+    
     def destroy(self, request, pk=None):
         """Delete an interaction"""
         interaction = self.get_object()
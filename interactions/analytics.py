@@ -0,0 +1,384 @@
+"""
+Pivot analytics over an in-memory columnar snapshot of interactions.
+
+Each worker keeps a snapshot of every interaction per `stats`
+DataVersion (see core/cache.py), so a snapshot is rebuilt only after a
+write. Columns are array('i') of dictionary codes (indexes into a label
+list), sorted by date so a date range is a slice. Multi-valued
+dimensions (topics, the volunteer's teams) are stored as parallel
+arrays of (row, code) pairs. Queries filter with compress() masks and
+group with Counter over packed int keys, so the per-row work runs in C
+and pivots over a couple of hundred thousand interactions take a
+fraction of a second. Snapshots are evicted least recently used first once they
+use more than ANALYTICS_SNAPSHOT_MB.
+"""
+import logging
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict
+from datetime import date, timedelta
+from itertools import compress, repeat
+from operator import add, and_, floordiv, mul
+from django.conf import settings
+from django.utils import timezone
+from core.cache import stats_version
+from core.models import TeamMember
+from volunteers.models import Volunteer
+from .models import Interaction
+
+NEVER = 2 ** 31 - 1
+FOLLOWUP_STATUSES = ['none', 'open', 'completed']
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+# Dimensions whose values are ids, named in the response's `labels`
+LABELLED = ['team_member', 'volunteer']
+MULTI_VALUED = ['topic', 'team']
+DATE_DIMENSIONS = ['day', 'week', 'month', 'quarter', 'year', 'weekday']
+DIMENSIONS = LABELLED + MULTI_VALUED + ['followup_status'] + DATE_DIMENSIONS
+MEASURES = [
+    'count', 'volunteers', 'followups', 'open_followups', 'completed_followups',
+    'overdue_followups', 'completion_rate',
+]
+MAX_DIMENSIONS = 3
+
+logger = logging.getLogger(__name__)
+
+
+class PivotError(ValueError):
+    """A pivot request the snapshot can't answer; the message is for the client"""
+
+
+def _period_start(day, granularity):
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    if granularity == 'quarter':
+        return day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1)
+    return day.replace(month=1, day=1)
+
+
+class Encoder:
+    """Assigns consecutive codes to distinct values"""
+
+    def __init__(self, values=()):
+        self.codes = {}
+        self.values = []
+        for value in values:
+            self.code(value)
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class Snapshot:
+    """Columnar copy of all interactions at one data version"""
+
+    def __init__(self, version):
+        self.version = version
+        self.built_at = timezone.now()
+        self.day = array('i')             # date ordinal, ascending
+        self.team_member = array('i')
+        self.volunteer = array('i')
+        self.followup_status = array('i')
+        self.overdue_from = array('i')    # follow-up date ordinal of open follow-ups
+        self.topic_rows, self.topic = array('i'), array('i')
+        self.team_rows, self.team = array('i'), array('i')
+        self.encoders = {
+            'team_member': Encoder(),
+            'volunteer': Encoder(),
+            'topic': Encoder(),
+            'team': Encoder(),
+            'followup_status': Encoder(FOLLOWUP_STATUSES),
+        }
+        self.names = {'team_member': {}, 'volunteer': {}}
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.day)
+
+    @property
+    def nbytes(self):
+        arrays = [
+            self.day, self.team_member, self.volunteer, self.followup_status,
+            self.overdue_from, self.topic_rows, self.topic, self.team_rows, self.team,
+        ] + [column for column, _ in self._derived.values()]
+        return sum(column.itemsize * len(column) for column in arrays)
+
+    def column(self, dimension):
+        """(codes, labels) of a single-valued dimension"""
+        if dimension in DATE_DIMENSIONS and dimension != 'day':
+            return self._date_column(dimension)
+        if dimension == 'day':
+            return self.day, None
+        return getattr(self, dimension), self.encoders[dimension].values
+
+    def pairs(self, dimension):
+        """(rows, codes, labels) of a multi-valued dimension"""
+        return (getattr(self, f'{dimension}_rows'), getattr(self, dimension),
+                self.encoders[dimension].values)
+
+    def label(self, dimension, code):
+        if dimension == 'day':
+            return date.fromordinal(code).isoformat()
+        if dimension in MULTI_VALUED:
+            return self.encoders[dimension].values[code]
+        return self.column(dimension)[1][code]
+
+    def _date_column(self, granularity):
+        """Codes for a date granularity, derived from the day column once"""
+        with self._lock:
+            if granularity not in self._derived:
+                encoder = Encoder()
+                if granularity == 'weekday':
+                    encoder = Encoder(WEEKDAYS)
+                    codes = {day: date.fromordinal(day).weekday() for day in set(self.day)}
+                else:
+                    periods = {
+                        day: _period_start(date.fromordinal(day), granularity)
+                        for day in sorted(set(self.day))
+                    }
+                    codes = {day: encoder.code(start.isoformat()) for day, start in periods.items()}
+                self._derived[granularity] = (array('i', map(codes.__getitem__, self.day)), encoder.values)
+        return self._derived[granularity]
+
+
+def build_snapshot():
+    # Read the version before the rows: a write landing mid-build moves
+    # the version past this snapshot and forces the next rebuild
+    snapshot = Snapshot(stats_version())
+    members = {
+        id: f'{first_name} {last_name}'.strip()
+        for id, first_name, last_name in TeamMember.objects.values_list('id', 'first_name', 'last_name')
+    }
+    volunteers = {
+        id: (f'{first_name} {last_name}', teams if isinstance(teams, list) else [])
+        for id, first_name, last_name, teams in Volunteer.objects.values_list(
+            'id', 'first_name', 'last_name', 'teams').iterator(chunk_size=5000)
+    }
+
+    member_codes = snapshot.encoders['team_member']
+    volunteer_codes = snapshot.encoders['volunteer']
+    topic_codes = snapshot.encoders['topic']
+    team_codes = snapshot.encoders['team']
+    volunteer_teams = {}
+
+    rows = Interaction.objects.order_by('interaction_date', 'id').values_list(
+        'interaction_date', 'team_member_id', 'volunteer_id', 'topics',
+        'needs_followup', 'followup_completed', 'followup_date')
+    for row, (day, member_id, volunteer_id, topics, needs_followup, completed, followup_date) \
+            in enumerate(rows.iterator(chunk_size=5000)):
+        snapshot.day.append(day.toordinal())
+        snapshot.team_member.append(member_codes.code(member_id))
+        snapshot.volunteer.append(volunteer_codes.code(volunteer_id))
+        status = 0 if not needs_followup else 2 if completed else 1
+        snapshot.followup_status.append(status)
+        snapshot.overdue_from.append(
+            followup_date.toordinal() if status == 1 and followup_date else NEVER)
+
+        names = [str(topic).strip() for topic in topics] if isinstance(topics, list) else []
+        names = list(dict.fromkeys(name for name in names if name)) or [None]
+        for name in names:
+            snapshot.topic_rows.append(row)
+            snapshot.topic.append(topic_codes.code(name))
+
+        teams = volunteer_teams.get(volunteer_id)
+        if teams is None:
+            teams = volunteer_teams[volunteer_id] = [
+                team_codes.code(team) for team in volunteers.get(volunteer_id, ('', []))[1]
+            ] or [team_codes.code(None)]
+        for team in teams:
+            snapshot.team_rows.append(row)
+            snapshot.team.append(team)
+
+    snapshot.names['team_member'] = {id: members.get(id) for id in member_codes.values if id}
+    snapshot.names['volunteer'] = {
+        id: volunteers[id][0] for id in volunteer_codes.values if id in volunteers}
+    return snapshot
+
+
+_snapshots = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_snapshot():
+    """This worker's snapshot of the current data version, built first if needed"""
+    version = stats_version()
+    with _lock:
+        snapshot = _snapshots.get(version)
+        if snapshot is None:
+            started = time.perf_counter()
+            snapshot = _snapshots[version] = build_snapshot()
+            logger.info(
+                f"Built analytics snapshot v{snapshot.version}: {len(snapshot)} interactions, "
+                f"{snapshot.nbytes // 1024} KiB in {time.perf_counter() - started:.2f}s")
+        _snapshots.move_to_end(version)
+        budget = getattr(settings, 'ANALYTICS_SNAPSHOT_MB', 128) * 2 ** 20
+        # Never evict the snapshot just asked for
+        while len(_snapshots) > 1 and sum(s.nbytes for s in _snapshots.values()) > budget:
+            _snapshots.popitem(last=False)
+    return snapshot
+
+
+def _text(value):
+    return 'null' if value is None else str(value)
+
+
+class Pivot:
+    """One pivot query against a snapshot"""
+
+    def __init__(self, snapshot, dimensions, measures, filters=None, start=None, end=None,
+                 today=None):
+        unknown = [name for name in dimensions + list(filters or {}) if name not in DIMENSIONS]
+        unknown += [name for name in measures if name not in MEASURES]
+        if unknown:
+            raise PivotError(f'Unknown dimensions or measures: {", ".join(unknown)}')
+        if len(dimensions) > MAX_DIMENSIONS:
+            raise PivotError(f'At most {MAX_DIMENSIONS} dimensions')
+        exploded = [name for name in dimensions if name in MULTI_VALUED]
+        if len(exploded) > 1:
+            raise PivotError(f'Only one of {", ".join(MULTI_VALUED)} can be a dimension')
+
+        self.snapshot = snapshot
+        self.dimensions = list(dict.fromkeys(dimensions))
+        self.measures = list(dict.fromkeys(measures))
+        self.filters = filters or {}
+        self.exploded = exploded[0] if exploded else None
+        self.today = (today or timezone.now().date()).toordinal()
+        self.lo = bisect_left(snapshot.day, start.toordinal()) if start else 0
+        self.hi = bisect_right(snapshot.day, end.toordinal()) if end else len(snapshot)
+
+    def _allowed(self, dimension, values):
+        """Codes of `dimension` whose text is one of `values`"""
+        snapshot = self.snapshot
+        if dimension == 'day':
+            try:
+                return {date.fromisoformat(value).toordinal() for value in values}
+            except ValueError:
+                raise PivotError('day filters must be dates as YYYY-MM-DD')
+        labels = snapshot.pairs(dimension)[2] if dimension in MULTI_VALUED else \
+            snapshot.column(dimension)[1]
+        wanted = set(values)
+        return {code for code, label in enumerate(labels) if _text(label) in wanted}
+
+    def _rows(self):
+        """
+        Row numbers in range, or (row, code) pair positions when grouping
+        by a multi-valued dimension; each is one unit counted
+        """
+        if not self.exploded:
+            return None, None
+        rows, codes, _ = self.snapshot.pairs(self.exploded)
+        lo, hi = bisect_left(rows, self.lo), bisect_left(rows, self.hi)
+        return rows[lo:hi], codes[lo:hi]
+
+    def _columns(self):
+        """Row-aligned (filtered) columns named by dimension, plus the measure inputs"""
+        snapshot = self.snapshot
+        rows, pair_codes = self._rows()
+        needed = set(self.dimensions) | set(self.filters) | {'followup_status'}
+        if 'volunteers' in self.measures:
+            needed.add('volunteer')
+        if 'overdue_followups' in self.measures:
+            needed.add('overdue_from')
+
+        def column(name):
+            if name == self.exploded:
+                return pair_codes
+            source = snapshot.overdue_from if name == 'overdue_from' else snapshot.column(name)[0]
+            if rows is None:
+                return source[self.lo:self.hi]
+            # Indexing a list is much cheaper than indexing an array
+            return list(map(source.tolist().__getitem__, rows))
+
+        columns = {name: column(name) for name in needed if name not in MULTI_VALUED or name == self.exploded}
+
+        masks = []
+        for name, values in self.filters.items():
+            allowed = self._allowed(name, values)
+            if name in columns:
+                masks.append(bytes(map(allowed.__contains__, columns[name])))
+            else:
+                # Filter on a multi-valued dimension we don't group by:
+                # keep the rows having any of the values
+                pair_rows, codes, _ = snapshot.pairs(name)
+                matching = set(compress(pair_rows, map(allowed.__contains__, codes)))
+                row_numbers = rows if rows is not None else range(self.lo, self.hi)
+                masks.append(bytes(map(matching.__contains__, row_numbers)))
+        if masks:
+            mask = masks[0]
+            for other in masks[1:]:
+                mask = bytes(map(and_, mask, other))
+            columns = {name: list(compress(values, mask)) for name, values in columns.items()}
+        return columns
+
+    def run(self):
+        """(rows, totals) with totals counting every interaction once"""
+        columns = self._columns()
+        groups = self._measure(columns, self.dimensions)
+        if not self.dimensions:
+            total = groups.get(())
+        elif self.exploded:
+            # Pairs count an interaction once per topic/team; total real rows
+            totals = Pivot(self.snapshot, [], self.measures, self.filters,
+                           today=date.fromordinal(self.today))
+            totals.lo, totals.hi = self.lo, self.hi
+            total = totals.run()[1]
+        else:
+            total = self._measure(columns, []).get(())
+
+        rows = []
+        for key, values in groups.items():
+            row = {
+                name: self.snapshot.label(name, code)
+                for name, code in zip(self.dimensions, key)
+            }
+            row.update(values)
+            rows.append(row)
+        return rows, total or {measure: 0 if measure != 'completion_rate' else None
+                               for measure in self.measures}
+
+    def _measure(self, columns, dimensions):
+        """{group key tuple: {measure: value}}"""
+        # Pack each row's codes into one int (mixed radix) so grouping
+        # hashes small ints rather than tuples
+        radixes = [max(columns[name], default=0) + 1 for name in dimensions]
+        keys = [0] * len(columns['followup_status'])
+        for name, radix in zip(dimensions, radixes):
+            keys = list(map(add, map(mul, keys, repeat(radix)), columns[name]))
+
+        # One pass counts every (group, follow-up status)
+        statuses = len(FOLLOWUP_STATUSES)
+        by_status = Counter(map(add, map(mul, keys, repeat(statuses)), columns['followup_status']))
+        overdue = volunteers = None
+        if 'overdue_followups' in self.measures:
+            overdue = Counter(compress(keys, map(self.today.__gt__, columns['overdue_from'])))
+        if 'volunteers' in self.measures:
+            size = max(columns['volunteer'], default=0) + 1
+            distinct = set(map(add, map(mul, keys, repeat(size)), columns['volunteer']))
+            volunteers = Counter(map(floordiv, distinct, repeat(size)))
+
+        groups = {}
+        for packed in sorted({value // statuses for value in by_status}):
+            none, open, completed = (by_status[packed * statuses + i] for i in range(statuses))
+            counts = {
+                'count': none + open + completed,
+                'followups': open + completed,
+                'open_followups': open,
+                'completed_followups': completed,
+                'overdue_followups': overdue[packed] if overdue is not None else None,
+                'volunteers': volunteers[packed] if volunteers is not None else None,
+                'completion_rate': round(completed / (open + completed), 3) if open + completed else None,
+            }
+            key = []
+            for radix in reversed(radixes):
+                packed, code = divmod(packed, radix)
+                key.append(code)
+            groups[tuple(reversed(key))] = {measure: counts[measure] for measure in self.measures}
+        return groups
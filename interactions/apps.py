@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class InteractionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'interactions'
\ No newline at end of file
+    name = 'interactions'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,89 @@
+"""
+Maintenance of the VolunteerEngagement rollup
+"""
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q
+from core.cache import stats_changed
+from .models import Interaction, VolunteerEngagement
+
+OPEN_FOLLOWUP = Q(needs_followup=True, followup_completed=False)
+ROLLUP_FIELDS = [
+    'interaction_count', 'last_interaction_date', 'last_team_member',
+    'open_followup_count', 'next_followup_date',
+]
+
+
+def _stats(interactions):
+    return interactions.aggregate(
+        interaction_count=Count('id'),
+        last_interaction_date=Max('interaction_date'),
+        open_followup_count=Count('id', filter=OPEN_FOLLOWUP),
+        next_followup_date=Min('followup_date', filter=OPEN_FOLLOWUP),
+    )
+
+
+def refresh_engagement(volunteer_id):
+    """
+    Recompute one volunteer's rollup from their interactions. The
+    volunteer's row is locked first so concurrent writers for the same
+    volunteer apply one after the other and the last one sees both.
+    """
+    with transaction.atomic():
+        engagement, _ = VolunteerEngagement.objects.get_or_create(volunteer_id=volunteer_id)
+        engagement = VolunteerEngagement.objects.select_for_update().get(pk=engagement.pk)
+
+        interactions = Interaction.objects.filter(volunteer_id=volunteer_id)
+        stats = _stats(interactions)
+        if not stats['interaction_count']:
+            engagement.delete()
+            return None
+
+        for field, value in stats.items():
+            setattr(engagement, field, value)
+        engagement.last_team_member_id = interactions.order_by(
+            '-interaction_date', '-created_at', '-id'
+        ).values_list('team_member_id', flat=True).first()
+        engagement.save()
+        return engagement
+
+
+def rebuild_engagement(batch_size=1000):
+    """Recompute every volunteer's rollup from scratch. Returns the row count."""
+    rows = {
+        row.pop('volunteer_id'): row
+        for row in Interaction.objects.order_by().values('volunteer_id').annotate(
+            interaction_count=Count('id'),
+            last_interaction_date=Max('interaction_date'),
+            open_followup_count=Count('id', filter=OPEN_FOLLOWUP),
+            next_followup_date=Min('followup_date', filter=OPEN_FOLLOWUP),
+        )
+    }
+
+    # Latest interaction first within each volunteer
+    last_team_member = {}
+    latest = Interaction.objects.order_by(
+        'volunteer_id', '-interaction_date', '-created_at', '-id'
+    ).values_list('volunteer_id', 'team_member_id')
+    for volunteer_id, team_member_id in latest.iterator(chunk_size=5000):
+        last_team_member.setdefault(volunteer_id, team_member_id)
+
+    engagements = [
+        VolunteerEngagement(
+            volunteer_id=volunteer_id,
+            last_team_member_id=last_team_member.get(volunteer_id),
+            **stats)
+        for volunteer_id, stats in rows.items()
+    ]
+
+    with transaction.atomic():
+        VolunteerEngagement.objects.exclude(volunteer_id__in=list(rows)).delete()
+        VolunteerEngagement.objects.bulk_create(
+            engagements,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['volunteer'],
+            update_fields=ROLLUP_FIELDS + ['updated_at'],
+        )
+        # The dashboard's engagement numbers are cached from these rows
+        stats_changed()
+    return len(engagements)
@@ -0,0 +1,29 @@
+# interactions/management/commands/backfill_daily_rollup.py
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from core.cache import stats_changed
+from interactions.activity import rebuild_daily_activity
+
+
+class Command(BaseCommand):
+    help = ('Recompute the daily interaction rollup (per day, team member and topic) '
+            'from all interactions, or only those in a date range')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='First day to rebuild (YYYY-MM-DD)')
+        parser.add_argument('--end', help='Last day to rebuild (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        try:
+            start = date.fromisoformat(options['start']) if options['start'] else None
+            end = date.fromisoformat(options['end']) if options['end'] else None
+        except ValueError as e:
+            raise CommandError(f'Invalid date: {e}')
+
+        span = ''
+        if start or end:
+            span = f' from {start or "the first interaction"} to {end or "the last interaction"}'
+        self.stdout.write(self.style.SUCCESS(f'Rebuilding daily interaction rollup{span}...'))
+        count = rebuild_daily_activity(start=start, end=end)
+        stats_changed()
+        self.stdout.write(self.style.SUCCESS(f'✅ Rebuilt {count} daily rollup rows'))
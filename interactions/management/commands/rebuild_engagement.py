@@ -0,0 +1,12 @@
+# interactions/management/commands/rebuild_engagement.py
+from django.core.management.base import BaseCommand
+from interactions.engagement import rebuild_engagement
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-volunteer engagement rollup from all interactions'
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('Rebuilding volunteer engagement...'))
+        count = rebuild_engagement()
+        self.stdout.write(self.style.SUCCESS(f'✅ Rebuilt engagement for {count} volunteers'))
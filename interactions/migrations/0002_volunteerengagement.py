@@ -0,0 +1,32 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interactions', '0001_initial'),
+        ('volunteers', '0010_populate_team_memberships'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VolunteerEngagement',
+            fields=[
+                ('volunteer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='engagement', serialize=False, to='volunteers.volunteer')),
+                ('interaction_count', models.PositiveIntegerField(default=0)),
+                ('last_interaction_date', models.DateField(blank=True, db_index=True, null=True)),
+                ('open_followup_count', models.PositiveIntegerField(default=0)),
+                ('next_followup_date', models.DateField(blank=True, db_index=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('last_team_member', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'volunteer_engagement',
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:23
+
+from django.db import migrations
+from django.db.models import Count, Max, Min, Q
+
+
+def populate_volunteer_engagement(apps, schema_editor):
+    """Build a rollup row for every volunteer with at least one interaction"""
+    Interaction = apps.get_model('interactions', 'Interaction')
+    VolunteerEngagement = apps.get_model('interactions', 'VolunteerEngagement')
+
+    open_followup = Q(needs_followup=True, followup_completed=False)
+    rows = Interaction.objects.order_by().values('volunteer_id').annotate(
+        interaction_count=Count('id'),
+        last_interaction_date=Max('interaction_date'),
+        open_followup_count=Count('id', filter=open_followup),
+        next_followup_date=Min('followup_date', filter=open_followup),
+    )
+
+    last_team_member = {}
+    latest = Interaction.objects.order_by(
+        'volunteer_id', '-interaction_date', '-created_at', '-id'
+    ).values_list('volunteer_id', 'team_member_id')
+    for volunteer_id, team_member_id in latest.iterator(chunk_size=5000):
+        last_team_member.setdefault(volunteer_id, team_member_id)
+
+    VolunteerEngagement.objects.bulk_create([
+        VolunteerEngagement(
+            last_team_member_id=last_team_member.get(row['volunteer_id']), **row)
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interactions', '0002_volunteerengagement'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_volunteer_engagement, migrations.RunPython.noop),
+    ]
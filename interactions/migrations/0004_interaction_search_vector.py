@@ -0,0 +1,90 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:29
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Postgres only. A BEFORE trigger recomputes an interaction's vector when
+# its text or people change; AFTER triggers on volunteers and team members
+# re-touch their interactions when a name changes, which also covers the
+# PCO sync's bulk updates. Weights: names A, topics B, notes C.
+CREATE_SEARCH_TRIGGERS = """
+CREATE OR REPLACE FUNCTION interactions_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(
+            (SELECT first_name || ' ' || last_name FROM volunteers WHERE id = NEW.volunteer_id), '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(
+            (SELECT first_name || ' ' || last_name FROM team_members WHERE id = NEW.team_member_id), '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.topics::text, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.discussion_notes, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(NEW.followup_notes, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER interactions_search_vector
+    BEFORE INSERT OR UPDATE OF volunteer_id, team_member_id, topics, discussion_notes, followup_notes
+    ON interactions FOR EACH ROW EXECUTE FUNCTION interactions_search_vector_update();
+
+CREATE OR REPLACE FUNCTION interactions_search_vector_rename() RETURNS trigger AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'volunteers' THEN
+        UPDATE interactions SET volunteer_id = volunteer_id WHERE volunteer_id = NEW.id;
+    ELSE
+        UPDATE interactions SET team_member_id = team_member_id WHERE team_member_id = NEW.id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER volunteers_interactions_search_vector
+    AFTER UPDATE OF first_name, last_name ON volunteers FOR EACH ROW
+    WHEN (OLD.first_name IS DISTINCT FROM NEW.first_name OR OLD.last_name IS DISTINCT FROM NEW.last_name)
+    EXECUTE FUNCTION interactions_search_vector_rename();
+
+CREATE TRIGGER team_members_interactions_search_vector
+    AFTER UPDATE OF first_name, last_name ON team_members FOR EACH ROW
+    WHEN (OLD.first_name IS DISTINCT FROM NEW.first_name OR OLD.last_name IS DISTINCT FROM NEW.last_name)
+    EXECUTE FUNCTION interactions_search_vector_rename();
+
+-- Backfill through the trigger
+UPDATE interactions SET discussion_notes = discussion_notes;
+
+CREATE INDEX IF NOT EXISTS interactions_search_vector_gin ON interactions USING gin (search_vector);
+"""
+
+DROP_SEARCH_TRIGGERS = """
+DROP INDEX IF EXISTS interactions_search_vector_gin;
+DROP TRIGGER IF EXISTS team_members_interactions_search_vector ON team_members;
+DROP TRIGGER IF EXISTS volunteers_interactions_search_vector ON volunteers;
+DROP TRIGGER IF EXISTS interactions_search_vector ON interactions;
+DROP FUNCTION IF EXISTS interactions_search_vector_rename();
+DROP FUNCTION IF EXISTS interactions_search_vector_update();
+"""
+
+
+def create_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_SEARCH_TRIGGERS)
+
+
+def drop_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_SEARCH_TRIGGERS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interactions', '0003_populate_volunteer_engagement'),
+        ('volunteers', '0012_volunteer_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interaction',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_triggers, drop_search_triggers),
+    ]
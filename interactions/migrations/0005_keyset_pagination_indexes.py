@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interactions', '0004_interaction_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interaction',
+            index=models.Index(fields=['interaction_date', 'id'], name='interactions_date_id_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='interaction',
+            name='interaction_interac_f32f52_idx',
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interactions', '0005_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyInteractionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('topic', models.CharField(blank=True, default='', max_length=100)),
+                ('interaction_count', models.PositiveIntegerField(default=0)),
+                ('followup_count', models.PositiveIntegerField(default=0)),
+                ('open_followup_count', models.PositiveIntegerField(default=0)),
+                ('completed_followup_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('team_member', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'daily_interaction_rollups',
+                'indexes': [models.Index(fields=['team_member', 'date'], name='daily_inter_team_me_5aa068_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyinteractionrollup',
+            constraint=models.UniqueConstraint(fields=('date', 'team_member', 'topic'), name='daily_rollup_key'),
+        ),
+    ]
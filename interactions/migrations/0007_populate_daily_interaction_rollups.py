@@ -0,0 +1,40 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:48
+
+from collections import defaultdict
+from django.db import migrations
+
+
+def populate_daily_rollups(apps, schema_editor):
+    """Tally every interaction into its day, team member and topics"""
+    Interaction = apps.get_model('interactions', 'Interaction')
+    DailyInteractionRollup = apps.get_model('interactions', 'DailyInteractionRollup')
+
+    tallies = defaultdict(lambda: [0, 0, 0, 0])
+    rows = Interaction.objects.order_by().values_list(
+        'interaction_date', 'team_member_id', 'topics', 'needs_followup', 'followup_completed')
+    for day, team_member_id, topics, needs_followup, completed in rows.iterator(chunk_size=5000):
+        names = [str(topic).strip()[:100] for topic in topics] if isinstance(topics, list) else []
+        counts = (1, needs_followup, needs_followup and not completed, needs_followup and completed)
+        for topic in dict.fromkeys([''] + [name for name in names if name]):
+            totals = tallies[day, team_member_id, topic]
+            for i, count in enumerate(counts):
+                totals[i] += count
+
+    DailyInteractionRollup.objects.bulk_create([
+        DailyInteractionRollup(
+            date=day, team_member_id=team_member_id, topic=topic,
+            interaction_count=counts[0], followup_count=counts[1],
+            open_followup_count=counts[2], completed_followup_count=counts[3])
+        for (day, team_member_id, topic), counts in tallies.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interactions', '0006_dailyinteractionrollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_daily_rollups, migrations.RunPython.noop),
+    ]
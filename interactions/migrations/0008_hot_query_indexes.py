@@ -0,0 +1,34 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:56
+
+from django.db import migrations, models
+from core.db import AddIndexConcurrently, RemoveIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # Indexes are built and dropped concurrently on Postgres, outside a
+    # transaction, so the interactions table stays writable meanwhile.
+    # The new indexes go in before the ones they replace are dropped.
+    atomic = False
+
+    dependencies = [
+        ('interactions', '0007_populate_daily_interaction_rollups'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='interaction',
+            index=models.Index(fields=['volunteer', '-interaction_date'], name='interactions_vol_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='interaction',
+            index=models.Index(condition=models.Q(('followup_completed', False), ('needs_followup', True)), fields=['followup_date'], name='interactions_open_fu_idx'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='interaction',
+            name='interaction_volunte_9937f0_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='interaction',
+            name='interaction_needs_f_eae512_idx',
+        ),
+    ]
@@ -1,5 +1,6 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from volunteers.models import Volunteer
 
 class Interaction(models.Model):
@@ -30,19 +31,47 @@ class Interaction(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    # Names, topics and notes for ?q= search. Maintained by database
+    # triggers on Postgres (migration 0004) so bulk updates and volunteer
+    # renames are covered; always NULL on other databases.
+    search_vector = SearchVectorField(null=True, editable=False)
     
     class Meta:
         db_table = 'interactions'
         ordering = ['-interaction_date']
         indexes = [
-            models.Index(fields=['volunteer']),
             models.Index(fields=['team_member']),
-            models.Index(fields=['interaction_date']),
-            models.Index(fields=['needs_followup', 'followup_completed']),
+            # Date ordering and ?cursor= pagination
+            models.Index(fields=['interaction_date', 'id'], name='interactions_date_id_idx'),
+            # A volunteer's history and latest interaction, newest first
+            models.Index(fields=['volunteer', '-interaction_date'],
+                         name='interactions_vol_date_idx'),
+            # The follow-up queue: only open follow-ups, by due date
+            models.Index(fields=['followup_date'], name='interactions_open_fu_idx',
+                         condition=models.Q(needs_followup=True, followup_completed=False)),
         ]
     
     def __str__(self):
         return f"{self.volunteer.full_name} - {self.interaction_date}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets the rollup signals see a reassignment to another volunteer,
+        # date or team member
+        instance._loaded_volunteer_id = instance.__dict__.get('volunteer_id')
+        instance._loaded_activity_key = instance.activity_key()
+        return instance
+
+    def activity_key(self):
+        """The DailyInteractionRollup rows this interaction counts towards"""
+        return (self.__dict__.get('interaction_date'), self.__dict__.get('team_member_id'))
+
+    def save(self, *args, **kwargs):
+        # Commit the interaction and its rollup updates together
+        with transaction.atomic():
+            super().save(*args, **kwargs)
     
     @property
     def is_followup_overdue(self):
@@ -57,4 +86,78 @@ class Interaction(models.Model):
         from django.utils import timezone
         self.followup_completed = True
         self.followup_completed_date = timezone.now().date()
-        self.save()
\ No newline at end of file
+        self.save()
+
+
+class VolunteerEngagement(models.Model):
+    """
+    Per-volunteer rollup of interactions, kept current by the signals in
+    interactions/signals.py (rebuild with `manage.py rebuild_engagement`).
+    Volunteers who were never contacted have no row.
+    """
+    volunteer = models.OneToOneField(
+        Volunteer,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='engagement'
+    )
+    interaction_count = models.PositiveIntegerField(default=0)
+    last_interaction_date = models.DateField(null=True, blank=True, db_index=True)
+    last_team_member = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    # Follow-ups still open; overdue ones are those with a past
+    # next_followup_date, which can't be stored without going stale
+    open_followup_count = models.PositiveIntegerField(default=0)
+    next_followup_date = models.DateField(null=True, blank=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'volunteer_engagement'
+
+    def __str__(self):
+        return f"{self.volunteer_id}: {self.interaction_count} interactions"
+
+
+class DailyInteractionRollup(models.Model):
+    """
+    Interaction tallies per day, team member and topic, kept current by
+    the signals in interactions/signals.py (rebuild with
+    `manage.py backfill_daily_rollup`). The row with an empty topic counts
+    every interaction of the day; an interaction with several topics
+    counts once towards each of them.
+    """
+    ALL_TOPICS = ''
+
+    date = models.DateField()
+    team_member = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='daily_rollups'
+    )
+    topic = models.CharField(max_length=100, blank=True, default=ALL_TOPICS)
+    interaction_count = models.PositiveIntegerField(default=0)
+    followup_count = models.PositiveIntegerField(default=0)
+    # Follow-ups from these interactions still open now
+    open_followup_count = models.PositiveIntegerField(default=0)
+    completed_followup_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'daily_interaction_rollups'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'team_member', 'topic'], name='daily_rollup_key'),
+        ]
+        indexes = [
+            models.Index(fields=['team_member', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.team_member_id} {self.topic or '*'}: {self.interaction_count}"
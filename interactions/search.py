@@ -0,0 +1,91 @@
+"""
+?q= search over interaction notes.
+
+On Postgres this is full-text search against the trigger-maintained
+search_vector column (GIN indexed, migration 0004), ranked with ts_rank
+and returning a highlighted snippet of the discussion notes. Other
+databases fall back to substring matching on the same columns. Snippets
+are raw note text with matches wrapped in <mark> tags; escape the rest
+before rendering it as HTML.
+"""
+import re
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, FloatField, Q, Value
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+SEARCH_CONFIG = 'english'
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_STOP = '</mark>'
+SNIPPET_WORDS = 30
+
+
+def search_interactions(queryset, q):
+    """
+    Filter interactions matching `q` (web-search syntax on Postgres:
+    quoted phrases, "or", -exclusions) and annotate `search_rank` and
+    `search_headline`. Returns the queryset unchanged for a blank search.
+    """
+    q = q.strip()
+    if not q:
+        return queryset
+
+    if connections[queryset.db].vendor == 'postgresql':
+        query = SearchQuery(q, search_type='websearch', config=SEARCH_CONFIG)
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F('search_vector'), query),
+            search_headline=SearchHeadline(
+                'discussion_notes', query, config=SEARCH_CONFIG,
+                start_sel=HIGHLIGHT_START, stop_sel=HIGHLIGHT_STOP,
+                max_words=SNIPPET_WORDS, min_words=SNIPPET_WORDS // 2,
+            ),
+        )
+
+    for word in q.split():
+        queryset = queryset.filter(
+            Q(discussion_notes__icontains=word) |
+            Q(followup_notes__icontains=word) |
+            Q(topics__icontains=word) |
+            Q(volunteer__first_name__icontains=word) |
+            Q(volunteer__last_name__icontains=word) |
+            Q(team_member__first_name__icontains=word) |
+            Q(team_member__last_name__icontains=word)
+        )
+    return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+def headline(text, q, words=SNIPPET_WORDS):
+    """
+    Python stand-in for Postgres ts_headline, used on other databases:
+    the first `words` words of `text` from the first match on, with the
+    search words highlighted
+    """
+    terms = [re.escape(term) for term in q.split() if term]
+    tokens = (text or '').split()
+    if not terms or not tokens:
+        return ' '.join(tokens[:words])
+
+    pattern = re.compile('|'.join(terms), re.IGNORECASE)
+    start = next((i for i, token in enumerate(tokens) if pattern.search(token)), 0)
+    start = max(0, min(start - words // 4, len(tokens) - words))
+    snippet = ' '.join(tokens[start:start + words])
+    return pattern.sub(lambda m: f'{HIGHLIGHT_START}{m.group(0)}{HIGHLIGHT_STOP}', snippet)
+
+
+class InteractionSearchFilter(BaseFilterBackend):
+    """
+    ?q= backend for InteractionViewSet. Results are ordered best match
+    first unless the client asked for an explicit ?ordering=; list it after
+    OrderingFilter so the ranking isn't replaced by the default ordering.
+    """
+    search_param = 'q'
+
+    def filter_queryset(self, request, queryset, view):
+        q = request.query_params.get(self.search_param, '')
+        if not q.strip():
+            return queryset
+
+        queryset = search_interactions(queryset, q)
+        if request.query_params.get(OrderingFilter.ordering_param):
+            return queryset
+        return queryset.order_by('-search_rank', *queryset.query.order_by)
@@ -1,10 +1,12 @@
 from rest_framework import serializers
 from .models import Interaction
+from .search import headline
 from volunteers.serializers import VolunteerSerializer
 from core.serializers import TeamMemberSerializer
+from core.sparse import SparseFieldsSerializerMixin
 
-class InteractionSerializer(serializers.ModelSerializer):
-    """Serializer for interaction list and details"""
+class InteractionSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
+    """Serializer for interaction list and details (supports ?fields= and ?omit=)"""
     volunteer_name = serializers.CharField(source='volunteer.full_name', read_only=True)
     team_member_name = serializers.CharField(source='team_member.full_name', read_only=True)
     is_followup_overdue = serializers.ReadOnlyField()
@@ -19,6 +21,37 @@ class InteractionSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'team_member', 'created_at', 'updated_at']
+        # ?fields=compact: everything but the note texts and timestamps
+        compact_fields = [
+            'id', 'team_member', 'team_member_name', 'volunteer', 'volunteer_name',
+            'interaction_date', 'topics', 'needs_followup', 'followup_date',
+            'followup_completed', 'is_followup_overdue'
+        ]
+        field_sources = {
+            'team_member_name': ('team_member__first_name', 'team_member__last_name'),
+            'volunteer_name': ('volunteer__first_name', 'volunteer__last_name'),
+            'is_followup_overdue': ('needs_followup', 'followup_completed', 'followup_date'),
+        }
+
+class InteractionSearchSerializer(InteractionSerializer):
+    """Interaction list entry for ?q= searches, with relevance and a highlighted snippet"""
+    search_rank = serializers.FloatField(read_only=True)
+    search_snippet = serializers.SerializerMethodField()
+    
+    class Meta(InteractionSerializer.Meta):
+        fields = InteractionSerializer.Meta.fields + ['search_rank', 'search_snippet']
+        compact_fields = InteractionSerializer.Meta.compact_fields + ['search_rank', 'search_snippet']
+        field_sources = {
+            **InteractionSerializer.Meta.field_sources,
+            'search_rank': (),
+            'search_snippet': ('discussion_notes',),
+        }
+    
+    def get_search_snippet(self, obj):
+        # Postgres annotates ts_headline; other databases build it here
+        if hasattr(obj, 'search_headline'):
+            return obj.search_headline
+        return headline(obj.discussion_notes, self.context.get('q', ''))
 
 class InteractionCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating interactions"""
@@ -48,7 +81,7 @@ class InteractionUpdateSerializer(serializers.ModelSerializer):
             'followup_completed', 'followup_completed_date'
         ]
 
-class InteractionDetailSerializer(serializers.ModelSerializer):
+class InteractionDetailSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """Detailed serializer with nested volunteer and team member"""
     volunteer = VolunteerSerializer(read_only=True)
     team_member = TeamMemberSerializer(read_only=True)
@@ -62,4 +95,7 @@ class InteractionDetailSerializer(serializers.ModelSerializer):
             'needs_followup', 'followup_date', 'followup_notes',
             'followup_completed', 'followup_completed_date', 'is_followup_overdue',
             'created_at', 'updated_at'
-        ]
\ No newline at end of file
+        ]
+        field_sources = {
+            'is_followup_overdue': ('needs_followup', 'followup_completed', 'followup_date'),
+        }
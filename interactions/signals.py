@@ -0,0 +1,78 @@
+"""
+Keep VolunteerEngagement, DailyInteractionRollup and the stats cache
+version in step with interaction writes. Handlers run inside the write's
+transaction: Interaction.save() wraps itself in one and deletes
+(including cascades) run in the deletion's transaction.
+"""
+from django.conf import settings
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from core.cache import stats_changed
+from volunteers.models import Volunteer
+from .activity import refresh_daily_activity
+from .engagement import refresh_engagement
+from .models import DailyInteractionRollup, Interaction
+
+
+@receiver(post_save, sender=Interaction)
+def interaction_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    refresh_engagement(instance.volunteer_id)
+
+    previous = getattr(instance, '_loaded_volunteer_id', None)
+    if previous is not None and previous != instance.volunteer_id:
+        # Reassigned to another volunteer; the old one lost an interaction
+        refresh_engagement(previous)
+    instance._loaded_volunteer_id = instance.volunteer_id
+
+    key = instance.activity_key()
+    refresh_daily_activity(*key)
+    previous = getattr(instance, '_loaded_activity_key', None)
+    if previous is not None and previous[0] is not None and previous != key:
+        # Moved to another day or team member
+        refresh_daily_activity(*previous)
+    instance._loaded_activity_key = key
+    stats_changed()
+
+
+@receiver(post_delete, sender=Interaction)
+def interaction_deleted(sender, instance, origin=None, **kwargs):
+    # Deleting the volunteer takes the engagement row with it, and its own
+    # signals refresh the daily rollup and invalidate the stats once
+    if isinstance(origin, Volunteer) or (
+            isinstance(origin, QuerySet) and origin.model is Volunteer):
+        return
+    refresh_engagement(instance.volunteer_id)
+    refresh_daily_activity(*instance.activity_key())
+    stats_changed()
+
+
+@receiver(pre_delete, sender=Volunteer)
+def volunteer_deleting(sender, instance, **kwargs):
+    instance._activity_keys = set(Interaction.objects.filter(
+        volunteer=instance
+    ).values_list('interaction_date', 'team_member_id'))
+
+
+@receiver(post_delete, sender=Volunteer)
+def volunteer_deleted(sender, instance, **kwargs):
+    # The volunteer's interactions are gone by now
+    for key in getattr(instance, '_activity_keys', ()):
+        refresh_daily_activity(*key)
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def team_member_deleting(sender, instance, **kwargs):
+    instance._activity_dates = set(DailyInteractionRollup.objects.filter(
+        team_member=instance, topic=DailyInteractionRollup.ALL_TOPICS
+    ).values_list('date', flat=True))
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def team_member_deleted(sender, instance, **kwargs):
+    # Their rollup rows were deleted and their interactions kept without
+    # a team member; count those towards the no-team-member rows
+    for day in getattr(instance, '_activity_dates', ()):
+        refresh_daily_activity(day, None)
@@ -0,0 +1,231 @@
+import random
+from datetime import timedelta
+from unittest import skipUnless
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from core.models import TeamMember
+from volunteers.models import Volunteer
+from .engagement import rebuild_engagement
+from .models import Interaction, VolunteerEngagement
+
+
+@override_settings(ALLOWED_HOSTS=['*'], SECURE_SSL_REDIRECT=False)
+class AnalyticsPivotTests(APITestCase):
+
+    def setUp(self):
+        self.member = TeamMember.objects.create(username='member')
+        self.client.force_authenticate(self.member)
+        volunteer = Volunteer.objects.create(first_name='Ada', last_name='Lovelace')
+        today = timezone.now().date()
+        for topics, needs_followup in [(['Prayer'], False), (['Family'], False), (['Prayer'], True)]:
+            Interaction.objects.create(
+                volunteer=volunteer, team_member=self.member, interaction_date=today,
+                discussion_notes='Checked in', topics=topics, needs_followup=needs_followup,
+                followup_date=today - timedelta(days=1) if needs_followup else None)
+
+    def test_measures_are_zero_when_nothing_matches_them(self):
+        response = self.client.get('/api/analytics/pivot/', {
+            'dimensions': 'topic',
+            'measures': 'count,overdue_followups,volunteers',
+            'followup_status': 'none',
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['rows'], [
+            {'topic': 'Family', 'count': 1, 'overdue_followups': 0, 'volunteers': 1},
+            {'topic': 'Prayer', 'count': 1, 'overdue_followups': 0, 'volunteers': 1},
+        ])
+        self.assertEqual(response.data['totals'],
+                         {'count': 2, 'overdue_followups': 0, 'volunteers': 1})
+
+
+class EngagementRollupTests(TestCase):
+    """The signal-maintained rollup matches a rebuild after every kind of write"""
+
+    def setUp(self):
+        self.member = TeamMember.objects.create(username='member')
+        self.other_member = TeamMember.objects.create(username='other')
+        self.ada = Volunteer.objects.create(first_name='Ada', last_name='Lovelace')
+        self.grace = Volunteer.objects.create(first_name='Grace', last_name='Hopper')
+        self.today = timezone.now().date()
+
+    def log(self, volunteer, days_ago, member=None, followup_in=None):
+        return Interaction.objects.create(
+            volunteer=volunteer, team_member=member or self.member,
+            interaction_date=self.today - timedelta(days=days_ago),
+            discussion_notes='Checked in', needs_followup=followup_in is not None,
+            followup_date=self.today + timedelta(days=followup_in) if followup_in is not None else None)
+
+    def rollup(self):
+        return {
+            row.pop('volunteer_id'): row
+            for row in VolunteerEngagement.objects.order_by('volunteer_id').values(
+                'volunteer_id', 'interaction_count', 'last_interaction_date',
+                'last_team_member_id', 'open_followup_count', 'next_followup_date')
+        }
+
+    def assertMatchesRebuild(self):
+        maintained = self.rollup()
+        rebuild_engagement()
+        self.assertEqual(maintained, self.rollup())
+
+    def test_create(self):
+        self.log(self.ada, days_ago=10, followup_in=5)
+        self.log(self.ada, days_ago=2, member=self.other_member)
+        self.log(self.grace, days_ago=4, followup_in=1)
+
+        self.assertEqual(self.rollup()[self.ada.id]['interaction_count'], 2)
+        self.assertMatchesRebuild()
+
+    def test_reassign(self):
+        self.log(self.ada, days_ago=10)
+        moved = self.log(self.ada, days_ago=1, member=self.other_member, followup_in=3)
+        self.log(self.grace, days_ago=20)
+
+        moved = Interaction.objects.get(pk=moved.pk)
+        moved.volunteer = self.grace
+        moved.save()
+
+        rollup = self.rollup()
+        self.assertEqual(rollup[self.ada.id]['interaction_count'], 1)
+        self.assertEqual(rollup[self.grace.id]['interaction_count'], 2)
+        self.assertMatchesRebuild()
+
+    def test_reassign_last_interaction(self):
+        moved = self.log(self.ada, days_ago=1)
+
+        moved = Interaction.objects.get(pk=moved.pk)
+        moved.volunteer = self.grace
+        moved.save()
+
+        self.assertNotIn(self.ada.id, self.rollup())
+        self.assertMatchesRebuild()
+
+    def test_delete(self):
+        self.log(self.ada, days_ago=10, followup_in=2)
+        latest = self.log(self.ada, days_ago=1, member=self.other_member)
+        only = self.log(self.grace, days_ago=3)
+
+        latest.delete()
+        only.delete()
+
+        rollup = self.rollup()
+        self.assertEqual(rollup[self.ada.id]['last_team_member_id'], self.member.id)
+        self.assertNotIn(self.grace.id, rollup)
+        self.assertMatchesRebuild()
+
+    def test_queryset_delete(self):
+        self.log(self.ada, days_ago=10)
+        self.log(self.ada, days_ago=1, followup_in=2)
+        self.log(self.grace, days_ago=3)
+
+        Interaction.objects.filter(interaction_date__gte=self.today - timedelta(days=5)).delete()
+
+        self.assertEqual(list(self.rollup()), [self.ada.id])
+        self.assertMatchesRebuild()
+
+
+@override_settings(ALLOWED_HOSTS=['*'], SECURE_SSL_REDIRECT=False)
+class InteractionQueryBudgetTests(APITestCase):
+
+    def test_detail(self):
+        member = TeamMember.objects.create(username='member')
+        self.client.force_authenticate(member)
+        interaction = Interaction.objects.create(
+            volunteer=Volunteer.objects.create(first_name='Ada', last_name='Lovelace'),
+            team_member=member, interaction_date=timezone.now().date(),
+            discussion_notes='Checked in')
+
+        with self.assertNumQueries(3):  # interaction + volunteer + team member
+            response = self.client.get(f'/api/interactions/{interaction.id}/')
+        self.assertEqual(response.status_code, 200)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Query plans are checked on Postgres')
+@override_settings(ALLOWED_HOSTS=['*'], SECURE_SSL_REDIRECT=False)
+class HotQueryPlanTests(APITestCase):
+    """The follow-up queue and volunteer timelines are planned with their indexes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(42)
+        today = timezone.now().date()
+        members = TeamMember.objects.bulk_create([
+            TeamMember(username=f'member{i}') for i in range(20)])
+        # About one in ten volunteers archived
+        volunteers = Volunteer.objects.bulk_create([
+            Volunteer(first_name=f'First{i}', last_name=f'Last{i % 997}',
+                      is_archived=rng.random() < 0.1)
+            for i in range(2000)
+        ], batch_size=1000)
+
+        # Three years of interactions; a fifth need a follow-up and most
+        # of those older than a month have been completed
+        interactions = []
+        for _ in range(20000):
+            day = today - timedelta(days=rng.randint(0, 3 * 365))
+            needs_followup = rng.random() < 0.2
+            interactions.append(Interaction(
+                volunteer=rng.choice(volunteers), team_member=rng.choice(members),
+                interaction_date=day, discussion_notes='Checked in',
+                needs_followup=needs_followup,
+                followup_completed=needs_followup and (today - day).days > 30 and rng.random() < 0.95,
+                followup_date=day + timedelta(days=rng.randint(1, 21)) if needs_followup else None,
+            ))
+        Interaction.objects.bulk_create(interactions, batch_size=1000)
+        rebuild_engagement()  # bulk_create skips the engagement signals
+
+        # Planner statistics, as autovacuum gathers them in production
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        cls.member, cls.volunteer = members[0], volunteers[0]
+
+    def setUp(self):
+        self.client.force_authenticate(self.member)
+
+    def assertUsesIndex(self, request, fragment, table, index):
+        """EXPLAIN the query of `request` containing `fragment` and look for `index`"""
+        with CaptureQueriesContext(connection) as queries:
+            response = request()
+        self.assertLess(response.status_code, 400)
+        sql = next(
+            query['sql'] for query in queries
+            if f'FROM "{table}"' in query['sql'] and fragment in query['sql'])
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN {sql}')
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        self.assertIn(index, plan)
+        self.assertNotIn(f'Seq Scan on {table}', plan)
+
+    def test_followup_queue(self):
+        for url in ['/api/interactions/pending_followups/',
+                    '/api/interactions/overdue_followups/',
+                    '/api/dashboard/upcoming-followups/']:
+            with self.subTest(url=url):
+                self.assertUsesIndex(
+                    lambda: self.client.get(url), 'ORDER BY "interactions"."followup_date"',
+                    'interactions', 'interactions_open_fu_idx')
+
+    def test_volunteer_history(self):
+        self.assertUsesIndex(
+            lambda: self.client.get(f'/api/volunteers/{self.volunteer.id}/history/'),
+            'ORDER BY "interactions"."interaction_date" DESC',
+            'interactions', 'interactions_vol_date_idx')
+
+    def test_last_interaction_lookup(self):
+        # Logging an interaction refreshes the volunteer's engagement row
+        self.assertUsesIndex(
+            lambda: self.client.post('/api/interactions/', {
+                'volunteer': self.volunteer.id, 'interaction_date': timezone.now().date(),
+                'discussion_notes': 'Checked in', 'topics': [],
+            }, format='json'),
+            'ORDER BY "interactions"."interaction_date" DESC, "interactions"."created_at" DESC',
+            'interactions', 'interactions_vol_date_idx')
+
+    def test_active_volunteer_list(self):
+        self.assertUsesIndex(
+            lambda: self.client.get('/api/volunteers/'), 'ORDER BY "volunteers"."last_name"',
+            'volunteers', 'volunteers_active_name_idx')
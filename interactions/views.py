@@ -2,26 +2,53 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db.models import Count, Prefetch
 from django.utils import timezone
+from datetime import date
+from core.models import TeamMember
+from core.sparse import SparseFieldsViewMixin
+from volunteers.models import Volunteer
 from .models import Interaction
 from .serializers import (
     InteractionSerializer, InteractionCreateSerializer,
-    InteractionUpdateSerializer, InteractionDetailSerializer
+    InteractionUpdateSerializer, InteractionDetailSerializer, InteractionSearchSerializer
 )
+from .analytics import DIMENSIONS, LABELLED, Pivot, PivotError, get_snapshot
 from .filters import InteractionFilter
+from .search import InteractionSearchFilter
 
-class InteractionViewSet(viewsets.ModelViewSet):
+class InteractionViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing interactions
     """
-    queryset = Interaction.objects.select_related('volunteer', 'team_member').all()
+    queryset = Interaction.objects.select_related('volunteer', 'team_member').defer('search_vector')
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    # ?q= search runs last so its ranking survives the default ordering
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, InteractionSearchFilter]
     filterset_class = InteractionFilter
     ordering_fields = ['interaction_date', 'created_at']
     ordering = ['-interaction_date']
+    # ?cursor= pagination key, backed by the (interaction_date, id) index
+    keyset_ordering = ('-interaction_date', '-id')
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'retrieve':
+            # The detail serializer nests both sides with their interaction
+            # counts; fetch them annotated instead of counting per object
+            queryset = queryset.select_related(None)
+            if self.wants_field('volunteer'):
+                queryset = queryset.prefetch_related(
+                    Prefetch('volunteer', queryset=Volunteer.objects.with_interaction_stats()))
+            if self.wants_field('team_member'):
+                queryset = queryset.prefetch_related(
+                    Prefetch('team_member', queryset=TeamMember.objects.annotate(
+                        annotated_interaction_count=Count('interactions'))))
+        return queryset
+
     def get_serializer_class(self):
         if self.action == 'create':
             return InteractionCreateSerializer
@@ -29,7 +56,14 @@ class InteractionViewSet(viewsets.ModelViewSet):
             return InteractionUpdateSerializer
         elif self.action == 'retrieve':
             return InteractionDetailSerializer
+        elif self.action == 'list' and self.request.query_params.get('q', '').strip():
+            return InteractionSearchSerializer
         return InteractionSerializer
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['q'] = self.request.query_params.get('q', '')
+        return context
     
     def perform_create(self, serializer):
         """Set the team_member to current user when creating"""
@@ -66,4 +100,81 @@ class InteractionViewSet(viewsets.ModelViewSet):
         ).select_related('volunteer', 'team_member').order_by('followup_date')
         
         serializer = self.get_serializer(overdue, many=True)
-        return Response({'followups': serializer.data})
\ No newline at end of file
+        return Response({'followups': serializer.data})
+
+
+class AnalyticsPivotView(APIView):
+    """
+    Ad-hoc pivot over all interactions, answered from this worker's
+    in-memory snapshot (see interactions/analytics.py):
+
+    ?dimensions=team_member,topic,month  up to 3 of team_member, volunteer,
+        topic, team, followup_status, day, week, month, quarter, year, weekday
+        (at most one of topic and team)
+    ?measures=count,completion_rate  count (default), volunteers, followups,
+        open_followups, completed_followups, overdue_followups, completion_rate
+    ?start=&end=  interaction date range, inclusive
+    ?<dimension>=a,b  keep only these values (ids for team_member and
+        volunteer, "null" for none)
+    ?sort=-count  a dimension or measure, "-" for descending
+    ?limit=  rows returned (default 1000)
+    """
+    permission_classes = [IsAuthenticated]
+    default_limit = 1000
+    max_limit = 10000
+
+    def get(self, request):
+        params = request.query_params
+        dimensions = self._list(params, 'dimensions')
+        measures = self._list(params, 'measures') or ['count']
+        filters = {
+            name: self._list(params, name) for name in DIMENSIONS if name in params
+        }
+        try:
+            limit = min(int(params.get('limit', self.default_limit)), self.max_limit)
+            start = date.fromisoformat(params['start']) if params.get('start') else None
+            end = date.fromisoformat(params['end']) if params.get('end') else None
+        except ValueError:
+            raise ValidationError({'detail': 'limit must be a number and start/end dates as YYYY-MM-DD'})
+
+        snapshot = get_snapshot()
+        try:
+            rows, totals = Pivot(snapshot, dimensions, measures, filters, start, end).run()
+        except PivotError as e:
+            raise ValidationError({'detail': str(e)})
+
+        sort = params.get('sort', '')
+        field = sort.lstrip('-')
+        if field and field not in dimensions + measures:
+            raise ValidationError({'sort': f'Not a requested dimension or measure: {field}'})
+        order = [field] if field else dimensions
+        rows.sort(key=lambda row: [(row[name] is None, row[name]) for name in order],
+                  reverse=sort.startswith('-'))
+
+        row_count = len(rows)
+        rows = rows[:max(limit, 0)]
+        labels = {
+            name: {
+                str(row[name]): snapshot.names[name].get(row[name])
+                for row in rows if row[name] is not None
+            }
+            for name in LABELLED if name in dimensions
+        }
+        return Response({
+            'dimensions': dimensions,
+            'measures': measures,
+            'rows': rows,
+            'row_count': row_count,
+            'totals': totals,
+            'labels': labels,
+            'snapshot': {
+                'version': snapshot.version,
+                'interactions': len(snapshot),
+                'built_at': snapshot.built_at,
+            },
+        })
+
+    @staticmethod
+    def _list(params, name):
+        return list(dict.fromkeys(
+            value.strip() for value in params.get(name, '').split(',') if value.strip()))
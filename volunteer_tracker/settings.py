@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework_simplejwt',
     'corsheaders',
@@ -94,6 +95,22 @@ DATABASES = {
     )
 }
 
+# Cache (dashboard statistics, see core/cache.py). Local memory per worker
+# by default; set CACHE_BACKEND to e.g.
+# django.core.cache.backends.filebased.FileBasedCache (CACHE_LOCATION is a
+# directory) or django.core.cache.backends.db.DatabaseCache (CACHE_LOCATION
+# is a table, created by `manage.py createcachetable`) to share it.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'volunteer-tracker'),
+    }
+}
+# Entries are invalidated by writes; this only bounds how long stale ones linger
+STATS_CACHE_TIMEOUT = int(os.environ.get('STATS_CACHE_TIMEOUT', '86400'))
+# Memory each worker may keep for /api/analytics/pivot/ snapshots
+ANALYTICS_SNAPSHOT_MB = int(os.environ.get('ANALYTICS_SNAPSHOT_MB', '128'))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -127,7 +144,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
     'PAGE_SIZE': 50,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -170,8 +187,42 @@ CORS_ALLOWED_ORIGINS = CORS_ALLOWED_ORIGINS_LIST
 CORS_ALLOW_CREDENTIALS = True
 
 # Planning Center Online API
+PCO_API_BASE_URL = os.environ.get(
+    'PCO_API_BASE_URL', 'https://api.planningcenteronline.com')
 PCO_APP_ID = os.environ.get('PCO_APP_ID', '')
 PCO_SECRET = os.environ.get('PCO_SECRET', '')
+# Incremental syncs fall back to a full sweep after this many hours
+PCO_FULL_SYNC_INTERVAL_HOURS = int(
+    os.environ.get('PCO_FULL_SYNC_INTERVAL_HOURS', '168'))
+# Set to False to sync people without their addresses (smaller payloads)
+PCO_SYNC_ADDRESSES = os.environ.get('PCO_SYNC_ADDRESSES', 'True') == 'True'
+# Parallel page fetches during full syncs. Fetch threads write the shared
+# rate-limit bucket while pages are being upserted, which SQLite's single
+# writer can't take, so SQLite databases default to 1
+PCO_SYNC_CONCURRENCY = int(os.environ.get(
+    'PCO_SYNC_CONCURRENCY',
+    '1' if DATABASES['default']['ENGINE'].endswith('sqlite3') else '4'))
+# Seconds to wait for a connection / for a response from PCO
+PCO_CONNECT_TIMEOUT = float(os.environ.get('PCO_CONNECT_TIMEOUT', '5'))
+PCO_READ_TIMEOUT = float(os.environ.get('PCO_READ_TIMEOUT', '30'))
+# Retries on 429/5xx/connection errors, with exponential backoff and jitter
+PCO_MAX_RETRIES = int(os.environ.get('PCO_MAX_RETRIES', '5'))
+PCO_BACKOFF_SECONDS = float(os.environ.get('PCO_BACKOFF_SECONDS', '1'))
+PCO_BACKOFF_MAX_SECONDS = float(os.environ.get('PCO_BACKOFF_MAX_SECONDS', '60'))
+# Running sync jobs without a worker heartbeat for this long, and queued
+# jobs no worker has claimed for this long, are failed
+PCO_SYNC_JOB_STALE_MINUTES = int(os.environ.get('PCO_SYNC_JOB_STALE_MINUTES', '15'))
+# Set to True when a `python manage.py run_sync_worker` process runs the
+# jobs POST /api/volunteers/sync/ queues; otherwise the web process runs
+# each job in a background thread
+PCO_SYNC_WORKER = os.environ.get('PCO_SYNC_WORKER', 'False') == 'True'
+# Scheduled incremental syncs (python manage.py run_pco_scheduler)
+AUTO_SYNC_PCO = os.environ.get('AUTO_SYNC_PCO', 'False') == 'True'
+PCO_AUTO_SYNC_INTERVAL_MINUTES = int(os.environ.get('PCO_AUTO_SYNC_INTERVAL_MINUTES', '60'))
+PCO_AUTO_SYNC_JITTER_SECONDS = int(os.environ.get('PCO_AUTO_SYNC_JITTER_SECONDS', '300'))
+# Authenticity secrets of the PCO webhook subscriptions (comma-separated);
+# deliveries are rejected while this is empty
+PCO_WEBHOOK_SECRETS = os.environ.get('PCO_WEBHOOK_SECRETS', '')
 
 # LLM API Keys
 OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY', '')
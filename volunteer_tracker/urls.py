@@ -6,14 +6,14 @@ from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 from core.views import TeamMemberViewSet, AuthViewSet
 from core.admin_views import AdminDashboardViewSet, SettingsView
-from volunteers.views import VolunteerViewSet
-from interactions.views import InteractionViewSet
+from volunteers.views import VolunteerViewSet, TeamViewSet, PCOWebhookView
+from interactions.views import InteractionViewSet, AnalyticsPivotView
 from interactions.admin_views import InteractionAdminViewSet
 from core.dashboard_views import (
     DashboardOverviewView, DashboardTrendsView, DashboardTeamActivityView,
     DashboardVolunteersNeedCheckinView, DashboardRecentInteractionsView,
     DashboardUpcomingFollowupsView, DashboardMyStatsView,
-    DashboardEngagementMetricsView
+    DashboardEngagementMetricsView, DashboardBundleView
 )
 
 # Create router and register viewsets
@@ -23,6 +23,7 @@ router = DefaultRouter()
 router.register(r'team-members', TeamMemberViewSet, basename='team-member')
 router.register(r'auth', AuthViewSet, basename='auth')
 router.register(r'volunteers', VolunteerViewSet, basename='volunteer')
+router.register(r'teams', TeamViewSet, basename='team')
 router.register(r'interactions', InteractionViewSet, basename='interaction')
 
 # Admin endpoints (admin users only)
@@ -52,7 +53,14 @@ urlpatterns = [
     # Admin Settings
     path('api/admin/settings/', SettingsView.as_view(), name='admin-settings'),
 
+    # Planning Center webhooks
+    path('api/pco/webhooks/', PCOWebhookView.as_view(), name='pco-webhooks'),
+
     # Dashboard endpoints
+    path('api/analytics/pivot/', AnalyticsPivotView.as_view(),
+         name='analytics-pivot'),
+    path('api/dashboard/bundle/', DashboardBundleView.as_view(),
+         name='dashboard-bundle'),
     path('api/dashboard/overview/', DashboardOverviewView.as_view(),
          name='dashboard-overview'),
     path('api/dashboard/trends/', DashboardTrendsView.as_view(),
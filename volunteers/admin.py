@@ -1,7 +1,7 @@
 
 # volunteers/admin.py
 from django.contrib import admin
-from .models import Volunteer
+from .models import Team, TeamMembership, Volunteer
 
 
 @admin.register(Volunteer)
@@ -13,6 +13,9 @@ class VolunteerAdmin(admin.ModelAdmin):
     readonly_fields = ['pco_person_id',
                        'last_synced_at', 'created_at', 'updated_at']
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_interaction_stats()
+
     fieldsets = (
         ('Basic Information', {
             'fields': ('first_name', 'last_name', 'email', 'phone')
@@ -32,3 +35,17 @@ class VolunteerAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+
+class TeamMembershipInline(admin.TabularInline):
+    model = TeamMembership
+    raw_id_fields = ['volunteer']
+    extra = 0
+
+
+@admin.register(Team)
+class TeamAdmin(admin.ModelAdmin):
+    list_display = ['name', 'service_type_name', 'pco_team_id', 'updated_at']
+    search_fields = ['name', 'service_type_name']
+    readonly_fields = ['pco_team_id', 'created_at', 'updated_at']
+    inlines = [TeamMembershipInline]
@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class VolunteersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'volunteers'
\ No newline at end of file
+    name = 'volunteers'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,181 @@
+"""
+Process-local prefix index for the volunteer picker.
+
+Each worker keeps a sorted list of normalized name, email and phone digit
+tokens and answers prefix queries with bisect, so lookups never touch
+the volunteers table. The index is rebuilt lazily when the volunteers
+DataVersion has moved since it was built, which keeps every gunicorn
+worker consistent without any cross-process messaging.
+"""
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+from heapq import merge, nsmallest
+from itertools import chain
+from core.models import DataVersion
+from .models import VOLUNTEERS_VERSION, Volunteer
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+# Digits and phone punctuation only, with at least one digit
+PHONE_QUERY = re.compile(r'[\s()+.\-]*\d[\d\s()+.\-]*')
+APOSTROPHES = re.compile(r"['’]")
+SEPARATORS = re.compile(r'[^\w@.+]+')
+EMAIL_SEPARATORS = re.compile(r'[@._+\-]')
+# Sorts after every string starting with the same prefix
+PREFIX_END = chr(0x10FFFF)
+# Past this many posting lists a heap merge costs more than a set union
+MERGE_LISTS = 256
+
+
+@lru_cache(maxsize=65536)
+def normalize(text):
+    """Casefold and strip accents and punctuation: "O'Brien-Núñez" -> "obrien nunez" """
+    text = text or ''
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(char for char in text if not unicodedata.combining(char))
+    text = APOSTROPHES.sub('', text.casefold())
+    return SEPARATORS.sub(' ', text).strip()
+
+
+def volunteer_tokens(first_name, last_name, email, digits):
+    """Every string a volunteer can be found by a prefix of"""
+    tokens = set(normalize(first_name).split())
+    tokens.update(normalize(last_name).split())
+    if email:
+        email = email.strip().casefold()
+        tokens.add(email)
+        # "jane.doe@example.org" is also found by "doe"
+        tokens.update(part for part in EMAIL_SEPARATORS.split(email) if part)
+    if digits:
+        tokens.add(digits)
+        if len(digits) == 11 and digits.startswith('1'):
+            tokens.add(digits[1:])  # North American numbers with country code
+    return tokens
+
+
+class PrefixIndex:
+    """
+    Immutable snapshot of active volunteers, searchable by token prefix.
+    Volunteers are numbered in name order and every distinct token keeps
+    the sorted numbers of the volunteers having it, so the best matches
+    come off a merge of a few lists instead of a scan of every match.
+    """
+
+    def __init__(self, rows, version):
+        self.version = version
+        rows = sorted(rows, key=lambda row: (normalize(row[2]), normalize(row[1]), row[0]))
+        self.entries = []
+        self.entry_tokens = []
+        postings = {}
+        for position, (id, first_name, last_name, email, digits, teams) in enumerate(rows):
+            self.entries.append({'id': id, 'name': f'{first_name} {last_name}', 'teams': teams or []})
+            tokens = volunteer_tokens(first_name, last_name, email, digits)
+            self.entry_tokens.append(tuple(tokens))
+            for token in tokens:
+                postings.setdefault(token, []).append(position)
+        self.tokens = sorted(postings)
+        self.postings = [postings[token] for token in self.tokens]
+        # cumulative[i] = postings in tokens[:i], to size a prefix in O(1)
+        self.cumulative = [0]
+        for positions in self.postings:
+            self.cumulative.append(self.cumulative[-1] + len(positions))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _range(self, word):
+        """Slice of self.tokens starting with word; an exact match comes first"""
+        start = bisect_left(self.tokens, word)
+        return start, bisect_left(self.tokens, word + PREFIX_END, start)
+
+    def _size(self, start, end):
+        return self.cumulative[end] - self.cumulative[start]
+
+    def _has_prefix(self, position, word):
+        return any(token.startswith(word) for token in self.entry_tokens[position])
+
+    def search(self, q, limit=DEFAULT_LIMIT):
+        """
+        Volunteers with a token starting with every word of `q`; whole-word
+        matches first, then by name
+        """
+        words = normalize(q).split()
+        if PHONE_QUERY.fullmatch(q.strip()):
+            words = [re.sub(r'\D', '', q)]  # "(555) 123-4" is one phone prefix
+        words = list(dict.fromkeys(words))
+        if not words:
+            return []
+
+        # Drive the search from the word with the fewest candidates and
+        # check the others against each candidate's own tokens
+        ranges = {word: self._range(word) for word in words}
+        driver = min(words, key=lambda word: self._size(*ranges[word]))
+        others = [word for word in words if word != driver]
+
+        start, end = ranges[driver]
+        exact = []
+        if start < end and self.tokens[start] == driver:
+            exact = self.postings[start]
+            start += 1
+        partial = self.postings[start:end]
+        if not others:
+            # Whole-word matches in name order, then prefix matches
+            best = exact[:limit]
+            if len(best) < limit:
+                taken = set(best)
+                if len(partial) > MERGE_LISTS:
+                    # Thousands of one-volunteer tokens (phone digits)
+                    rest = set(chain.from_iterable(partial)).difference(taken)
+                    best += nsmallest(limit - len(best), rest)
+                else:
+                    for position in merge(*partial):
+                        if position not in taken:
+                            taken.add(position)
+                            best.append(position)
+                            if len(best) == limit:
+                                break
+            return [self.entries[position] for position in best]
+
+        scores = dict.fromkeys(chain.from_iterable(partial), 0)
+        scores.update(dict.fromkeys(exact, 1))
+        for word in others:
+            scores = {
+                position: score + (word in self.entry_tokens[position])
+                for position, score in scores.items() if self._has_prefix(position, word)
+            }
+        best = sorted(scores, key=lambda position: (-scores[position], position))
+        return [self.entries[position] for position in best[:limit]]
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def build_index():
+    # Read the version before the rows: a write landing mid-build moves
+    # the version past this snapshot and forces the next rebuild
+    version = DataVersion.current(VOLUNTEERS_VERSION)
+    rows = Volunteer.objects.filter(is_archived=False).values_list(
+        'id', 'first_name', 'last_name', 'email', 'phone_digits', 'teams')
+    return PrefixIndex(list(rows.iterator(chunk_size=5000)), version)
+
+
+def get_index():
+    """This worker's index, rebuilt first if volunteers changed since it was built"""
+    global _index
+    version = DataVersion.current(VOLUNTEERS_VERSION)
+    index = _index
+    if index is not None and index.version == version:
+        return index
+    with _lock:
+        if _index is None or _index.version != version:
+            _index = build_index()
+        return _index
+
+
+def autocomplete(q, limit=DEFAULT_LIMIT):
+    return get_index().search(q, limit=max(1, min(limit, MAX_LIMIT)))
@@ -0,0 +1,156 @@
+import logging
+import threading
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from core.cache import stats_changed
+from .models import SyncJob
+from .services import PCOService, parse_since
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_sync(kind=SyncJob.KIND_PEOPLE, options=None, requested_by=None, start=False):
+    """
+    Queue a PCO sync. Returns (job, created); if a job of the same kind is
+    already queued or running, that job is returned instead of a new one.
+    With start=True the new job is created already claimed, for callers
+    that run it themselves instead of leaving it to run_sync_worker.
+    """
+    fields = {}
+    if start:
+        now = timezone.now()
+        fields = {'status': SyncJob.STATUS_RUNNING, 'started_at': now, 'heartbeat_at': now}
+
+    while True:
+        try:
+            with transaction.atomic():
+                job = SyncJob.objects.create(
+                    kind=kind, options=options or {}, requested_by=requested_by, **fields)
+            return job, True
+        except IntegrityError:
+            job = SyncJob.objects.filter(
+                kind=kind, status__in=SyncJob.ACTIVE_STATUSES
+            ).first()
+            # The active job may have finished in between; try again
+            if job is not None:
+                return job, False
+
+
+def fail_stale_jobs():
+    """
+    Fail running jobs whose worker stopped sending heartbeats, and queued
+    jobs no worker claimed in time, so they stop holding their kind's slot
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(minutes=settings.PCO_SYNC_JOB_STALE_MINUTES)
+    stale = SyncJob.objects.filter(
+        status=SyncJob.STATUS_RUNNING, heartbeat_at__lt=cutoff
+    ).update(
+        status=SyncJob.STATUS_FAILED,
+        error='Worker stopped responding',
+        finished_at=now,
+    )
+    return stale + SyncJob.objects.filter(
+        status=SyncJob.STATUS_QUEUED, created_at__lt=cutoff
+    ).update(
+        status=SyncJob.STATUS_FAILED,
+        error='No sync worker picked up the job',
+        finished_at=now,
+    )
+
+
+def claim_next_job():
+    """Atomically take the oldest queued job, or return None"""
+    with transaction.atomic():
+        job = SyncJob.objects.select_for_update(skip_locked=True).filter(
+            status=SyncJob.STATUS_QUEUED
+        ).order_by('created_at').first()
+        if job is None:
+            return None
+
+        now = timezone.now()
+        job.status = SyncJob.STATUS_RUNNING
+        job.started_at = now
+        job.heartbeat_at = now
+        job.save(update_fields=['status', 'started_at', 'heartbeat_at'])
+        return job
+
+
+def _job_failed(result):
+    # Per-person errors carry an id; anything else aborted the run
+    return any('id' not in error for error in result.get('errors', []))
+
+
+def run_job(job):
+    """Execute a claimed job, recording progress and the final result on it"""
+    logger.info(f"Running {job}")
+
+    def progress(phase, results):
+        SyncJob.objects.filter(pk=job.pk).update(
+            phase=phase,
+            pages_done=results.get('pages', 0),
+            counts={
+                key: results[key]
+                for key in ('synced', 'updated', 'unchanged', 'archived')
+                if key in results
+            },
+            heartbeat_at=timezone.now(),
+        )
+
+    try:
+        pco_service = PCOService()
+        if job.kind == SyncJob.KIND_TEAMS:
+            progress('teams', {})
+            result = pco_service.sync_teams()
+        else:
+            since = job.options.get('since')
+            result = pco_service.sync_volunteers(
+                full=job.options.get('full'),
+                since=parse_since(since) if since else None,
+                resume=job.options.get('resume', False),
+                progress=progress,
+                addresses=job.options.get('addresses'),
+            )
+    except Exception as e:
+        logger.error(f"{job} crashed: {e}", exc_info=True)
+        result = None
+        job.status = SyncJob.STATUS_FAILED
+        job.error = str(e)
+    else:
+        job.status = SyncJob.STATUS_FAILED if _job_failed(result) else SyncJob.STATUS_SUCCEEDED
+        if job.status == SyncJob.STATUS_FAILED:
+            job.error = '; '.join(
+                error.get('message') or error.get('error', '')
+                for error in result['errors'] if 'id' not in error)
+
+    job.refresh_from_db(fields=['phase', 'pages_done', 'counts'])
+    job.phase = 'done'
+    job.result = result
+    if result is not None:
+        job.pages_done = result.get('pages', job.pages_done)
+    job.finished_at = timezone.now()
+    job.save()
+    # Syncs also write teams and memberships, which no model signal covers
+    stats_changed()
+
+    logger.info(f"Finished {job}")
+    return job
+
+
+def run_job_in_background(job):
+    """
+    Run a claimed job on a thread of this process, for deployments without
+    a run_sync_worker process (PCO_SYNC_WORKER=False)
+    """
+    def target():
+        try:
+            run_job(job)
+        finally:
+            # The thread opened its own database connection
+            connection.close()
+
+    thread = threading.Thread(target=target, name=f'sync-job-{job.pk}', daemon=True)
+    thread.start()
+    return thread
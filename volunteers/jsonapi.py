@@ -0,0 +1,66 @@
+class JSONAPIDocument:
+    """
+    Decoded JSON:API response document.
+
+    Builds a (type, id) index over the included resources once, so
+    relationships resolve with dict lookups instead of scanning the
+    included array for every record.
+    """
+
+    def __init__(self, payload):
+        self.payload = payload or {}
+
+        data = self.payload.get('data')
+        if data is None:
+            self.data = []
+        elif isinstance(data, list):
+            self.data = data
+        else:
+            self.data = [data]
+
+        self.links = self.payload.get('links') or {}
+        self.meta = self.payload.get('meta') or {}
+        # Response sizes, filled in by PCOClient.get_document
+        self.wire_bytes = 0
+        self.body_bytes = 0
+        self._index = {
+            (item['type'], item['id']): item
+            for item in self.payload.get('included') or []
+        }
+
+    @property
+    def next_url(self):
+        return self.links.get('next')
+
+    def get(self, resource_type, resource_id):
+        """Look up an included resource by type and id"""
+        return self._index.get((resource_type, resource_id))
+
+    def linkage(self, resource, name):
+        """Resource identifiers ({type, id}) of a to-one or to-many relationship"""
+        linkage = ((resource.get('relationships') or {}).get(name) or {}).get('data')
+        if not linkage:
+            return []
+        if isinstance(linkage, dict):
+            return [linkage]
+        return linkage
+
+    def related(self, resource, name):
+        """All included resources referenced by a to-one or to-many relationship"""
+        resources = []
+        for identifier in self.linkage(resource, name):
+            item = self._index.get((identifier['type'], identifier['id']))
+            if item is not None:
+                resources.append(item)
+        return resources
+
+    def related_one(self, resource, name):
+        """
+        Pick a single related resource, preferring the one PCO flags as
+        primary and falling back to the first in relationship order
+        """
+        resources = self.related(resource, name)
+        for item in resources:
+            if (item.get('attributes') or {}).get('primary'):
+                return item
+        return resources[0] if resources else None
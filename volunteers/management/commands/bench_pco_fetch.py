@@ -0,0 +1,48 @@
+# volunteers/management/commands/bench_pco_fetch.py
+import time
+from django.core.management.base import BaseCommand
+from volunteers.pco_client import PCOClient
+from volunteers.pco_simulator import FakePCOServer
+
+
+class Command(BaseCommand):
+    help = 'Benchmark PCO page fetching at different concurrency levels against a local fake PCO server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--people', type=int, default=3000,
+                            help='Number of synthetic people to serve')
+        parser.add_argument('--latency', type=float, default=0.1,
+                            help='Artificial per-request latency in seconds')
+        parser.add_argument('--concurrency', default='1,4,8',
+                            help='Comma-separated concurrency levels to compare')
+
+    def handle(self, *args, **options):
+        levels = [int(level) for level in options['concurrency'].split(',')]
+
+        self.stdout.write(self.style.SUCCESS('\n=== PCO Fetch Benchmark ===\n'))
+        self.stdout.write(
+            f'{options["people"]} people, {options["latency"] * 1000:.0f} ms latency per request\n')
+
+        baseline = None
+        with FakePCOServer(people=options['people'], latency=options['latency']) as server:
+            for level in levels:
+                server.request_count = 0
+                server.connection_count = 0
+                client = PCOClient(auth=None, pool_size=level)
+
+                start = time.perf_counter()
+                ids = []
+                for document in client.iter_documents(
+                        f'{server.base_url}/services/v2/people?per_page=100',
+                        concurrency=level):
+                    ids.extend(int(person['id']) for person in document.data)
+                elapsed = time.perf_counter() - start
+                client.close()
+
+                in_order = ids == list(range(1, options['people'] + 1))
+                baseline = baseline or elapsed
+                self.stdout.write(
+                    f'concurrency {level:>2}: {elapsed:7.2f}s  '
+                    f'{server.request_count} requests over {server.connection_count} connections  '
+                    f'speedup {baseline / elapsed:5.1f}x  '
+                    f'{"in order" if in_order else "OUT OF ORDER"}')
@@ -0,0 +1,76 @@
+# volunteers/management/commands/bench_pco_parsing.py
+import time
+from django.core.management.base import BaseCommand
+from volunteers.jsonapi import JSONAPIDocument
+from volunteers.pco_simulator import build_people_page
+from volunteers.services import PCOService
+
+
+def _linear_extract(person, included):
+    """The previous parser: one scan of `included` per relationship"""
+    relationships = person.get('relationships', {})
+    person_data = {'pco_person_id': person['id']}
+    for name, resource_type, key in (
+        ('emails', 'Email', 'email'),
+        ('phone_numbers', 'PhoneNumber', 'phone'),
+        ('addresses', 'Address', 'address'),
+    ):
+        linkage = relationships.get(name, {}).get('data', [])
+        if linkage:
+            item_id = linkage[0]['id']
+            obj = next(
+                (item for item in included if item['type']
+                 == resource_type and item['id'] == item_id),
+                None
+            )
+            if obj:
+                person_data[key] = obj.get('attributes', {})
+    return person_data
+
+
+class Command(BaseCommand):
+    help = 'Micro-benchmark PCO page parsing (linear scans vs indexed JSON:API document)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', default='100,1000',
+            help='Comma-separated page sizes to benchmark')
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Runs per measurement (best time is reported)')
+
+    def _best(self, func, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def handle(self, *args, **options):
+        service = PCOService()
+        sizes = [int(size) for size in options['sizes'].split(',')]
+
+        self.stdout.write(self.style.SUCCESS('\n=== PCO Page Parsing Benchmark ===\n'))
+        for size in sizes:
+            page = build_people_page(0, size)
+
+            def linear():
+                included = page['included']
+                for person in page['data']:
+                    _linear_extract(person, included)
+
+            def indexed():
+                document = JSONAPIDocument(page)
+                for person in document.data:
+                    service._extract_person_data(person, document)
+
+            linear_time = self._best(linear, options['repeat'])
+            indexed_time = self._best(indexed, options['repeat'])
+            speedup = linear_time / indexed_time if indexed_time else float('inf')
+
+            self.stdout.write(f'{size} records/page:')
+            self.stdout.write(f'  linear scans:  {linear_time * 1000:9.2f} ms')
+            self.stdout.write(f'  indexed:       {indexed_time * 1000:9.2f} ms')
+            self.stdout.write(self.style.SUCCESS(f'  speedup:       {speedup:9.1f}x\n'))
@@ -0,0 +1,160 @@
+# volunteers/management/commands/bench_pco_sync.py
+import json
+import platform
+import sys
+import threading
+import time
+import django
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings
+from django.utils import timezone
+from volunteers.models import RateLimitBucket, SyncState, Volunteer
+from volunteers.pco_simulator import FakePCOServer
+from volunteers.services import PCOService
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """High-water mark of this process's resident memory, in MB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class QueryCounter:
+    """Counts queries on every connection, including ones opened by fetch threads"""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    def attach(self, sender, connection, **kwargs):
+        connection.execute_wrappers.append(self)
+
+
+class Command(BaseCommand):
+    help = ('Benchmark PCOService.sync_volunteers end to end against a local fake '
+            'PCO server, in a throwaway test database, and write the results as JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--people', default='1000,10000,50000',
+                            help='Comma-separated numbers of synthetic people to sync')
+        parser.add_argument('--latency', type=float, default=0.0,
+                            help='Artificial per-request latency in seconds')
+        parser.add_argument('--rate-limit', type=int, default=10000,
+                            help='Requests per 20s the fake server allows; 100 matches PCO')
+        parser.add_argument('--throttle-every', type=int, default=0,
+                            help='Answer every Nth request with a 429 (0 = never)')
+        parser.add_argument('--retry-after', type=float, default=1,
+                            help='Retry-After seconds sent with injected 429s')
+        parser.add_argument('--concurrency', type=int, default=None,
+                            help='Page fetch concurrency (defaults to PCO_SYNC_CONCURRENCY, '
+                                 'which is 1 on SQLite)')
+        parser.add_argument('--output', default='pco_sync_benchmark.json',
+                            help='File to write the JSON results to')
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['people'].split(','))
+
+        self.stdout.write(self.style.SUCCESS('\n=== PCO Sync Benchmark ===\n'))
+        self.stdout.write(
+            f'{options["latency"] * 1000:.0f} ms latency, '
+            f'{options["rate_limit"]} requests/20s, '
+            f'429 every {options["throttle_every"] or "-"} requests, '
+            f'{connection.vendor} database\n')
+
+        # Never touch real volunteers: run against a scratch copy of the schema
+        old_name = connection.creation.create_test_db(verbosity=0, serialize=False)
+        try:
+            runs = [self._run(size, options) for size in sizes]
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        report = {
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'latency': options['latency'],
+            'rate_limit': options['rate_limit'],
+            'throttle_every': options['throttle_every'],
+            'retry_after': options['retry_after'],
+            'runs': runs,
+        }
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'\nResults written to {options["output"]}'))
+
+    def _run(self, size, options):
+        """Sync `size` people twice: into an empty table, then again unchanged"""
+        Volunteer.objects.all().delete()
+        SyncState.objects.all().delete()
+        RateLimitBucket.objects.all().delete()
+
+        run = {'people': size}
+        with FakePCOServer(people=size, latency=options['latency'],
+                           throttle_every=options['throttle_every'],
+                           retry_after=options['retry_after'],
+                           rate_limit=options['rate_limit']) as server, \
+                override_settings(PCO_API_BASE_URL=server.base_url):
+            for scenario in ('initial', 'resync'):
+                run[scenario] = self._measure(size, server, options)
+                self._print(size, scenario, run[scenario])
+        return run
+
+    def _measure(self, size, server, options):
+        server.request_count = 0
+        server.throttled_count = 0
+        queries = QueryCounter()
+        connection_created.connect(queries.attach)
+        try:
+            with connection.execute_wrapper(queries):
+                service = PCOService(concurrency=options['concurrency'])
+                start = time.perf_counter()
+                results = service.sync_volunteers(full=True)
+                elapsed = time.perf_counter() - start
+                service.client.close()
+        finally:
+            connection_created.disconnect(queries.attach)
+
+        return {
+            'wall_seconds': round(elapsed, 3),
+            'people_per_second': round(size / elapsed, 1) if elapsed else None,
+            'synced': results['synced'],
+            'updated': results['updated'],
+            'unchanged': results['unchanged'],
+            'errors': len(results['errors']),
+            'pages': results['pages'],
+            'http_requests': server.request_count,
+            'bytes_transferred': results['bytes'],
+            'throttled_responses': server.throttled_count,
+            'retries': results['retries'],
+            'throttled_seconds': results['throttled_seconds'],
+            'db_queries': queries.count,
+            'stage_seconds': results['stage_seconds'],
+            'concurrency': service.concurrency,
+            # Process high-water mark; sizes run smallest first so it tracks each size
+            'peak_rss_mb': peak_rss_mb(),
+        }
+
+    def _print(self, size, scenario, stats):
+        self.stdout.write(
+            f'{size:>6} people {scenario:<8} {stats["wall_seconds"]:8.2f}s  '
+            f'{stats["people_per_second"] or 0:9.0f} people/s  '
+            f'{stats["http_requests"]:>5} requests ({stats["retries"]} retries)  '
+            f'{stats["bytes_transferred"] / 1024:8.0f} KB  '
+            f'{stats["db_queries"]:>6} queries  '
+            f'peak RSS {stats["peak_rss_mb"] or 0:.0f} MB')
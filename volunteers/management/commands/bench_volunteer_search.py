@@ -0,0 +1,136 @@
+# volunteers/management/commands/bench_volunteer_search.py
+import json
+import random
+import statistics
+import time
+import django
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from volunteers.models import Volunteer, phone_digits
+from volunteers.search import search_volunteers
+
+FIRST_NAMES = [
+    'James', 'Mary', 'Robert', 'Patricia', 'John', 'Jennifer', 'Michael', 'Linda',
+    'David', 'Elizabeth', 'William', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica',
+    'Thomas', 'Sarah', 'Christopher', 'Karen', 'Daniel', 'Nancy', 'Matthew', 'Margaret',
+    'Anthony', 'Sandra', 'Jonathan', 'Ashley', 'Katherine', 'Stephanie',
+]
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis',
+    'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson',
+    'Thomas', 'Taylor', 'Moore', 'Jackson', 'Martin', 'Thompson', 'Whitaker',
+    'Richardson', 'Schneider', 'Fitzgerald', 'Gallagher', 'Kowalski', 'Nakamura',
+]
+
+
+class Command(BaseCommand):
+    help = ('Benchmark ranked volunteer search against the old icontains search over '
+            'synthetic volunteers (runs in a throwaway test database)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--volunteers', type=int, default=50000,
+                            help='Number of synthetic volunteers to search')
+        parser.add_argument('--repeat', type=int, default=20,
+                            help='Times each search is run; the median is reported')
+        parser.add_argument('--output', default='volunteer_search_benchmark.json',
+                            help='File to write the JSON results to')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('\n=== Volunteer Search Benchmark ===\n'))
+        self.stdout.write(f'{options["volunteers"]} volunteers, {connection.vendor} database\n')
+
+        old_name = connection.creation.create_test_db(verbosity=0, serialize=False)
+        try:
+            target = self._seed(options['volunteers'])
+            searches = {
+                'exact name': f'{target.first_name} {target.last_name}',
+                'last name prefix': target.last_name[:4],
+                'misspelled name': f'{target.first_name} {self._misspell(target.last_name)}',
+                'email fragment': target.email.split('@')[0],
+                'formatted phone': target.phone,
+                'bare phone digits': phone_digits(target.phone),
+            }
+            results = [self._measure(name, term, target, options['repeat'])
+                       for name, term in searches.items()]
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        report = {
+            'created_at': timezone.now().isoformat(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'volunteers': options['volunteers'],
+            'repeat': options['repeat'],
+            'searches': results,
+        }
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'\nResults written to {options["output"]}'))
+
+    def _seed(self, count):
+        rng = random.Random(42)
+        volunteers = []
+        for i in range(count):
+            first = rng.choice(FIRST_NAMES)
+            last = rng.choice(LAST_NAMES)
+            phone = f'({rng.randint(200, 999)}) {rng.randint(200, 999)}-{i % 10000:04d}'
+            volunteers.append(Volunteer(
+                first_name=first, last_name=last,
+                email=f'{first.lower()}.{last.lower()}{i}@example.org',
+                phone=phone, phone_digits=phone_digits(phone)))
+        Volunteer.objects.bulk_create(volunteers, batch_size=2000)
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE volunteers')
+        return Volunteer.objects.order_by('?').first()
+
+    def _misspell(self, name):
+        """Swap two inner letters, the commonest typo"""
+        if len(name) < 4:
+            return name
+        middle = len(name) // 2
+        return name[:middle - 1] + name[middle] + name[middle - 1] + name[middle + 1:]
+
+    def _legacy(self, term):
+        """What DRF's SearchFilter did before: every word ILIKE'd against four columns"""
+        queryset = Volunteer.objects.all()
+        for word in term.split():
+            queryset = queryset.filter(
+                Q(first_name__icontains=word) | Q(last_name__icontains=word) |
+                Q(email__icontains=word) | Q(phone__icontains=word))
+        return queryset.order_by('last_name', 'first_name')
+
+    def _ranked(self, term):
+        return search_volunteers(Volunteer.objects.all(), term).order_by(
+            '-search_rank', 'last_name', 'first_name')
+
+    def _time(self, build, term, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            ids = list(build(term).values_list('id', flat=True)[:25])
+            timings.append(time.perf_counter() - start)
+        total = build(term).count()
+        return ids, total, round(statistics.median(timings) * 1000, 2)
+
+    def _measure(self, name, term, target, repeat):
+        result = {'search': name, 'term': term}
+        for backend, build in (('legacy', self._legacy), ('ranked', self._ranked)):
+            ids, total, ms = self._time(build, term, repeat)
+            result[backend] = {
+                'median_ms': ms,
+                'matches': total,
+                'target_found': target.id in ids,
+                'target_position': ids.index(target.id) + 1 if target.id in ids else None,
+            }
+
+        legacy, ranked = result['legacy'], result['ranked']
+        self.stdout.write(
+            f'{name:<18} {term!r:<28} '
+            f'legacy {legacy["median_ms"]:7.2f} ms {legacy["matches"]:>6} matches '
+            f'target {legacy["target_position"] or "-":>3}   '
+            f'ranked {ranked["median_ms"]:7.2f} ms {ranked["matches"]:>6} matches '
+            f'target {ranked["target_position"] or "-":>3}')
+        return result
@@ -0,0 +1,45 @@
+# volunteers/management/commands/process_pco_webhooks.py
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from volunteers.services import PCOService
+from volunteers.webhooks import process_webhook_events
+
+
+class Command(BaseCommand):
+    help = 'Apply queued PCO webhook events (POST /api/pco/webhooks/) to volunteers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--poll', type=float, default=5,
+            help='Seconds to wait between checks when the inbox is empty')
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Drain the inbox once and exit instead of polling forever')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('Webhook processor started'))
+        pco_service = PCOService()
+
+        try:
+            while True:
+                close_old_connections()
+                results = process_webhook_events(service=pco_service)
+
+                if results['events'] or results['errors']:
+                    style = self.style.ERROR if results['errors'] else self.style.SUCCESS
+                    self.stdout.write(style(
+                        f"{results['events']} event(s) -> {results['people']} people: "
+                        f"{results['created']} created, {results['updated']} updated, "
+                        f"{results['unchanged']} unchanged, {results['archived']} archived, "
+                        f"{results['teams_updated']} team list(s) updated, "
+                        f"{len(results['errors'])} error(s)"))
+
+                if options['once'] and not results['events']:
+                    break
+                if not results['events']:
+                    time.sleep(options['poll'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS('Webhook processor stopped'))
@@ -0,0 +1,80 @@
+# volunteers/management/commands/run_pco_scheduler.py
+import random
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from core.db import advisory_lock
+from volunteers.jobs import enqueue_sync, fail_stale_jobs, run_job
+from volunteers.models import SyncJob
+
+# Longest we stretch the interval while PCO is throttling us
+MAX_BACKOFF_MULTIPLIER = 8
+
+
+class Command(BaseCommand):
+    help = 'Run incremental PCO syncs on a schedule when AUTO_SYNC_PCO is enabled'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Run a single scheduled sync and exit (for cron)')
+
+    def handle(self, *args, **options):
+        if not settings.AUTO_SYNC_PCO:
+            self.stdout.write(self.style.WARNING(
+                'AUTO_SYNC_PCO is disabled; not scheduling PCO syncs'))
+            return
+
+        interval = settings.PCO_AUTO_SYNC_INTERVAL_MINUTES * 60
+        jitter = settings.PCO_AUTO_SYNC_JITTER_SECONDS
+        backoff = 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'PCO scheduler started (every {settings.PCO_AUTO_SYNC_INTERVAL_MINUTES} min '
+            f'± {jitter}s)'))
+
+        try:
+            if not options['once']:
+                # Spread replicas that start together across the jitter window
+                time.sleep(random.uniform(0, jitter))
+
+            while True:
+                throttled = self._tick()
+                if options['once']:
+                    break
+
+                if throttled:
+                    backoff = min(backoff * 2, MAX_BACKOFF_MULTIPLIER)
+                    self.stdout.write(self.style.WARNING(
+                        f'PCO is throttling; next sync in {backoff}x the usual interval'))
+                else:
+                    backoff = 1
+                time.sleep(max(interval * backoff + random.uniform(-jitter, jitter), 0))
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS('PCO scheduler stopped'))
+
+    def _tick(self):
+        """Run one scheduled sync. Returns True if PCO throttled it."""
+        close_old_connections()
+
+        with advisory_lock('pco_auto_sync') as acquired:
+            if not acquired:
+                self.stdout.write('Another replica holds the scheduler lock; skipping')
+                return False
+
+            fail_stale_jobs()
+            job, created = enqueue_sync(kind=SyncJob.KIND_PEOPLE, start=True)
+            if not created:
+                self.stdout.write(f'{job} is still in progress; skipping')
+                return False
+
+            job = run_job(job)
+
+        style = self.style.SUCCESS if job.status == job.STATUS_SUCCEEDED else self.style.ERROR
+        self.stdout.write(style(f'{job}'))
+
+        result = job.result or {}
+        return bool(result.get('retries') or result.get('throttled_seconds'))
@@ -0,0 +1,43 @@
+# volunteers/management/commands/run_sync_worker.py
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from volunteers.jobs import claim_next_job, fail_stale_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = 'Run queued PCO sync jobs (POST /api/volunteers/sync/) in the background'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--poll', type=float, default=5,
+            help='Seconds to wait between checks when the queue is empty')
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Run every queued job and exit instead of polling forever')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('Sync worker started'))
+
+        try:
+            while True:
+                close_old_connections()
+                stale = fail_stale_jobs()
+                if stale:
+                    self.stdout.write(self.style.WARNING(f'Marked {stale} stale job(s) as failed'))
+
+                job = claim_next_job()
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll'])
+                    continue
+
+                self.stdout.write(f'Running {job}...')
+                job = run_job(job)
+                style = self.style.SUCCESS if job.status == job.STATUS_SUCCEEDED else self.style.ERROR
+                self.stdout.write(style(f'{job}'))
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS('Sync worker stopped'))
@@ -1,27 +1,108 @@
 # volunteers/management/commands/sync_pco.py
-from django.core.management.base import BaseCommand
-from volunteers.services import PCOService
+from django.core.management.base import BaseCommand, CommandError
+from volunteers.services import PCOService, parse_since
+
 
 class Command(BaseCommand):
     help = 'Sync volunteers from Planning Center Online'
-    
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Run a full reconciliation sweep instead of an incremental sync')
+        parser.add_argument(
+            '--since',
+            help='Only sync people changed since this ISO date/datetime')
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Continue an interrupted sync from its last committed page')
+        parser.add_argument(
+            '--skip-addresses', action='store_true',
+            help='Leave addresses out of the sync (overrides PCO_SYNC_ADDRESSES)')
+        parser.add_argument(
+            '--teams', action='store_true',
+            help='Refresh every volunteer\'s teams from the PCO team roster')
+
     def handle(self, *args, **options):
+        if options['full'] and options['since']:
+            raise CommandError('--full and --since cannot be used together')
+        if options['resume'] and (options['full'] or options['since']):
+            raise CommandError('--resume cannot be combined with --full or --since')
+
+        since = None
+        if options['since']:
+            try:
+                since = parse_since(options['since'])
+            except ValueError as e:
+                raise CommandError(str(e))
+
+        if options['teams']:
+            if (options['full'] or options['since'] or options['resume']
+                    or options['skip_addresses']):
+                raise CommandError('--teams runs on its own')
+            return self._sync_teams()
+
         self.stdout.write(self.style.SUCCESS('Starting PCO sync...'))
-        
+
         try:
             pco_service = PCOService()
-            result = pco_service.sync_volunteers()
-            
+            result = pco_service.sync_volunteers(
+                full=options['full'], since=since,
+                resume=options['resume'], progress=self._progress,
+                addresses=False if options['skip_addresses'] else None)
+
             self.stdout.write(self.style.SUCCESS(f'\n✅ Sync completed!'))
+            mode = result['mode']
+            if result['since']:
+                mode += f' since {result["since"]}'
+            if result['resumed']:
+                mode += ' (resumed)'
+            if not result['addresses']:
+                mode += ', without addresses'
+            self.stdout.write(self.style.SUCCESS(f'  Mode: {mode}'))
             self.stdout.write(self.style.SUCCESS(f'  New volunteers: {result["synced"]}'))
             self.stdout.write(self.style.SUCCESS(f'  Updated volunteers: {result["updated"]}'))
-            
+            self.stdout.write(self.style.SUCCESS(f'  Unchanged volunteers: {result["unchanged"]}'))
+            self.stdout.write(self.style.SUCCESS(f'  Pages: {result["pages"]}'))
+            stages = ', '.join(
+                f'{stage} {seconds}s' for stage, seconds in result['stage_seconds'].items())
+            self.stdout.write(self.style.SUCCESS(f'  Time by stage: {stages}'))
+            self.stdout.write(self.style.SUCCESS(
+                f'  PCO requests: {result["requests"]} ({result["retries"]} retries, '
+                f'{result["throttled_seconds"]}s throttled, '
+                f'{result["bytes"] / 1024:.0f} KB transferred)'))
+
             if result['errors']:
                 self.stdout.write(self.style.WARNING(f'  Errors: {len(result["errors"])}'))
                 for error in result['errors'][:5]:  # Show first 5 errors
                     self.stdout.write(self.style.WARNING(f'    - {error}'))
-            
+
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'❌ Sync failed: {e}'))
 
+    def _progress(self, stage, result):
+        """Print a line per committed page"""
+        if stage == 'upsert':
+            self.stdout.write(
+                f'  Page {result["pages"]}: {result["synced"]} new, '
+                f'{result["updated"]} updated, {result["unchanged"]} unchanged')
+
+    def _sync_teams(self):
+        self.stdout.write(self.style.SUCCESS('Starting PCO team roster sync...'))
 
+        try:
+            result = PCOService().sync_teams()
+
+            if result['errors']:
+                self.stdout.write(self.style.ERROR(f'❌ Team sync failed: {result["errors"][0]}'))
+                return
+
+            self.stdout.write(self.style.SUCCESS(f'\n✅ Team sync completed!'))
+            self.stdout.write(self.style.SUCCESS(f'  Teams: {result["teams"]}'))
+            self.stdout.write(self.style.SUCCESS(f'  Memberships: {result["memberships"]}'))
+            self.stdout.write(self.style.SUCCESS(f'  Updated volunteers: {result["updated"]}'))
+            self.stdout.write(self.style.SUCCESS(f'  Unchanged volunteers: {result["unchanged"]}'))
+            self.stdout.write(self.style.SUCCESS(f'  PCO requests: {result["requests"]}'))
+
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'❌ Team sync failed: {e}'))
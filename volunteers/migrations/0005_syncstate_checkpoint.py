@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0004_syncstate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syncstate',
+            name='checkpoint',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
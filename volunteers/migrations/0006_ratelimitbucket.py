@@ -0,0 +1,29 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:06
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0005_syncstate_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RateLimitBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('capacity', models.FloatField(default=100)),
+                ('period', models.FloatField(default=20)),
+                ('tokens', models.FloatField(default=100)),
+                ('refilled_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('blocked_until', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'rate_limit_buckets',
+            },
+        ),
+    ]
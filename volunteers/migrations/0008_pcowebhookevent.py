@@ -0,0 +1,29 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0007_syncjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PCOWebhookEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.CharField(max_length=100, unique=True)),
+                ('name', models.CharField(max_length=100)),
+                ('person_id', models.CharField(blank=True, db_index=True, max_length=100)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+            ],
+            options={
+                'db_table': 'pco_webhook_events',
+                'ordering': ['received_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:20
+
+from django.db import migrations
+
+
+def populate_team_memberships(apps, schema_editor):
+    """
+    Build teams and memberships from the JSON team names, then rewrite the
+    JSON lists from the memberships so both agree. Names have no PCO id
+    yet; the next roster sync replaces these teams with PCO ones.
+    """
+    Volunteer = apps.get_model('volunteers', 'Volunteer')
+    Team = apps.get_model('volunteers', 'Team')
+    TeamMembership = apps.get_model('volunteers', 'TeamMembership')
+
+    team_ids = {}
+    memberships = []
+    changed = []
+    volunteers = Volunteer.objects.exclude(teams=[]).only('id', 'teams')
+    for volunteer in volunteers.iterator(chunk_size=2000):
+        names = sorted({name for name in volunteer.teams or [] if isinstance(name, str) and name})
+        for name in names:
+            if name not in team_ids:
+                team_ids[name] = Team.objects.create(name=name).id
+            memberships.append(TeamMembership(volunteer_id=volunteer.id, team_id=team_ids[name]))
+        if names != volunteer.teams:
+            volunteer.teams = names
+            changed.append(volunteer)
+
+    TeamMembership.objects.bulk_create(memberships, batch_size=1000)
+    Volunteer.objects.bulk_update(changed, ['teams'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0009_team_teammembership'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_team_memberships, migrations.RunPython.noop),
+    ]
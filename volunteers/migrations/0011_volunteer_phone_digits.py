@@ -0,0 +1,31 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:26
+
+import re
+from django.db import migrations, models
+
+
+def populate_phone_digits(apps, schema_editor):
+    Volunteer = apps.get_model('volunteers', 'Volunteer')
+
+    changed = []
+    volunteers = Volunteer.objects.exclude(phone__isnull=True).exclude(phone='').only('id', 'phone')
+    for volunteer in volunteers.iterator(chunk_size=2000):
+        volunteer.phone_digits = re.sub(r'\D', '', volunteer.phone)
+        changed.append(volunteer)
+    Volunteer.objects.bulk_update(changed, ['phone_digits'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0010_populate_team_memberships'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='volunteer',
+            name='phone_digits',
+            field=models.CharField(blank=True, default='', editable=False, max_length=50),
+        ),
+        migrations.RunPython(populate_phone_digits, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:30
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# Trigram GIN indexes for volunteers/search.py: the word similarity
+# operator on names and email and LIKE '%digits%' on phone digits.
+# Postgres only; other databases fall back to plain substring search.
+TRIGRAM_INDEXES = {
+    'volunteers_first_name_trgm': 'first_name',
+    'volunteers_last_name_trgm': 'last_name',
+    'volunteers_email_trgm': 'email',
+    'volunteers_phone_digits_trgm': 'phone_digits',
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, column in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON volunteers '
+            f'USING gin ({column} gin_trgm_ops)')
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0011_volunteer_phone_digits'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0012_volunteer_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='volunteer',
+            index=models.Index(fields=['last_name', 'first_name', 'id'], name='volunteers_name_id_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='volunteer',
+            name='volunteers_last_na_450dc0_idx',
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:56
+
+from django.db import migrations, models
+from core.db import AddIndexConcurrently, RemoveIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # Built concurrently on Postgres so the volunteers table stays
+    # writable (PCO syncs run against it) while the index is created
+    atomic = False
+
+    dependencies = [
+        ('volunteers', '0013_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='volunteer',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['last_name', 'first_name', 'id'], name='volunteers_active_name_idx'),
+        ),
+        # Duplicated the is_archived column's own db_index
+        RemoveIndexConcurrently(
+            model_name='volunteer',
+            name='volunteers_is_arch_5d17c6_idx',
+        ),
+    ]
@@ -1,5 +1,43 @@
+import re
+from django.conf import settings
 from django.db import models
+from django.db.models import F, Q
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from core.cache import stats_changed
+from core.models import DataVersion
+
+# DataVersion counter for the volunteer roster (names, contact details,
+# teams, archived state); see volunteers/autocomplete.py
+VOLUNTEERS_VERSION = 'volunteers'
+
+
+def volunteers_changed():
+    """
+    Bump the roster version once the write commits. Model signals do this
+    for save()/delete(); call it after bulk writes.
+    """
+    DataVersion.bump_on_commit(VOLUNTEERS_VERSION)
+    stats_changed()
+
+
+def phone_digits(phone):
+    """Digits of a phone number, so searches match any formatting"""
+    return re.sub(r'\D', '', phone or '')
+
+
+class VolunteerQuerySet(models.QuerySet):
+
+    def with_interaction_stats(self):
+        """
+        Annotate interaction count and last interaction date so the
+        interaction properties below don't query once per volunteer. Both
+        come from the VolunteerEngagement rollup, a single-row join.
+        """
+        return self.annotate(
+            annotated_interaction_count=Coalesce('engagement__interaction_count', 0),
+            annotated_last_interaction_date=F('engagement__last_interaction_date'),
+        )
 
 
 class Volunteer(models.Model):
@@ -12,6 +50,8 @@ class Volunteer(models.Model):
     last_name = models.CharField(max_length=100)
     email = models.EmailField(blank=True, null=True)
     phone = models.CharField(max_length=50, blank=True, null=True)
+    # Derived from phone on save (and by the sync upserter) for search
+    phone_digits = models.CharField(max_length=50, blank=True, default='', editable=False)
     address = models.TextField(blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
 
@@ -29,21 +69,34 @@ class Volunteer(models.Model):
     last_synced_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    # Store array of team names
+    # Sorted team names, kept in step with team_memberships for API
+    # compatibility; query TeamMembership instead of filtering on this
     teams = models.JSONField(default=list, blank=True)
 
+    objects = VolunteerQuerySet.as_manager()
+
     class Meta:
         db_table = 'volunteers'
         ordering = ['last_name', 'first_name']
         indexes = [
             models.Index(fields=['pco_person_id']),
-            models.Index(fields=['last_name', 'first_name']),
-            models.Index(fields=['is_archived']),  # NEW: Index for filtering
+            # Name ordering and ?cursor= pagination
+            models.Index(fields=['last_name', 'first_name', 'id'], name='volunteers_name_id_idx'),
+            # The same for the default list, which hides archived volunteers
+            models.Index(fields=['last_name', 'first_name', 'id'], name='volunteers_active_name_idx',
+                         condition=Q(is_archived=False)),
         ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
+    def save(self, *args, **kwargs):
+        self.phone_digits = phone_digits(self.phone)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'phone' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'phone_digits'}
+        super().save(*args, **kwargs)
+
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
@@ -51,21 +104,223 @@ class Volunteer(models.Model):
     @property
     def days_since_last_interaction(self):
         """Calculate days since last interaction"""
-        from interactions.models import Interaction
-        last_interaction = self.interactions.order_by(
-            '-interaction_date').first()
-        if last_interaction:
-            return (timezone.now().date() - last_interaction.interaction_date).days
+        last_interaction_date = self.last_interaction_date
+        if last_interaction_date:
+            return (timezone.now().date() - last_interaction_date).days
         return None
 
     @property
     def interaction_count(self):
         """Total number of interactions"""
+        # Annotations from with_interaction_stats() win over a query
+        if 'annotated_interaction_count' in self.__dict__:
+            return self.annotated_interaction_count
         return self.interactions.count()
 
     @property
     def last_interaction_date(self):
         """Date of most recent interaction"""
+        if 'annotated_last_interaction_date' in self.__dict__:
+            return self.annotated_last_interaction_date
         last_interaction = self.interactions.order_by(
             '-interaction_date').first()
         return last_interaction.interaction_date if last_interaction else None
+
+
+class Team(models.Model):
+    """
+    A PCO Services team. Teams created from pre-normalization team names
+    have no pco_team_id until the next roster sync replaces them.
+    """
+    pco_team_id = models.CharField(
+        max_length=100, unique=True, null=True, blank=True)
+    name = models.CharField(max_length=200, db_index=True)
+    service_type_name = models.CharField(max_length=200, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'teams'
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class TeamMembership(models.Model):
+    """
+    A volunteer's place on a team
+    """
+    ROLE_MEMBER = 'member'
+    ROLE_LEADER = 'leader'
+    ROLE_CHOICES = [
+        (ROLE_MEMBER, 'Member'),
+        (ROLE_LEADER, 'Leader'),
+    ]
+
+    volunteer = models.ForeignKey(
+        Volunteer,
+        on_delete=models.CASCADE,
+        related_name='team_memberships'
+    )
+    team = models.ForeignKey(
+        Team,
+        on_delete=models.CASCADE,
+        related_name='memberships'
+    )
+    role = models.CharField(max_length=20, choices=ROLE_CHOICES, default=ROLE_MEMBER)
+    # Team position name from PCO, e.g. "Electric Guitar"
+    position = models.CharField(max_length=200, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'team_memberships'
+        constraints = [
+            # Also serves "members of team X" lookups
+            models.UniqueConstraint(
+                fields=['team', 'volunteer'], name='team_memberships_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.volunteer} on {self.team}"
+
+
+class SyncState(models.Model):
+    """
+    Persisted cursor for incremental syncs from an external source
+    """
+    source = models.CharField(max_length=50, unique=True)
+    # High-water mark of the source's updated_at seen by the last good sync
+    watermark = models.DateTimeField(null=True, blank=True)
+    last_full_sync_at = models.DateTimeField(null=True, blank=True)
+    last_sync_at = models.DateTimeField(null=True, blank=True)
+    # Resume point of an in-progress or interrupted sync (next page link etc.)
+    checkpoint = models.JSONField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'sync_states'
+
+    def __str__(self):
+        return f"{self.source} (watermark: {self.watermark})"
+
+    @classmethod
+    def for_source(cls, source):
+        state, _ = cls.objects.get_or_create(source=source)
+        return state
+
+    def full_sync_due(self, interval):
+        """Whether a full reconciliation sweep should run instead of a delta"""
+        if self.watermark is None or self.last_full_sync_at is None:
+            return True
+        return timezone.now() - self.last_full_sync_at >= interval
+
+
+class RateLimitBucket(models.Model):
+    """
+    Token bucket for an external API, shared by every thread and process
+    that talks to it (rows are locked with SELECT ... FOR UPDATE)
+    """
+    name = models.CharField(max_length=50, unique=True)
+    capacity = models.FloatField(default=100)
+    # Seconds it takes to refill an empty bucket to capacity
+    period = models.FloatField(default=20)
+    tokens = models.FloatField(default=100)
+    refilled_at = models.DateTimeField(default=timezone.now)
+    # Set from Retry-After; nobody may call the API before this
+    blocked_until = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'rate_limit_buckets'
+
+    def __str__(self):
+        return f"{self.name} ({self.tokens:.1f}/{self.capacity:.0f} tokens)"
+
+
+class SyncJob(models.Model):
+    """
+    A PCO sync queued by the API and executed by the run_sync_worker command
+    """
+    KIND_PEOPLE = 'people'
+    KIND_TEAMS = 'teams'
+    KIND_CHOICES = [
+        (KIND_PEOPLE, 'People'),
+        (KIND_TEAMS, 'Teams'),
+    ]
+
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    ACTIVE_STATUSES = [STATUS_QUEUED, STATUS_RUNNING]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default=KIND_PEOPLE)
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED, db_index=True)
+    # Sync arguments, e.g. {"full": true} or {"since": "2025-01-01T00:00:00+00:00"}
+    options = models.JSONField(default=dict, blank=True)
+
+    # Progress, updated by the worker while the job runs
+    phase = models.CharField(max_length=20, blank=True)
+    pages_done = models.IntegerField(default=0)
+    counts = models.JSONField(default=dict, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='sync_jobs'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'sync_jobs'
+        ordering = ['-created_at']
+        constraints = [
+            # Single flight: at most one queued/running job of each kind
+            models.UniqueConstraint(
+                fields=['kind'],
+                condition=Q(status__in=['queued', 'running']),
+                name='sync_jobs_one_active_per_kind',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} sync #{self.pk} ({self.status})"
+
+    @property
+    def is_active(self):
+        return self.status in self.ACTIVE_STATUSES
+
+
+class PCOWebhookEvent(models.Model):
+    """
+    Inbox of PCO webhook deliveries, drained by process_pco_webhooks.
+    Redeliveries share the event id and are dropped on insert.
+    """
+    event_id = models.CharField(max_length=100, unique=True)
+    # e.g. "people.v2.events.person.updated"
+    name = models.CharField(max_length=100)
+    person_id = models.CharField(max_length=100, blank=True, db_index=True)
+    payload = models.JSONField(default=dict, blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        db_table = 'pco_webhook_events'
+        ordering = ['received_at']
+
+    def __str__(self):
+        return f"{self.name} for person {self.person_id or '?'}"
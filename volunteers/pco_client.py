@@ -0,0 +1,264 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from email.utils import parsedate_to_datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import requests
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+from .jsonapi import JSONAPIDocument
+from .models import RateLimitBucket
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def with_query_params(url, **params):
+    """Return url with the given query parameters set/replaced"""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query.update({key: str(value) for key, value in params.items()})
+    return urlunsplit(parts._replace(query=urlencode(query, safe=',[]')))
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - timezone.now()).total_seconds(), 0.0)
+
+
+class TokenBucket:
+    """
+    Request budget stored in a RateLimitBucket row so that every thread,
+    gunicorn worker and management command shares one PCO allowance.
+    """
+
+    # Threads of one process queue here instead of on the row lock
+    _process_lock = threading.Lock()
+
+    def __init__(self, name):
+        self.name = name
+
+    def _locked(self):
+        bucket, _ = RateLimitBucket.objects.get_or_create(name=self.name)
+        return RateLimitBucket.objects.select_for_update().get(pk=bucket.pk)
+
+    def acquire(self):
+        """Take one token, sleeping until one is available. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._process_lock, transaction.atomic():
+                bucket = self._locked()
+                now = timezone.now()
+
+                if bucket.blocked_until and bucket.blocked_until > now:
+                    wait = (bucket.blocked_until - now).total_seconds()
+                else:
+                    elapsed = max((now - bucket.refilled_at).total_seconds(), 0.0)
+                    bucket.tokens = min(
+                        bucket.capacity,
+                        bucket.tokens + elapsed * bucket.capacity / bucket.period)
+                    bucket.refilled_at = now
+                    if bucket.tokens >= 1:
+                        bucket.tokens -= 1
+                        bucket.save(update_fields=['tokens', 'refilled_at'])
+                        return waited
+                    wait = (1 - bucket.tokens) * bucket.period / bucket.capacity
+                    bucket.save(update_fields=['tokens', 'refilled_at'])
+
+            time.sleep(wait)
+            waited += wait
+
+    def observe(self, limit, period, count):
+        """Align the bucket with PCO's X-PCO-API-Request-Rate-* headers"""
+        with self._process_lock, transaction.atomic():
+            bucket = self._locked()
+            bucket.capacity = limit
+            bucket.period = period
+            bucket.tokens = min(bucket.tokens, max(limit - count, 0))
+            bucket.save(update_fields=['capacity', 'period', 'tokens'])
+
+    def block(self, seconds):
+        """Stop everyone from calling the API for the next `seconds`"""
+        with self._process_lock, transaction.atomic():
+            bucket = self._locked()
+            until = timezone.now() + timedelta(seconds=seconds)
+            if bucket.blocked_until is None or bucket.blocked_until < until:
+                bucket.blocked_until = until
+            bucket.tokens = 0
+            bucket.save(update_fields=['blocked_until', 'tokens'])
+
+
+class PCOClient:
+    """
+    HTTP client for the Planning Center API.
+
+    All requests go through one requests.Session so connections (and their
+    TLS handshakes) are reused across pages and worker threads. Every call
+    has connect/read timeouts, takes a token from the shared rate-limit
+    bucket, and is retried with exponential backoff and jitter on
+    429/5xx responses and connection errors, honoring Retry-After.
+    """
+
+    def __init__(self, auth, pool_size=10, bucket=None):
+        self.session = requests.Session()
+        self.session.auth = auth
+        # requests decompresses transparently; ask for it explicitly
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate'
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.bucket = bucket
+        self.timeout = (settings.PCO_CONNECT_TIMEOUT, settings.PCO_READ_TIMEOUT)
+        self.max_retries = settings.PCO_MAX_RETRIES
+        self.backoff = settings.PCO_BACKOFF_SECONDS
+        self.backoff_max = settings.PCO_BACKOFF_MAX_SECONDS
+
+        # bytes counts what came over the wire, i.e. after compression
+        self.stats = {'requests': 0, 'retries': 0, 'throttled_seconds': 0.0, 'bytes': 0}
+        self._stats_lock = threading.Lock()
+
+    def close(self):
+        self.session.close()
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _sleep(self, seconds):
+        time.sleep(seconds)
+        self._count('throttled_seconds', seconds)
+
+    def _backoff_delay(self, attempt):
+        # "Full jitter": spread retries from many workers across the window
+        return random.uniform(0, min(self.backoff_max, self.backoff * 2 ** attempt))
+
+    def _observe_rate_headers(self, response):
+        headers = response.headers
+        try:
+            limit = int(headers['X-PCO-API-Request-Rate-Limit'])
+            period = int(headers['X-PCO-API-Request-Rate-Period'])
+            count = int(headers['X-PCO-API-Request-Rate-Count'])
+        except (KeyError, ValueError):
+            return
+        self.bucket.observe(limit, period, count)
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        attempt = 0
+        while True:
+            if self.bucket:
+                self._count('throttled_seconds', self.bucket.acquire())
+            self._count('requests')
+
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+                logger.warning(f"PCO request failed ({e}), retrying in {delay:.1f}s")
+            else:
+                if self.bucket:
+                    self._observe_rate_headers(response)
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    response.raise_for_status()
+                    return response
+
+                delay = parse_retry_after(response.headers.get('Retry-After'))
+                if delay is None:
+                    delay = self._backoff_delay(attempt)
+                elif response.status_code == 429 and self.bucket:
+                    # Hold back every other worker too, not just this one
+                    self.bucket.block(delay)
+                logger.warning(
+                    f"PCO returned {response.status_code}, retrying in {delay:.1f}s")
+
+            attempt += 1
+            self._count('retries')
+            self._sleep(delay)
+
+    def get_document(self, url):
+        response = self.get(url)
+        document = JSONAPIDocument(response.json())
+        document.body_bytes = len(response.content)
+        # Compressed size; falls back to the body size if urllib3 can't tell
+        document.wire_bytes = response.raw.tell() or document.body_bytes
+        self._count('bytes', document.wire_bytes)
+        return document
+
+    def _get_document_in_worker(self, url):
+        try:
+            return self.get_document(url)
+        finally:
+            # The rate-limit bucket opens a DB connection per thread
+            connections.close_all()
+
+    def iter_documents(self, url, concurrency=1):
+        """
+        Yield every page of a listing in order.
+
+        With concurrency > 1 the first page's meta.total_count is used to
+        fetch the remaining offset pages with a bounded worker pool. Pages
+        are still yielded strictly in offset order and at most
+        2 * concurrency pages are held in memory at once.
+        """
+        first = self.get_document(url)
+        yield first
+
+        total = first.meta.get('total_count')
+        per_page = len(first.data)
+        if concurrency <= 1 or not first.next_url or not total or not per_page:
+            yield from self._follow_links(first.next_url)
+            return
+
+        offset = int(dict(parse_qsl(urlsplit(url).query)).get('offset', 0))
+        page_urls = iter([
+            with_query_params(url, offset=page_offset, per_page=per_page)
+            for page_offset in range(offset + per_page, total, per_page)
+        ])
+
+        with ThreadPoolExecutor(max_workers=concurrency,
+                                thread_name_prefix='pco-fetch') as executor:
+            window = deque()
+
+            def fill():
+                while len(window) < concurrency * 2:
+                    page_url = next(page_urls, None)
+                    if page_url is None:
+                        return
+                    window.append(executor.submit(
+                        self._get_document_in_worker, page_url))
+
+            fill()
+            try:
+                while window:
+                    document = window.popleft().result()
+                    fill()
+                    yield document
+            finally:
+                for future in window:
+                    future.cancel()
+
+    def _follow_links(self, url):
+        while url:
+            document = self.get_document(url)
+            yield document
+            url = document.next_url
@@ -0,0 +1,424 @@
+"""
+Synthetic Planning Center data for benchmarks and offline testing
+"""
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+
+def build_people_page(offset, count, total=None, base_url=''):
+    """
+    Build a JSON:API page of synthetic PCO people shaped like
+    /services/v2/people?include=emails,phone_numbers,addresses
+    """
+    total = offset + count if total is None else total
+    end = min(offset + count, total)
+
+    people = []
+    included = []
+    for n in range(offset, end):
+        person_id = str(n + 1)
+        email_ids = [f'{person_id}1', f'{person_id}2']
+        phone_id = f'{person_id}3'
+        address_id = f'{person_id}4'
+
+        people.append({
+            'type': 'Person',
+            'id': person_id,
+            'attributes': {
+                'first_name': f'First{n}',
+                'last_name': f'Last{n}',
+                'status': 'inactive' if n % 20 == 0 else 'active',
+                'archived': n % 20 == 0,
+                'updated_at': '2025-01-01T00:00:00Z',
+                # Attributes we never store, so sparse fieldsets have
+                # something realistic to trim
+                'full_name': f'First{n} Last{n}',
+                'given_name': None,
+                'middle_name': None,
+                'nickname': None,
+                'birthdate': '1990-01-01',
+                'anniversary': None,
+                'created_at': '2020-01-01T00:00:00Z',
+                'archived_at': '2024-06-01T00:00:00Z' if n % 20 == 0 else None,
+                'photo_url': f'https://avatars.example.com/people/{person_id}/photo.png',
+                'photo_thumbnail_url': f'https://avatars.example.com/people/{person_id}/thumb.png',
+                'passed_background_check': n % 3 == 0,
+                'permissions': 'Scheduled Viewer',
+                'preferred_app': 'services',
+                'max_permissions': 'Scheduled Viewer',
+                'notes': None,
+                'legacy_id': None,
+                'medical_notes': None,
+                'site_administrator': False,
+                'assigned_to_rehearsal_team': False,
+                'ical_code': f'{person_id}abcdef0123456789',
+            },
+            'links': {'self': f'{base_url}/services/v2/people/{person_id}'},
+            'relationships': {
+                'emails': {'data': [
+                    {'type': 'Email', 'id': email_id} for email_id in email_ids
+                ]},
+                'phone_numbers': {'data': [{'type': 'PhoneNumber', 'id': phone_id}]},
+                'addresses': {'data': [{'type': 'Address', 'id': address_id}]},
+            },
+        })
+        # Secondary email first so primary selection actually has to look
+        included.append({
+            'type': 'Email', 'id': email_ids[0],
+            'attributes': {'address': f'person{n}@work.example.com', 'primary': False},
+        })
+        included.append({
+            'type': 'Email', 'id': email_ids[1],
+            'attributes': {'address': f'person{n}@example.com', 'primary': True},
+        })
+        included.append({
+            'type': 'PhoneNumber', 'id': phone_id,
+            'attributes': {'number': f'(555) 555-{n % 10000:04d}', 'primary': True},
+        })
+        included.append({
+            'type': 'Address', 'id': address_id,
+            'attributes': {
+                'street': f'{n} Main St', 'city': 'Springfield',
+                'state': 'IL', 'zip': '62701', 'primary': True,
+            },
+        })
+
+    links = {}
+    if end < total:
+        links['next'] = f'{base_url}/services/v2/people?per_page={count}&offset={end}'
+
+    return {
+        'data': people,
+        'included': included,
+        'links': links,
+        'meta': {'total_count': total, 'count': len(people)},
+    }
+
+
+SERVICE_TYPE_NAMES = ['Sunday Morning', 'Wednesday Night', 'Special Events']
+TEAM_NAMES = [
+    'Band', 'Vocals', 'Audio', 'Lighting', 'Video', 'Stage',
+    'Greeters', 'Ushers', 'Kids', 'Youth', 'Prayer', 'Hospitality',
+]
+
+
+def person_team_indexes(n):
+    """Indexes into TEAM_NAMES of the synthetic person with offset n"""
+    teams = {n % len(TEAM_NAMES)}
+    if n % 7 == 0:
+        teams.add((n + 1) % len(TEAM_NAMES))
+    return teams
+
+
+def build_service_types_page():
+    return {
+        'data': [
+            {'type': 'ServiceType', 'id': str(i + 1), 'attributes': {'name': name}}
+            for i, name in enumerate(SERVICE_TYPE_NAMES)
+        ],
+        'included': [],
+        'links': {},
+        'meta': {'total_count': len(SERVICE_TYPE_NAMES), 'count': len(SERVICE_TYPE_NAMES)},
+    }
+
+
+def build_teams_page(service_type_id, people):
+    """
+    Teams of a service type with their people and team leader linkage
+    (include=people,team_leaders). Each team's first member leads it.
+    """
+    service_type_index = int(service_type_id) - 1
+    team_indexes = [
+        i for i in range(len(TEAM_NAMES))
+        if i % len(SERVICE_TYPE_NAMES) == service_type_index
+    ]
+    members = {i: [] for i in team_indexes}
+    for n in range(people):
+        for i in person_team_indexes(n):
+            if i in members:
+                members[i].append(str(n + 1))
+
+    teams = []
+    included = {}
+    for i in team_indexes:
+        team_id = str(100 + i)
+        leaders = [
+            {'type': 'TeamLeader', 'id': f'{team_id}-{person_id}',
+             'relationships': {'people': {'data': {'type': 'Person', 'id': person_id}}}}
+            for person_id in members[i][:1]
+        ]
+        teams.append({
+            'type': 'Team',
+            'id': team_id,
+            'attributes': {'name': TEAM_NAMES[i]},
+            'relationships': {
+                'people': {'data': [
+                    {'type': 'Person', 'id': person_id} for person_id in members[i]
+                ]},
+                'team_leaders': {'data': [
+                    {'type': 'TeamLeader', 'id': leader['id']} for leader in leaders
+                ]},
+            },
+        })
+        for person_id in members[i]:
+            included[('Person', person_id)] = {'type': 'Person', 'id': person_id, 'attributes': {}}
+        for leader in leaders:
+            included[('TeamLeader', leader['id'])] = leader
+
+    return {
+        'data': teams,
+        'included': list(included.values()),
+        'links': {},
+        'meta': {'total_count': len(teams), 'count': len(teams)},
+    }
+
+
+def apply_query(payload, query):
+    """Trim a payload like PCO does for include= and fields[Type]= parameters"""
+    if 'include' in query:
+        wanted = {
+            name.strip() for name in query['include'][0].split(',') if name.strip()}
+        included_types = {
+            {'emails': 'Email', 'phone_numbers': 'PhoneNumber',
+             'addresses': 'Address', 'team': 'Team', 'people': 'Person',
+             'team_leaders': 'TeamLeader', 'team_position': 'TeamPosition'}.get(name, name)
+            for name in wanted
+        }
+        payload['included'] = [
+            item for item in payload.get('included', [])
+            if item['type'] in included_types
+        ]
+
+    fieldsets = {
+        key[len('fields['):-1]: set(values[0].split(','))
+        for key, values in query.items()
+        if key.startswith('fields[') and key.endswith(']')
+    }
+    if not fieldsets:
+        return payload
+
+    data = payload.get('data')
+    resources = (data if isinstance(data, list) else [data] if data else [])
+    for resource in resources + payload.get('included', []):
+        fields = fieldsets.get(resource['type'])
+        if fields is None:
+            continue
+        resource['attributes'] = {
+            name: value for name, value in (resource.get('attributes') or {}).items()
+            if name in fields
+        }
+        if 'relationships' in resource:
+            resource['relationships'] = {
+                name: value for name, value in resource['relationships'].items()
+                if name in fields
+            }
+    return payload
+
+
+def build_person_document(n):
+    """Single person (offset n) shaped like /services/v2/people/{id}?include=..."""
+    page = build_people_page(n, 1)
+    return {'data': page['data'][0], 'included': page['included'], 'links': {}, 'meta': {}}
+
+
+def build_team_memberships_page(n):
+    """
+    /services/v2/people/{id}/team_memberships?include=team,team_position
+    of person offset n
+    """
+    person_id = str(n + 1)
+    memberships = []
+    included = []
+    for i in sorted(person_team_indexes(n)):
+        team_id = str(100 + i)
+        position_id = f'{team_id}1'
+        memberships.append({
+            'type': 'PersonTeamPositionAssignment',
+            'id': f'{person_id}-{team_id}',
+            'relationships': {
+                'team': {'data': {'type': 'Team', 'id': team_id}},
+                'team_position': {'data': {'type': 'TeamPosition', 'id': position_id}},
+            },
+        })
+        included.append({'type': 'Team', 'id': team_id, 'attributes': {'name': TEAM_NAMES[i]}})
+        included.append({
+            'type': 'TeamPosition', 'id': position_id,
+            'attributes': {'name': f'{TEAM_NAMES[i]} Volunteer'},
+        })
+    return {
+        'data': memberships,
+        'included': included,
+        'links': {},
+        'meta': {'total_count': len(memberships), 'count': len(memberships)},
+    }
+
+
+def build_webhook_body(events):
+    """
+    Webhook POST body as PCO delivers it. `events` is a list of
+    (event_id, name, resource) where resource is the JSON:API resource the
+    event is about, e.g. build_person_document(n)['data'].
+    """
+    return json.dumps({'data': [
+        {
+            'id': event_id,
+            'type': 'EventDelivery',
+            'attributes': {
+                'name': name,
+                'attempt': 1,
+                'payload': json.dumps({'data': resource}),
+            },
+        }
+        for event_id, name, resource in events
+    ]}).encode('utf-8')
+
+
+class FakePCOServer:
+    """
+    Local stand-in for the PCO people/teams endpoints with artificial
+    latency. People with an id above `people` do not exist (404).
+    include= and fields[Type]= are honored and responses are gzipped for
+    clients that accept it. With throttle_every=N every Nth request is answered with a 429 and a
+    Retry-After of `retry_after` seconds. With rate_limit set, responses
+    carry PCO's X-PCO-API-Request-Rate-* headers and requests beyond
+    rate_limit per rate_period seconds get a 429 until the window resets.
+
+    Usage:
+        with FakePCOServer(people=2000, latency=0.1) as server:
+            ... point PCO_API_BASE_URL at server.base_url ...
+    """
+
+    def __init__(self, people=1000, latency=0.0, throttle_every=0, retry_after=1,
+                 rate_limit=None, rate_period=20, host='127.0.0.1', port=0):
+        self.people = people
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.rate_limit = rate_limit
+        self.rate_period = rate_period
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self.request_count = 0
+        self.throttled_count = 0
+        self.connection_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name='fake-pco', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def handle(self, path, query):
+        """Return (status, payload, headers) for a request"""
+        headers = {}
+        with self._lock:
+            self.request_count += 1
+            throttled = bool(
+                self.throttle_every and self.request_count % self.throttle_every == 0)
+            retry_after = self.retry_after
+
+            if self.rate_limit:
+                now = time.monotonic()
+                if now - self._window_start >= self.rate_period:
+                    self._window_start = now
+                    self._window_count = 0
+                self._window_count += 1
+                headers = {
+                    'X-PCO-API-Request-Rate-Limit': str(self.rate_limit),
+                    'X-PCO-API-Request-Rate-Period': str(self.rate_period),
+                    'X-PCO-API-Request-Rate-Count': str(self._window_count),
+                }
+                if self._window_count > self.rate_limit:
+                    throttled = True
+                    retry_after = max(
+                        int(self._window_start + self.rate_period - now + 0.999), 1)
+
+            if throttled:
+                self.throttled_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if throttled:
+            return 429, {'errors': [{'status': '429', 'title': 'Too Many Requests'}]}, {
+                **headers, 'Retry-After': str(retry_after)}
+
+        if path.rstrip('/') == '/services/v2/people':
+            per_page = min(int(query.get('per_page', ['25'])[0]), 100)
+            offset = int(query.get('offset', ['0'])[0])
+            page = build_people_page(offset, per_page, total=self.people, base_url=self.base_url)
+            if page['links'].get('next'):
+                # PCO carries the query (include, fields, where...) into its links
+                next_query = {**query, 'offset': [offset + per_page], 'per_page': [per_page]}
+                page['links']['next'] = (
+                    f'{self.base_url}{path}?{urlencode(next_query, doseq=True, safe=",[]")}')
+            return 200, apply_query(page, query), headers
+
+        segments = path.strip('/').split('/')
+        if len(segments) in (4, 5) and segments[:3] == ['services', 'v2', 'people']:
+            n = int(segments[3]) - 1 if segments[3].isdigit() else -1
+            if 0 <= n < self.people:
+                if len(segments) == 4:
+                    return 200, apply_query(build_person_document(n), query), headers
+                if segments[4] == 'team_memberships':
+                    return 200, apply_query(build_team_memberships_page(n), query), headers
+        if segments == ['services', 'v2', 'service_types']:
+            return 200, build_service_types_page(), headers
+        if (len(segments) == 5 and segments[:3] == ['services', 'v2', 'service_types']
+                and segments[4] == 'teams'):
+            return 200, apply_query(build_teams_page(segments[3], self.people), query), headers
+
+        return 404, {'errors': [{'status': '404', 'title': 'Not Found'}]}, headers
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive so clients can reuse pooled connections
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                with fake._lock:
+                    fake.connection_count += 1
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                status, payload, headers = fake.handle(parts.path, parse_qs(parts.query))
+                body = json.dumps(payload).encode('utf-8')
+                if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    body = gzip.compress(body, compresslevel=6)
+                    headers = {**headers, 'Content-Encoding': 'gzip'}
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/vnd.api+json')
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,122 @@
+"""
+Ranked volunteer search for the Volunteers page.
+
+On Postgres each search word is matched against trigram GIN indexes
+(migration 0012) with pg_trgm word similarity, so misspelled names still
+match, and results are ordered by how similar they are. Other databases
+(SQLite in development) fall back to substring matching ranked by
+exact > prefix > substring matches. Phone numbers are matched on their
+digits, so "(555) 123-4567", "555.123.4567" and "5551234567" are equal.
+"""
+import re
+from django.db import connections
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.functions import Greatest
+from rest_framework.filters import OrderingFilter, SearchFilter
+from .models import phone_digits
+
+NAME_FIELDS = ['first_name', 'last_name']
+# Fewer digits than this match too many phone numbers to be useful
+MIN_PHONE_DIGITS = 3
+
+
+def search_words(term):
+    """
+    Split a search into words. A search made only of phone punctuation and
+    digits is kept whole so "(555) 123-4567" is one phone number.
+    """
+    term = term.strip()
+    if re.fullmatch(r'[\d\s()+.\-]+', term) and len(phone_digits(term)) >= MIN_PHONE_DIGITS:
+        return [term]
+    return term.split()
+
+
+def _phone_q(word):
+    digits = phone_digits(word)
+    if len(digits) >= MIN_PHONE_DIGITS and not re.search(r'[^\d\s()+.\-]', word):
+        return Q(phone_digits__contains=digits)
+    return None
+
+
+def _postgres_word(word):
+    """
+    Match condition and similarity score (0-1) for one word on Postgres.
+    Only the pg_trgm `%>` operator is used for text columns: Django's
+    icontains compiles to UPPER(column) LIKE, which the column indexes
+    can't serve, and any unindexed branch turns the OR into a full scan.
+    """
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    text_fields = NAME_FIELDS + ['email']
+    match = Q()
+    for field in text_fields:
+        match |= Q(**{f'{field}__trigram_word_similar': word})
+    score = Greatest(*(TrigramWordSimilarity(word, field) for field in text_fields))
+
+    phone = _phone_q(word)
+    if phone is not None:
+        match |= phone
+        score = Greatest(score, Case(When(phone, then=Value(1.0)), default=Value(0.0)))
+    return match, score
+
+
+def _fallback_word(word):
+    """Match condition and score for one word on databases without pg_trgm"""
+    match = Q(email__icontains=word)
+    exact = Q()
+    prefix = Q()
+    for field in NAME_FIELDS:
+        match |= Q(**{f'{field}__icontains': word})
+        exact |= Q(**{f'{field}__iexact': word})
+        prefix |= Q(**{f'{field}__istartswith': word})
+
+    phone = _phone_q(word)
+    if phone is not None:
+        match |= phone
+        exact |= phone
+
+    score = Case(
+        When(exact, then=Value(1.0)),
+        When(prefix, then=Value(0.75)),
+        default=Value(0.5),
+        output_field=FloatField(),
+    )
+    return match, score
+
+
+def search_volunteers(queryset, term):
+    """
+    Filter volunteers to those matching every word of `term` and annotate
+    `search_rank` (higher is better). Returns the queryset unchanged for a
+    blank search.
+    """
+    words = search_words(term)
+    if not words:
+        return queryset
+
+    postgres = connections[queryset.db].vendor == 'postgresql'
+    build = _postgres_word if postgres else _fallback_word
+    rank = None
+    for word in words:
+        match, score = build(word)
+        queryset = queryset.filter(match)
+        rank = score if rank is None else rank + score
+    return queryset.annotate(search_rank=rank)
+
+
+class VolunteerSearchFilter(SearchFilter):
+    """
+    ?search= backend for VolunteerViewSet. Results are ordered best match
+    first unless the client asked for an explicit ?ordering=. List it after
+    OrderingFilter so the ranking isn't replaced by the default ordering.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        term = ' '.join(self.get_search_terms(request))
+        if not term:
+            return queryset
+
+        queryset = search_volunteers(queryset, term)
+        if request.query_params.get(OrderingFilter.ordering_param):
+            return queryset
+        return queryset.order_by('-search_rank', *queryset.query.order_by)
@@ -1,9 +1,10 @@
 from rest_framework import serializers
-from .models import Volunteer
+from core.sparse import SparseFieldsSerializerMixin
+from .models import Volunteer, SyncJob, Team
 
 
-class VolunteerSerializer(serializers.ModelSerializer):
-    """Serializer for volunteer list and details"""
+class VolunteerSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
+    """Serializer for volunteer list and details (supports ?fields= and ?omit=)"""
     full_name = serializers.ReadOnlyField()
     interaction_count = serializers.ReadOnlyField()
     last_interaction_date = serializers.ReadOnlyField()
@@ -21,6 +22,19 @@ class VolunteerSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at',
                             'last_synced_at', 'pco_person_id', 'status', 'is_archived']
+        # ?fields=compact: what the Volunteers page renders
+        compact_fields = [
+            'id', 'full_name', 'email', 'phone', 'teams', 'is_archived',
+            'interaction_count', 'last_interaction_date',
+            'days_since_last_interaction'
+        ]
+        # The interaction stats are annotations (see VolunteerViewSet)
+        field_sources = {
+            'full_name': ('first_name', 'last_name'),
+            'interaction_count': (),
+            'last_interaction_date': (),
+            'days_since_last_interaction': (),
+        }
 
 
 class VolunteerCreateSerializer(serializers.ModelSerializer):
@@ -46,3 +60,33 @@ class VolunteerUpdateSerializer(serializers.ModelSerializer):
 class VolunteerSummarySerializer(serializers.Serializer):
     """Serializer for volunteer interaction summary"""
     summary = serializers.CharField()
+
+
+class SyncJobSerializer(serializers.ModelSerializer):
+    """Serializer for background PCO sync job status"""
+
+    class Meta:
+        model = SyncJob
+        fields = [
+            'id', 'kind', 'status', 'options', 'phase', 'pages_done',
+            'counts', 'result', 'error', 'requested_by',
+            'created_at', 'started_at', 'heartbeat_at', 'finished_at'
+        ]
+        read_only_fields = fields
+
+
+class TeamSerializer(serializers.ModelSerializer):
+    """Serializer for teams with their size and coverage annotations"""
+    member_count = serializers.IntegerField(read_only=True)
+    active_member_count = serializers.IntegerField(read_only=True)
+    leader_count = serializers.IntegerField(read_only=True)
+    contacted_count = serializers.IntegerField(read_only=True)
+    coverage = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Team
+        fields = [
+            'id', 'pco_team_id', 'name', 'service_type_name',
+            'member_count', 'active_member_count', 'leader_count',
+            'contacted_count', 'coverage', 'updated_at'
+        ]
@@ -1,111 +1,208 @@
 import requests
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
 from django.conf import settings
 from django.utils import timezone
-from .models import Volunteer
+from django.utils.dateparse import parse_date, parse_datetime
+from .models import SyncState, TeamMembership
+from .pco_client import PCOClient, TokenBucket
+from .sync import VolunteerUpserter, apply_team_roster, sync_fields
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Sparse fieldsets: only what _extract_person_data reads. Relationship names
+# must be listed too or PCO drops the linkage to the included resources.
+PERSON_FIELDSETS = {
+    'Person': ['first_name', 'last_name', 'status', 'archived', 'updated_at',
+               'emails', 'phone_numbers', 'addresses'],
+    'Email': ['address', 'primary'],
+    'PhoneNumber': ['number', 'primary'],
+    'Address': ['street', 'city', 'state', 'zip', 'primary'],
+}
+
+
+def person_query(addresses=True):
+    """include/fields[...] query parameters for people requests"""
+    includes = ['emails', 'phone_numbers'] + (['addresses'] if addresses else [])
+    params = {'include': ','.join(includes)}
+    for resource_type, fields in PERSON_FIELDSETS.items():
+        if resource_type == 'Address' and not addresses:
+            continue
+        if resource_type == 'Person' and not addresses:
+            fields = [field for field in fields if field != 'addresses']
+        params[f'fields[{resource_type}]'] = ','.join(fields)
+    return params
+
+
+def parse_since(value):
+    """Parse an ISO date or datetime into an aware datetime for delta syncs"""
+    since = parse_datetime(value)
+    if since is None:
+        since_date = parse_date(value)
+        if since_date is None:
+            raise ValueError(f"Invalid date/datetime: {value}")
+        since = datetime.combine(since_date, datetime.min.time())
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
 
 class PCOService:
     """Service for syncing volunteers from Planning Center Online"""
 
-    def __init__(self):
-        self.base_url = 'https://api.planningcenteronline.com'
-        self.auth = (settings.PCO_APP_ID, settings.PCO_SECRET)
+    SYNC_SOURCE = 'pco_people'
+    RATE_LIMIT_BUCKET = 'pco'
 
-    def sync_volunteers(self):
-        """Sync all volunteers from PCO Services and capture their status"""
+    def __init__(self, concurrency=None):
+        self.base_url = settings.PCO_API_BASE_URL.rstrip('/')
+        self.auth = (settings.PCO_APP_ID, settings.PCO_SECRET)
+        self.concurrency = concurrency or settings.PCO_SYNC_CONCURRENCY
+        self.client = PCOClient(
+            self.auth, pool_size=self.concurrency,
+            bucket=TokenBucket(self.RATE_LIMIT_BUCKET))
+
+    def sync_volunteers(self, full=None, since=None, resume=False, progress=None,
+                        addresses=None):
+        """
+        Sync volunteers from PCO Services and capture their status.
+
+        By default only people changed since the stored watermark are fetched,
+        with a full sweep once PCO_FULL_SYNC_INTERVAL_HOURS has elapsed.
+        Pass full=True to force a full sweep, or since=<datetime> to fetch
+        everything changed after an explicit point in time.
+
+        Pages are fetched, decoded and written one at a time so memory stays
+        flat regardless of org size. The link to the next page is checkpointed
+        after every committed page; resume=True continues an interrupted run
+        from there. progress(stage, results) is called after each stage of
+        each page. Full syncs fetch pages with PCO_SYNC_CONCURRENCY workers.
+
+        Only the fields we store are requested. addresses=False (default:
+        PCO_SYNC_ADDRESSES) also skips addresses, leaving stored ones as is.
+        """
         results = {
+            'mode': 'full',
+            'since': None,
+            'resumed': False,
+            'addresses': settings.PCO_SYNC_ADDRESSES if addresses is None else addresses,
+            'pages': 0,
             'synced': 0,
             'updated': 0,
+            'unchanged': 0,
             'archived': 0,
+            'stage_seconds': {'fetch': 0.0, 'decode': 0.0, 'upsert': 0.0},
+            'requests': 0,
+            'retries': 0,
+            'throttled_seconds': 0.0,
+            'bytes': 0,
             'errors': []
         }
+        client_stats = dict(self.client.stats)
 
         try:
-            logger.info('Starting PCO volunteer sync...')
-
-            all_people = []
-            # Fetch all people (both active and archived) so we can update status
-            next_url = f'{self.base_url}/services/v2/people?per_page=100&include=emails,phone_numbers,addresses'
-
-            while next_url:
-                try:
-                    response = requests.get(next_url, auth=self.auth)
-                    response.raise_for_status()
-                    data = response.json()
-
-                    people = data.get('data', [])
-                    included = data.get('included', [])
-
-                    for person in people:
-                        try:
-                            person_data = self._extract_person_data(
-                                person, included)
-                            all_people.append(person_data)
-
-                            # Track archived count
-                            if person_data.get('is_archived'):
-                                results['archived'] += 1
-
-                        except Exception as e:
-                            logger.error(
-                                f"Error processing person {person.get('id')}: {e}")
-                            results['errors'].append({
-                                'id': person.get('id'),
-                                'error': str(e)
-                            })
-
-                    # Get next page
-                    links = data.get('links', {})
-                    next_url = links.get('next')
-
-                except requests.RequestException as e:
-                    logger.error(f"Error fetching from PCO: {e}")
-                    results['errors'].append({
-                        'error': 'Failed to fetch from PCO',
-                        'message': str(e)
-                    })
-                    break
+            state = SyncState.for_source(self.SYNC_SOURCE)
+            checkpoint = state.checkpoint if resume else None
+
+            if checkpoint:
+                results['resumed'] = True
+                results['mode'] = checkpoint['mode']
+                results['since'] = checkpoint['since']
+                results['addresses'] = checkpoint.get('addresses', True)
+                started_at = parse_datetime(checkpoint['started_at'])
+                high_water = parse_datetime(checkpoint.get('high_water') or '')
+                next_url = checkpoint['next_url']
+            else:
+                started_at = timezone.now()
+                if since is None and not full and not state.full_sync_due(
+                        timedelta(hours=settings.PCO_FULL_SYNC_INTERVAL_HOURS)):
+                    since = state.watermark
+                if since is not None:
+                    results['mode'] = 'delta'
+                    results['since'] = since.isoformat()
+
+                high_water = None
+                # Fetch people (both active and archived) so we can update status
+                next_url = self._people_url(since, addresses=results['addresses'])
+                checkpoint = {
+                    'mode': results['mode'],
+                    'since': results['since'],
+                    'addresses': results['addresses'],
+                    'started_at': started_at.isoformat(),
+                    'high_water': None,
+                    'next_url': next_url,
+                }
+                state.checkpoint = checkpoint
+                state.save(update_fields=['checkpoint', 'updated_at'])
 
             logger.info(
-                f"Fetched {len(all_people)} people from PCO ({results['archived']} archived)")
-
-            # Update database
-            for person_data in all_people:
-                try:
-                    volunteer, created = Volunteer.objects.update_or_create(
-                        pco_person_id=person_data['pco_person_id'],
-                        defaults={
-                            'first_name': person_data['first_name'],
-                            'last_name': person_data['last_name'],
-                            'email': person_data.get('email'),
-                            'phone': person_data.get('phone'),
-                            'address': person_data.get('address'),
-                            'teams': person_data.get('teams', []),
-                            'status': person_data.get('status', 'active'),
-                            'is_archived': person_data.get('is_archived', False),
-                            'last_synced_at': timezone.now(),
-                        }
-                    )
-
-                    if created:
-                        results['synced'] += 1
-                    else:
-                        results['updated'] += 1
-
-                except Exception as e:
-                    logger.error(
-                        f"Error saving volunteer {person_data['pco_person_id']}: {e}")
-                    results['errors'].append({
-                        'id': person_data['pco_person_id'],
-                        'error': str(e)
-                    })
+                f"{'Resuming' if results['resumed'] else 'Starting'} PCO volunteer sync "
+                f"({results['mode']}"
+                f"{' since ' + results['since'] if results['since'] else ''})...")
+
+            upserter = VolunteerUpserter(fields=sync_fields(results['addresses']))
+            fetch_failed = False
+            # Delta runs are a handful of pages ordered by updated_at; only
+            # fan out for full sweeps
+            concurrency = self.concurrency if results['mode'] == 'full' else 1
 
+            try:
+                # A run interrupted after committing its last page has nothing
+                # left to fetch, only the watermark and checkpoint to settle
+                documents = self._fetch_pages(
+                    next_url, results, progress, concurrency) if next_url else ()
+                for document in documents:
+                    people = self._decode_page(document, results, progress)
+
+                    for person_data in people:
+                        updated_at = person_data.get('pco_updated_at')
+                        if updated_at and (high_water is None or updated_at > high_water):
+                            high_water = updated_at
+
+                    stage_start = time.monotonic()
+                    counts = upserter.upsert(people)
+                    results['stage_seconds']['upsert'] += time.monotonic() - stage_start
+                    results['synced'] += counts['created']
+                    results['updated'] += counts['updated']
+                    results['unchanged'] += counts['unchanged']
+                    results['errors'].extend(counts['errors'])
+                    results['pages'] += 1
+
+                    # This page is committed; an interrupted run picks up here
+                    checkpoint['next_url'] = document.next_url
+                    checkpoint['high_water'] = high_water.isoformat() if high_water else None
+                    state.checkpoint = checkpoint
+                    state.save(update_fields=['checkpoint', 'updated_at'])
+                    self._report(progress, 'upsert', results)
+
+            except requests.RequestException as e:
+                logger.error(f"Error fetching from PCO: {e}")
+                results['errors'].append({
+                    'error': 'Failed to fetch from PCO',
+                    'message': str(e)
+                })
+                fetch_failed = True
+
+            # Only move the cursor forward after a complete fetch, otherwise
+            # people on the pages we never saw would be skipped next time
+            if not fetch_failed:
+                if high_water and (state.watermark is None or high_water > state.watermark):
+                    state.watermark = high_water
+                if results['mode'] == 'full':
+                    state.last_full_sync_at = started_at
+                state.last_sync_at = started_at
+                state.checkpoint = None
+                state.save()
+
+            self._finish(results, client_stats)
             logger.info(
-                f"Sync complete: {results['synced']} new, {results['updated']} updated, "
-                f"{results['archived']} archived, {len(results['errors'])} errors"
+                f"Sync {'interrupted' if fetch_failed else 'complete'} after "
+                f"{results['pages']} pages: {results['synced']} new, "
+                f"{results['updated']} updated, {results['unchanged']} unchanged, "
+                f"{results['archived']} archived, {len(results['errors'])} errors "
+                f"({results['requests']} requests, {results['bytes'] // 1024} KB, "
+                f"{results['throttled_seconds']}s throttled)"
             )
             return results
 
@@ -115,12 +212,80 @@ class PCOService:
                 'error': 'Critical sync failure',
                 'message': str(e)
             })
+            self._finish(results, client_stats)
             return results
 
-    def _extract_person_data(self, person, included):
+    def _finish(self, results, client_stats):
+        """Round timings and record the HTTP requests/retries/throttling of this run"""
+        results['stage_seconds'] = {
+            stage: round(seconds, 3)
+            for stage, seconds in results['stage_seconds'].items()
+        }
+        self._finish_requests(results, client_stats)
+
+    def _finish_requests(self, results, client_stats):
+        for key in ('requests', 'retries', 'throttled_seconds', 'bytes'):
+            results[key] = self.client.stats[key] - client_stats[key]
+        results['throttled_seconds'] = round(results['throttled_seconds'], 3)
+
+    def _report(self, progress, stage, results):
+        if progress:
+            progress(stage, results)
+
+    def _fetch_pages(self, url, results, progress=None, concurrency=1):
+        """Yield JSON:API documents page by page, in order"""
+        pages = self.client.iter_documents(url, concurrency=concurrency)
+        try:
+            while True:
+                stage_start = time.monotonic()
+                document = next(pages, None)
+                results['stage_seconds']['fetch'] += time.monotonic() - stage_start
+                if document is None:
+                    return
+                logger.info(
+                    f"Fetched page {results['pages'] + 1}: {len(document.data)} records, "
+                    f"{document.wire_bytes} bytes transferred "
+                    f"({document.body_bytes} bytes decoded)")
+                self._report(progress, 'fetch', results)
+                yield document
+        finally:
+            pages.close()
+
+    def _decode_page(self, document, results, progress=None):
+        """Map one page of PCO people to volunteer field dicts"""
+        stage_start = time.monotonic()
+        people = []
+        for person in document.data:
+            try:
+                person_data = self._extract_person_data(person, document)
+                people.append(person_data)
+
+                # Track archived count
+                if person_data.get('is_archived'):
+                    results['archived'] += 1
+
+            except Exception as e:
+                logger.error(
+                    f"Error processing person {person.get('id')}: {e}")
+                results['errors'].append({
+                    'id': person.get('id'),
+                    'error': str(e)
+                })
+        results['stage_seconds']['decode'] += time.monotonic() - stage_start
+        self._report(progress, 'decode', results)
+        return people
+
+    def _people_url(self, since=None, addresses=True):
+        """Build the first page URL for the people listing"""
+        params = {'per_page': 100, **person_query(addresses)}
+        if since is not None:
+            params['where[updated_at][gte]'] = since.isoformat()
+            params['order'] = 'updated_at'
+        return f'{self.base_url}/services/v2/people?{urlencode(params, safe=",[]")}'
+
+    def _extract_person_data(self, person, document):
         """Extract person data from PCO response including status"""
         attributes = person.get('attributes', {})
-        relationships = person.get('relationships', {})
 
         # Get status - PCO may use 'status' or 'archived' attribute
         status = attributes.get('status', 'active')
@@ -139,93 +304,170 @@ class PCOService:
             'last_name': attributes.get('last_name', ''),
             'status': 'archived' if is_archived else 'active',
             'is_archived': is_archived,
+            'pco_updated_at': parse_datetime(attributes.get('updated_at') or ''),
         }
 
-        # Extract email from included data
-        emails_data = relationships.get('emails', {}).get('data', [])
-        if emails_data:
-            email_id = emails_data[0]['id']
-            email_obj = next(
-                (item for item in included if item['type']
-                 == 'Email' and item['id'] == email_id),
-                None
-            )
-            if email_obj:
-                person_data['email'] = email_obj.get(
-                    'attributes', {}).get('address')
-
-        # Extract phone from included data
-        phone_data = relationships.get('phone_numbers', {}).get('data', [])
-        if phone_data:
-            phone_id = phone_data[0]['id']
-            phone_obj = next(
-                (item for item in included if item['type'] ==
-                 'PhoneNumber' and item['id'] == phone_id),
-                None
-            )
-            if phone_obj:
-                person_data['phone'] = phone_obj.get(
-                    'attributes', {}).get('number')
-
-        # Extract address from included data
-        address_data = relationships.get('addresses', {}).get('data', [])
-        if address_data:
-            address_id = address_data[0]['id']
-            address_obj = next(
-                (item for item in included if item['type']
-                 == 'Address' and item['id'] == address_id),
-                None
-            )
-            if address_obj:
-                addr_attrs = address_obj.get('attributes', {})
-                address_parts = [
-                    addr_attrs.get('street'),
-                    addr_attrs.get('city'),
-                    addr_attrs.get('state'),
-                    addr_attrs.get('zip')
-                ]
-                person_data['address'] = ', '.join(filter(None, address_parts))
+        # Extract primary email from included data
+        email_obj = document.related_one(person, 'emails')
+        if email_obj:
+            person_data['email'] = email_obj.get(
+                'attributes', {}).get('address')
+
+        # Extract primary phone from included data
+        phone_obj = document.related_one(person, 'phone_numbers')
+        if phone_obj:
+            person_data['phone'] = phone_obj.get(
+                'attributes', {}).get('number')
+
+        # Extract primary address from included data
+        address_obj = document.related_one(person, 'addresses')
+        if address_obj:
+            addr_attrs = address_obj.get('attributes', {})
+            address_parts = [
+                addr_attrs.get('street'),
+                addr_attrs.get('city'),
+                addr_attrs.get('state'),
+                addr_attrs.get('zip')
+            ]
+            person_data['address'] = ', '.join(filter(None, address_parts))
 
         return person_data
 
+    def sync_teams(self):
+        """
+        Refresh teams and team memberships from the PCO Services roster.
+
+        Pages through service types and their teams (including the team's
+        people and leaders), builds the roster in memory and writes only
+        the changes, so the whole org costs a few requests per service type
+        rather than one request per volunteer.
+        """
+        results = {
+            'service_types': 0,
+            'teams': 0,
+            'memberships': 0,
+            'updated': 0,
+            'unchanged': 0,
+            'requests': 0,
+            'retries': 0,
+            'throttled_seconds': 0.0,
+            'bytes': 0,
+            'errors': []
+        }
+        client_stats = dict(self.client.stats)
+        roster = {}
+
+        try:
+            logger.info('Starting PCO team roster sync...')
+
+            service_types_url = f'{self.base_url}/services/v2/service_types?per_page=100'
+            for service_types in self.client.iter_documents(service_types_url):
+                for service_type in service_types.data:
+                    results['service_types'] += 1
+                    teams_url = (
+                        f'{self.base_url}/services/v2/service_types/'
+                        f'{service_type["id"]}/teams?per_page=100&include=people,team_leaders')
+
+                    for teams in self.client.iter_documents(teams_url):
+                        for team in teams.data:
+                            team_name = team.get('attributes', {}).get('name')
+                            if not team_name:
+                                continue
+                            results['teams'] += 1
+                            leaders = {
+                                person['id']
+                                for leader in teams.related(team, 'team_leaders')
+                                for person in teams.linkage(leader, 'people')
+                            }
+                            members = {
+                                person['id']: (
+                                    TeamMembership.ROLE_LEADER if person['id'] in leaders
+                                    else TeamMembership.ROLE_MEMBER)
+                                for person in teams.linkage(team, 'people')
+                            }
+                            roster[team['id']] = {
+                                'name': team_name,
+                                'service_type': service_type.get('attributes', {}).get('name'),
+                                'members': members,
+                            }
+                            results['memberships'] += len(members)
+
+        except requests.RequestException as e:
+            # A partial roster would strip teams from everyone we missed
+            logger.error(f"Error fetching team roster from PCO: {e}")
+            results['errors'].append({
+                'error': 'Failed to fetch team roster from PCO',
+                'message': str(e)
+            })
+            self._finish_requests(results, client_stats)
+            return results
+
+        counts = apply_team_roster(roster)
+        results['updated'] = counts['updated']
+        results['unchanged'] = counts['unchanged']
+        self._finish_requests(results, client_stats)
+
+        logger.info(
+            f"Team sync complete: {results['teams']} teams, "
+            f"{results['memberships']} memberships, {results['updated']} volunteers updated "
+            f"({results['requests']} requests)")
+        return results
+
+    def fetch_person(self, pco_person_id, addresses=None):
+        """
+        Fetch one person mapped exactly like a people sync page, with
+        addresses only if syncs include them (default: PCO_SYNC_ADDRESSES).
+        Returns None if the person no longer exists in PCO Services.
+        """
+        if addresses is None:
+            addresses = settings.PCO_SYNC_ADDRESSES
+        url = (f'{self.base_url}/services/v2/people/{pco_person_id}'
+               f'?{urlencode(person_query(addresses), safe=",[]")}')
+        try:
+            document = self.client.get_document(url)
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
+        return self._extract_person_data(document.data[0], document)
+
     def fetch_person_teams(self, pco_person_id):
         """Fetch team assignments for a specific person"""
         try:
-            url = f'{self.base_url}/services/v2/people/{pco_person_id}/team_memberships?include=team'
-            response = requests.get(url, auth=self.auth)
-            response.raise_for_status()
-            data = response.json()
-
-            teams = []
-            included = data.get('included', [])
-
-            for membership in data.get('data', []):
-                team_rel = membership.get('relationships', {}).get(
-                    'team', {}).get('data')
-                if team_rel:
-                    team_id = team_rel['id']
-                    team_obj = next(
-                        (item for item in included if item['type']
-                         == 'Team' and item['id'] == team_id),
-                        None
-                    )
-                    if team_obj:
-                        team_name = team_obj.get('attributes', {}).get('name')
-                        if team_name:
-                            teams.append(team_name)
-
-            return teams
+            return [team['name'] for team in self.person_team_memberships(pco_person_id)]
         except Exception as e:
             logger.error(
                 f"Error fetching teams for person {pco_person_id}: {e}")
             return []
 
+    def person_team_memberships(self, pco_person_id):
+        """
+        A person's teams as [{'pco_team_id', 'name', 'position'}] for
+        set_volunteer_teams; unlike fetch_person_teams, errors propagate
+        """
+        url = (f'{self.base_url}/services/v2/people/{pco_person_id}'
+               f'/team_memberships?include=team,team_position')
+        document = self.client.get_document(url)
+
+        teams = []
+        for membership in document.data:
+            position = document.related_one(membership, 'team_position')
+            for team_obj in document.related(membership, 'team'):
+                team_name = team_obj.get('attributes', {}).get('name')
+                if team_name:
+                    teams.append({
+                        'pco_team_id': team_obj['id'],
+                        'name': team_name,
+                        'position': (position or {}).get('attributes', {}).get('name') or '',
+                    })
+
+        return teams
+
     def test_connection(self):
         """Test connection to PCO API"""
         try:
             url = f'{self.base_url}/services/v2/people?per_page=1'
-            response = requests.get(url, auth=self.auth)
-            response.raise_for_status()
+            response = self.client.get(url)
 
             data = response.json()
             people_count = data.get('meta', {}).get('total_count', 0)
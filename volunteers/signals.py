@@ -0,0 +1,18 @@
+"""
+Bump the volunteer roster version on model writes. Bulk writes in
+volunteers/sync.py and volunteers/webhooks.py bump it themselves.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Volunteer, volunteers_changed
+
+
+@receiver(post_save, sender=Volunteer)
+def volunteer_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        volunteers_changed()
+
+
+@receiver(post_delete, sender=Volunteer)
+def volunteer_deleted(sender, instance, **kwargs):
+    volunteers_changed()
@@ -0,0 +1,278 @@
+import hashlib
+import json
+import logging
+from django.db import transaction
+from django.utils import timezone
+from .models import Team, TeamMembership, Volunteer, phone_digits, volunteers_changed
+
+logger = logging.getLogger(__name__)
+
+# Volunteer columns owned by the PCO people sync
+SYNC_FIELDS = [
+    'first_name', 'last_name', 'email', 'phone', 'address',
+    'status', 'is_archived',
+]
+
+
+def sync_fields(addresses=True):
+    """SYNC_FIELDS, less the address when addresses aren't synced (PCO_SYNC_ADDRESSES)"""
+    return [field for field in SYNC_FIELDS if addresses or field != 'address']
+
+
+def fingerprint(values, fields=SYNC_FIELDS):
+    """Stable content hash of the synced fields of a person/volunteer"""
+    payload = json.dumps([values.get(field) for field in fields], default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class VolunteerUpserter:
+    """
+    Batched upsert of synced people into the volunteers table.
+
+    Each batch loads the matching rows in one query, compares content
+    fingerprints and only writes new or changed people, using one
+    transaction per batch. Unchanged rows are left untouched so their
+    updated_at/last_synced_at keep meaning "last changed by PCO".
+    """
+
+    def __init__(self, fields=None, batch_size=500):
+        self.fields = list(fields or SYNC_FIELDS)
+        self.batch_size = batch_size
+        # Columns derived from synced ones, written alongside them
+        self.derived_fields = ['phone_digits'] if 'phone' in self.fields else []
+
+    def upsert(self, people):
+        """Upsert a list of person dicts, returning created/updated/unchanged counts"""
+        counts = {'created': 0, 'updated': 0, 'unchanged': 0, 'errors': []}
+
+        for start in range(0, len(people), self.batch_size):
+            batch = people[start:start + self.batch_size]
+            try:
+                self._upsert_batch(batch, counts)
+            except Exception as e:
+                logger.error(
+                    f"Bulk upsert of {len(batch)} people failed, retrying one by one: {e}")
+                self._upsert_rows(batch, counts)
+
+        return counts
+
+    def _values(self, person):
+        values = {field: person.get(field) for field in self.fields}
+        if 'phone' in values:
+            values['phone_digits'] = phone_digits(values['phone'])
+        return values
+
+    def _upsert_batch(self, batch, counts):
+        # Later entries win if PCO returns the same person twice
+        incoming = {
+            person['pco_person_id']: self._values(person) for person in batch
+        }
+        now = timezone.now()
+        write_fields = self.fields + self.derived_fields + ['last_synced_at', 'updated_at']
+
+        with transaction.atomic():
+            existing = {
+                volunteer.pco_person_id: volunteer
+                for volunteer in Volunteer.objects.filter(
+                    pco_person_id__in=list(incoming)
+                ).only('id', 'pco_person_id', *self.fields)
+            }
+
+            to_create = []
+            to_update = []
+            for pco_person_id, values in incoming.items():
+                volunteer = existing.get(pco_person_id)
+                if volunteer is None:
+                    to_create.append(Volunteer(
+                        pco_person_id=pco_person_id, last_synced_at=now, **values))
+                    continue
+
+                current = {field: getattr(volunteer, field) for field in self.fields}
+                if fingerprint(current, self.fields) == fingerprint(values, self.fields):
+                    continue
+
+                for field, value in values.items():
+                    setattr(volunteer, field, value)
+                # bulk_update does not apply auto_now
+                volunteer.last_synced_at = now
+                volunteer.updated_at = now
+                to_update.append(volunteer)
+
+            if to_create:
+                # A concurrent sync may insert the same person between our
+                # read and write; turn that conflict into an update
+                Volunteer.objects.bulk_create(
+                    to_create,
+                    batch_size=self.batch_size,
+                    update_conflicts=True,
+                    unique_fields=['pco_person_id'],
+                    update_fields=write_fields,
+                )
+            if to_update:
+                Volunteer.objects.bulk_update(
+                    to_update, write_fields, batch_size=self.batch_size)
+            if to_create or to_update:
+                volunteers_changed()
+
+        counts['created'] += len(to_create)
+        counts['updated'] += len(to_update)
+        counts['unchanged'] += len(incoming) - len(to_create) - len(to_update)
+
+    def _upsert_rows(self, batch, counts):
+        """Slow path used to isolate the rows that broke a batch"""
+        for person in batch:
+            try:
+                self._upsert_batch([person], counts)
+            except Exception as e:
+                logger.error(
+                    f"Error saving volunteer {person['pco_person_id']}: {e}")
+                counts['errors'].append({
+                    'id': person['pco_person_id'],
+                    'error': str(e)
+                })
+
+
+def upsert_teams(teams, update_fields=('name', 'service_type_name')):
+    """
+    Create or rename teams from PCO ({pco_team_id: {'name', 'service_type'}}),
+    returning {pco_team_id: team pk}
+    """
+    Team.objects.bulk_create(
+        [
+            Team(pco_team_id=pco_team_id, name=team['name'],
+                 service_type_name=team.get('service_type') or '')
+            for pco_team_id, team in teams.items()
+        ],
+        update_conflicts=True,
+        unique_fields=['pco_team_id'],
+        update_fields=[*update_fields, 'updated_at'],
+    )
+    return dict(Team.objects.filter(
+        pco_team_id__in=list(teams)
+    ).values_list('pco_team_id', 'id'))
+
+
+def refresh_team_names(volunteer_ids=None, batch_size=500):
+    """
+    Rewrite the denormalized Volunteer.teams name lists from team
+    memberships, for the given volunteers or everyone
+    """
+    counts = {'updated': 0, 'unchanged': 0}
+
+    memberships = TeamMembership.objects.all()
+    volunteers = Volunteer.objects.all()
+    if volunteer_ids is not None:
+        memberships = memberships.filter(volunteer_id__in=volunteer_ids)
+        volunteers = volunteers.filter(id__in=volunteer_ids)
+
+    names = {}
+    for volunteer_id, name in memberships.values_list('volunteer_id', 'team__name').iterator():
+        names.setdefault(volunteer_id, set()).add(name)
+
+    changed = []
+    for volunteer in volunteers.only('id', 'teams').order_by('id').iterator(chunk_size=2000):
+        teams = sorted(names.get(volunteer.id, ()))
+        if teams == (volunteer.teams or []):
+            counts['unchanged'] += 1
+            continue
+        volunteer.teams = teams
+        changed.append(volunteer)
+
+    for start in range(0, len(changed), batch_size):
+        Volunteer.objects.bulk_update(changed[start:start + batch_size], ['teams'])
+    if changed:
+        volunteers_changed()
+    counts['updated'] = len(changed)
+
+    return counts
+
+
+def apply_team_roster(roster, batch_size=500):
+    """
+    Replace all team memberships with a full PCO roster:
+    {pco_team_id: {'name', 'service_type', 'members': {pco_person_id: role}}}.
+
+    Teams missing from the roster, and legacy teams without a PCO id, are
+    deleted. Only memberships that actually changed are written, then the
+    volunteers' team name lists are refreshed. Returns volunteer counts.
+    """
+    with transaction.atomic():
+        team_ids = upsert_teams(roster)
+        Team.objects.exclude(pco_team_id__in=list(team_ids)).delete()
+
+        person_ids = {
+            pco_person_id
+            for team in roster.values() for pco_person_id in team['members']
+        }
+        volunteer_ids = dict(Volunteer.objects.filter(
+            pco_person_id__in=list(person_ids)
+        ).values_list('pco_person_id', 'id'))
+
+        wanted = {}
+        for pco_team_id, team in roster.items():
+            for pco_person_id, role in team['members'].items():
+                volunteer_id = volunteer_ids.get(pco_person_id)
+                if volunteer_id is not None:
+                    wanted[(team_ids[pco_team_id], volunteer_id)] = role
+
+        stale = []
+        to_update = []
+        for membership in TeamMembership.objects.only('id', 'team_id', 'volunteer_id', 'role'):
+            role = wanted.pop((membership.team_id, membership.volunteer_id), None)
+            if role is None:
+                stale.append(membership.id)
+            elif role != membership.role:
+                membership.role = role
+                to_update.append(membership)
+
+        for start in range(0, len(stale), batch_size):
+            TeamMembership.objects.filter(id__in=stale[start:start + batch_size]).delete()
+        TeamMembership.objects.bulk_update(to_update, ['role'], batch_size=batch_size)
+        TeamMembership.objects.bulk_create(
+            [
+                TeamMembership(team_id=team_id, volunteer_id=volunteer_id, role=role)
+                for (team_id, volunteer_id), role in wanted.items()
+            ],
+            batch_size=batch_size,
+        )
+
+        return refresh_team_names(batch_size=batch_size)
+
+
+def set_volunteer_teams(volunteer_id, teams):
+    """
+    Replace one volunteer's memberships with their current PCO teams
+    ([{'pco_team_id', 'name', 'position'}]), keeping roles set by the
+    roster sync. Returns the volunteer's sorted team names.
+    """
+    with transaction.atomic():
+        # The per-person endpoint doesn't know the service type
+        team_ids = upsert_teams(
+            {team['pco_team_id']: team for team in teams}, update_fields=('name',))
+        # Several positions on one team share the membership
+        positions = {}
+        for team in teams:
+            names = positions.setdefault(team_ids[team['pco_team_id']], set())
+            if team.get('position'):
+                names.add(team['position'])
+        positions = {team_id: ', '.join(sorted(names)) for team_id, names in positions.items()}
+
+        existing = {
+            membership.team_id: membership
+            for membership in TeamMembership.objects.filter(volunteer_id=volunteer_id)
+        }
+        TeamMembership.objects.filter(
+            id__in=[m.id for team_id, m in existing.items() if team_id not in positions]
+        ).delete()
+        for team_id, position in positions.items():
+            membership = existing.get(team_id)
+            if membership is None:
+                TeamMembership.objects.create(
+                    volunteer_id=volunteer_id, team_id=team_id, position=position)
+            elif membership.position != position:
+                membership.position = position
+                membership.save(update_fields=['position'])
+
+        refresh_team_names([volunteer_id])
+
+    return sorted({team['name'] for team in teams})
@@ -0,0 +1,417 @@
+import json
+from datetime import date, timedelta
+from unittest import mock, skipUnless
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from core.models import DataVersion, TeamMember
+from interactions.engagement import rebuild_engagement
+from interactions.models import Interaction
+from .models import VOLUNTEERS_VERSION, SyncJob, SyncState, Team, TeamMembership, Volunteer
+from .search import _fallback_word
+from .serializers import VolunteerSerializer
+from .sync import VolunteerUpserter
+from .services import PCOService
+from .webhooks import SIGNATURE_HEADER, process_webhook_events, sign, store_deliveries
+
+
+class SyncResumeTests(TestCase):
+
+    def test_resume_after_last_page_only_finalizes(self):
+        started_at = timezone.now() - timedelta(minutes=5)
+        high_water = started_at - timedelta(minutes=1)
+        state = SyncState.for_source(PCOService.SYNC_SOURCE)
+        state.checkpoint = {
+            'mode': 'full',
+            'since': None,
+            'addresses': True,
+            'started_at': started_at.isoformat(),
+            'high_water': high_water.isoformat(),
+            'next_url': None,
+        }
+        state.save()
+
+        service = PCOService()
+        with mock.patch.object(service.client, 'get_document') as get_document:
+            results = service.sync_volunteers(resume=True)
+
+        get_document.assert_not_called()
+        self.assertTrue(results['resumed'])
+        self.assertEqual(results['errors'], [])
+        state.refresh_from_db()
+        self.assertIsNone(state.checkpoint)
+        self.assertEqual(state.watermark, high_water)
+        self.assertEqual(state.last_full_sync_at, started_at)
+
+
+class WebhookInboxTests(TestCase):
+
+    def _body(self, *event_ids):
+        return json.dumps({'data': [
+            {'id': event_id, 'attributes': {
+                'name': 'people.v2.events.person.updated',
+                'payload': json.dumps({'data': {'type': 'Person', 'id': '42'}}),
+            }}
+            for event_id in event_ids
+        ]}).encode('utf-8')
+
+    def test_redeliveries_are_not_counted_as_stored(self):
+        self.assertEqual(store_deliveries(self._body('e1', 'e2')), (2, 2))
+        self.assertEqual(store_deliveries(self._body('e2', 'e3')), (2, 1))
+
+
+@override_settings(ALLOWED_HOSTS=['*'], SECURE_SSL_REDIRECT=False)
+class SyncEndpointTests(APITestCase):
+
+    def setUp(self):
+        self.client.force_authenticate(TeamMember.objects.create(username='admin', role='admin'))
+
+    @override_settings(PCO_SYNC_WORKER=False)
+    def test_without_a_worker_the_job_runs_here(self):
+        with mock.patch('volunteers.views.run_job_in_background') as run_job_in_background:
+            first = self.client.post('/api/volunteers/sync/', {}, format='json')
+            again = self.client.post('/api/volunteers/sync/', {}, format='json')
+
+        self.assertEqual(first.data['status'], SyncJob.STATUS_RUNNING)
+        self.assertEqual(again.data['id'], first.data['id'])
+        self.assertTrue(again.data['already_running'])
+        run_job_in_background.assert_called_once()
+
+    @override_settings(PCO_SYNC_WORKER=True)
+    def test_unclaimed_jobs_stop_holding_the_slot(self):
+        stale = SyncJob.objects.create()
+        SyncJob.objects.filter(pk=stale.pk).update(created_at=timezone.now() - timedelta(days=1))
+
+        response = self.client.post('/api/volunteers/sync/', {}, format='json')
+
+        self.assertNotEqual(response.data['id'], stale.pk)
+        self.assertEqual(response.data['status'], SyncJob.STATUS_QUEUED)
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, SyncJob.STATUS_FAILED)
+
+
+@override_settings(ALLOWED_HOSTS=['*'], SECURE_SSL_REDIRECT=False)
+class VolunteerQueryBudgetTests(APITestCase):
+    """Volunteer endpoints run a fixed number of queries however many rows they return"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = TeamMember.objects.create(username='member')
+        volunteers = Volunteer.objects.bulk_create([
+            Volunteer(first_name=f'First{i}', last_name=f'Last{i}') for i in range(40)
+        ])
+        Interaction.objects.bulk_create([
+            Interaction(
+                volunteer=volunteer, team_member=cls.member,
+                interaction_date=date.today() - timedelta(days=day * 7),
+                discussion_notes='Checked in')
+            for volunteer in volunteers for day in range(3)
+        ])
+        rebuild_engagement()  # bulk_create skips the engagement signals
+        cls.volunteer = volunteers[0]
+
+    def setUp(self):
+        self.client.force_authenticate(self.member)
+
+    def test_list(self):
+        for page_size in (3, 40):
+            with self.assertNumQueries(2):  # count + page
+                response = self.client.get('/api/volunteers/', {'page_size': page_size})
+            self.assertEqual(len(response.data['results']), page_size)
+
+    def test_retrieve(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/volunteers/{self.volunteer.id}/')
+        self.assertEqual(response.data['interaction_count'], 3)
+
+    def test_history(self):
+        with self.assertNumQueries(2):  # volunteer + interactions
+            response = self.client.get(f'/api/volunteers/{self.volunteer.id}/history/')
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(ALLOWED_HOSTS=['*'], SECURE_SSL_REDIRECT=False)
+class SparseFieldsTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = TeamMember.objects.create(username='member')
+        volunteers = Volunteer.objects.bulk_create([
+            Volunteer(first_name=f'First{i}', last_name=f'Last{i}', notes='Long notes ' * 50)
+            for i in range(5)
+        ])
+        Interaction.objects.bulk_create([
+            Interaction(volunteer=volunteer, team_member=cls.member,
+                        interaction_date=date.today(), discussion_notes='Checked in')
+            for volunteer in volunteers
+        ])
+        rebuild_engagement()
+
+    def setUp(self):
+        self.client.force_authenticate(self.member)
+
+    def get_list(self, **params):
+        """The list response and the SQL of its page query"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/volunteers/', params)
+        self.assertEqual(response.status_code, 200)
+        return response, queries[-1]['sql']
+
+    def test_fields_trims_the_payload_and_the_select(self):
+        response, sql = self.get_list(fields='id,full_name')
+
+        for row in response.data['results']:
+            self.assertEqual(list(row), ['id', 'full_name'])
+        self.assertIn('"volunteers"."last_name"', sql)
+        self.assertNotIn('"volunteers"."notes"', sql)
+
+    def test_omit_drops_fields(self):
+        response, sql = self.get_list(omit='notes,address')
+
+        expected = [name for name in VolunteerSerializer.Meta.fields
+                    if name not in ('notes', 'address')]
+        self.assertEqual(list(response.data['results'][0]), expected)
+        self.assertNotIn('"volunteers"."notes"', sql)
+
+    def test_compact_profile(self):
+        response, _ = self.get_list(fields='compact')
+
+        self.assertEqual(list(response.data['results'][0]),
+                         VolunteerSerializer.Meta.compact_fields)
+        self.assertEqual(response.data['results'][0]['interaction_count'], 1)
+
+    def test_unknown_fields_are_rejected(self):
+        for param in ('fields', 'omit'):
+            with self.subTest(param=param):
+                response = self.client.get('/api/volunteers/', {param: 'id,shoe_size'})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('shoe_size', str(response.data['fields']))
+
+    def test_stats_join_is_skipped_when_stats_are_omitted(self):
+        _, sql = self.get_list()
+        self.assertIn('"volunteer_engagement"', sql)
+
+        # Without the annotations the stats would be a query per row
+        with self.assertNumQueries(2):  # count + page
+            _, sql = self.get_list(
+                omit='interaction_count,last_interaction_date,days_since_last_interaction')
+        self.assertNotIn('"volunteer_engagement"', sql)
+        with self.assertNumQueries(2):
+            _, sql = self.get_list(fields='id,full_name,days_since_last_interaction')
+        self.assertIn('"volunteer_engagement"', sql)
+
+
+@override_settings(ALLOWED_HOSTS=['*'], SECURE_SSL_REDIRECT=False)
+class TeamTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = TeamMember.objects.create(username='member')
+        cls.choir = Team.objects.create(name='Choir')
+        cls.ushers = Team.objects.create(name='Ushers')
+        ada, grace, alan = Volunteer.objects.bulk_create([
+            Volunteer(first_name='Ada', last_name='Lovelace'),
+            Volunteer(first_name='Grace', last_name='Hopper'),
+            Volunteer(first_name='Alan', last_name='Turing'),
+        ])
+        TeamMembership.objects.bulk_create([
+            TeamMembership(team=cls.choir, volunteer=ada),
+            TeamMembership(team=cls.choir, volunteer=grace),
+            TeamMembership(team=cls.ushers, volunteer=alan),
+        ])
+        Interaction.objects.create(
+            volunteer=ada, team_member=cls.member, discussion_notes='Checked in',
+            interaction_date=timezone.now().date() - timedelta(days=60))
+
+    def setUp(self):
+        self.client.force_authenticate(self.member)
+
+    def test_volunteers_filtered_by_team_id_or_name(self):
+        for team in (str(self.choir.id), 'choir'):
+            with self.subTest(team=team):
+                response = self.client.get('/api/volunteers/', {'team': team})
+                self.assertEqual([row['full_name'] for row in response.data['results']],
+                                 ['Grace Hopper', 'Ada Lovelace'])
+
+    def test_coverage_window(self):
+        def choir(days):
+            response = self.client.get('/api/teams/', {'days': days})
+            self.assertEqual(response.status_code, 200)
+            return next(row for row in response.data['results'] if row['name'] == 'Choir')
+
+        self.assertEqual(choir(30)['coverage'], 0)
+        self.assertEqual(choir(90)['coverage'], 0.5)
+        # Clamped rather than overflowing the date arithmetic
+        self.assertEqual(choir(10 ** 9)['coverage'], 0.5)
+
+    def test_non_numeric_days_is_rejected(self):
+        response = self.client.get('/api/teams/', {'days': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('days', response.data)
+
+
+@override_settings(ALLOWED_HOSTS=['*'], SECURE_SSL_REDIRECT=False)
+class VolunteerSearchTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = TeamMember.objects.create(username='member')
+        cls.whitaker = Volunteer.objects.create(
+            first_name='Katherine', last_name='Whitaker', phone='(555) 123-4567')
+        cls.whit = Volunteer.objects.create(first_name='Sam', last_name='Whit')
+        cls.dewhitt = Volunteer.objects.create(first_name='Jo', last_name='Dewhitt')
+        cls.smith = Volunteer.objects.create(
+            first_name='Catherine', last_name='Smith', phone='555-987-6543')
+
+    def setUp(self):
+        self.client.force_authenticate(self.member)
+
+    def search(self, term):
+        response = self.client.get('/api/volunteers/', {'search': term})
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.data['results']]
+
+    def test_prefix_match(self):
+        self.assertEqual(self.search('Whitak'), [self.whitaker.id])
+
+    @skipUnless(connection.vendor == 'postgresql', 'Typos are matched with pg_trgm')
+    def test_name_typo(self):
+        self.assertEqual(self.search('Katherine Whitakr')[0], self.whitaker.id)
+
+    def test_formatted_phone_matches_digits(self):
+        for term in ['555.123.4567', '(555) 123-4567', '5551234567']:
+            with self.subTest(term=term):
+                self.assertEqual(self.search(term), [self.whitaker.id])
+
+    @mock.patch('volunteers.search._postgres_word', _fallback_word)
+    def test_fallback_ranks_exact_then_prefix_then_substring(self):
+        self.assertEqual(self.search('whit'), [self.whit.id, self.whitaker.id, self.dewhitt.id])
+
+    @mock.patch('volunteers.search._postgres_word', _fallback_word)
+    def test_fallback_matches_email_and_phone(self):
+        Volunteer.objects.filter(pk=self.smith.pk).update(email='cat@example.com')
+        self.assertEqual(self.search('example.com'), [self.smith.id])
+        self.assertEqual(self.search('987-6543'), [self.smith.id])
+
+
+def delivery(event_id, name, resource):
+    """One recorded PCO EventDelivery; its payload is a JSON string"""
+    return {
+        'id': event_id,
+        'type': 'EventDelivery',
+        'attributes': {'name': name, 'payload': json.dumps({'data': resource})},
+    }
+
+
+def person_resource(person_id):
+    return {'type': 'Person', 'id': person_id, 'attributes': {'first_name': 'Ada'}}
+
+
+def person_child(resource_type, resource_id, person_id):
+    """An email/phone number/address resource belonging to a person"""
+    return {
+        'type': resource_type, 'id': resource_id, 'attributes': {},
+        'relationships': {'person': {'data': {'type': 'Person', 'id': person_id}}},
+    }
+
+
+@override_settings(ALLOWED_HOSTS=['*'], SECURE_SSL_REDIRECT=False, PCO_WEBHOOK_SECRETS='s3cret')
+class WebhookReceiverTests(APITestCase):
+
+    def post(self, body, signature=None):
+        headers = {SIGNATURE_HEADER: signature} if signature else {}
+        return self.client.post('/api/pco/webhooks/', body,
+                                content_type='application/json', headers=headers)
+
+    def test_bad_or_missing_signature(self):
+        body = json.dumps({'data': [delivery('e1', 'people.v2.events.person.updated',
+                                             person_resource('42'))]}).encode('utf-8')
+        self.assertEqual(self.post(body).status_code, 401)
+        self.assertEqual(self.post(body, sign(body, 'wrong')).status_code, 401)
+        self.assertEqual(self.post(body, sign(body, 's3cret')).status_code, 202)
+
+    def test_malformed_body(self):
+        for body in [b'not json', json.dumps({'data': [{'attributes': {}}]}).encode('utf-8')]:
+            with self.subTest(body=body):
+                response = self.post(body, sign(body, 's3cret'))
+                self.assertEqual(response.status_code, 400)
+
+
+class WebhookProcessingTests(TestCase):
+
+    def person(self, person_id, **values):
+        return {
+            'pco_person_id': person_id, 'first_name': 'Ada', 'last_name': 'Lovelace',
+            'email': 'ada@example.com', 'phone': '555-123-4567', 'address': '1 Main St',
+            'status': 'active', 'is_archived': False, 'pco_updated_at': None, **values,
+        }
+
+    def test_events_for_one_person_cost_one_fetch(self):
+        store_deliveries(json.dumps({'data': [
+            delivery('e1', 'people.v2.events.person.updated', person_resource('42')),
+            delivery('e2', 'people.v2.events.email.created', person_child('Email', '7', '42')),
+            delivery('e3', 'people.v2.events.phone_number.updated',
+                     person_child('PhoneNumber', '8', '42')),
+        ]}).encode('utf-8'))
+        service = mock.Mock(spec=PCOService)
+        service.fetch_person.return_value = self.person('42')
+
+        results = process_webhook_events(service=service)
+
+        service.fetch_person.assert_called_once_with('42', addresses=True)
+        self.assertEqual((results['events'], results['people'], results['created']), (3, 1, 1))
+        self.assertEqual(Volunteer.objects.get(pco_person_id='42').email, 'ada@example.com')
+
+    def test_person_destroyed_archives_the_volunteer(self):
+        volunteer = Volunteer.objects.create(
+            pco_person_id='42', first_name='Ada', last_name='Lovelace')
+        store_deliveries(json.dumps({'data': [
+            delivery('e1', 'people.v2.events.person.destroyed', person_resource('42')),
+        ]}).encode('utf-8'))
+        service = mock.Mock(spec=PCOService)
+        service.fetch_person.return_value = None  # 404 from PCO
+
+        results = process_webhook_events(service=service)
+
+        self.assertEqual(results['archived'], 1)
+        volunteer.refresh_from_db()
+        self.assertTrue(volunteer.is_archived)
+        self.assertEqual(volunteer.status, 'archived')
+
+    @override_settings(PCO_SYNC_ADDRESSES=False)
+    def test_addresses_follow_the_sync_setting(self):
+        Volunteer.objects.create(
+            pco_person_id='42', first_name='Ada', last_name='Lovelace', address='1 Main St')
+        store_deliveries(json.dumps({'data': [
+            delivery('e1', 'people.v2.events.person.updated', person_resource('42')),
+        ]}).encode('utf-8'))
+        service = PCOService()
+        document = mock.Mock(data=[{'id': '42', 'type': 'Person', 'attributes': {
+            'first_name': 'Ada', 'last_name': 'King', 'status': 'active'}}])
+        document.related_one.return_value = None
+
+        with mock.patch.object(service.client, 'get_document', return_value=document) as get:
+            process_webhook_events(service=service)
+
+        url = get.call_args[0][0]
+        self.assertIn('include=emails,phone_numbers&', url)
+        self.assertNotIn('Address', url)
+        volunteer = Volunteer.objects.get(pco_person_id='42')
+        self.assertEqual((volunteer.last_name, volunteer.address), ('King', '1 Main St'))
+
+
+class RosterVersionTests(TestCase):
+
+    def test_upsert_bumps_the_roster_once_after_commit(self):
+        before = DataVersion.current(VOLUNTEERS_VERSION)
+        people = [
+            {'pco_person_id': str(i), 'first_name': f'First{i}', 'last_name': 'Last',
+             'status': 'active', 'is_archived': False}
+            for i in range(3)
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            VolunteerUpserter().upsert(people)
+            self.assertEqual(DataVersion.current(VOLUNTEERS_VERSION), before)
+        self.assertEqual(DataVersion.current(VOLUNTEERS_VERSION), before + 1)
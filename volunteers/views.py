@@ -1,38 +1,60 @@
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
-from .models import Volunteer
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Count, FloatField, Q
+from django.db.models.functions import Cast, NullIf
+from django.utils import timezone
+from .models import Volunteer, SyncJob, Team, TeamMembership
 from .serializers import (
     VolunteerSerializer, VolunteerCreateSerializer,
-    VolunteerUpdateSerializer, VolunteerSummarySerializer
+    VolunteerUpdateSerializer, VolunteerSummarySerializer, SyncJobSerializer,
+    TeamSerializer
 )
-from .services import PCOService, LLMService
+from .autocomplete import DEFAULT_LIMIT, autocomplete
+from .jobs import enqueue_sync, fail_stale_jobs, run_job_in_background
+from .search import VolunteerSearchFilter
+from .sync import set_volunteer_teams
+from .webhooks import SIGNATURE_HEADER, store_deliveries, verify_signature
+from .services import PCOService, LLMService, parse_since
+from core.params import int_param
+from core.sparse import SparseFieldsViewMixin
+from interactions.models import Interaction
 from interactions.serializers import InteractionSerializer
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-class VolunteerViewSet(viewsets.ModelViewSet):
+class VolunteerViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing volunteers
     """
     permission_classes = [IsAuthenticated]
+    # Search runs last so its ranking survives the default ordering
     filter_backends = [DjangoFilterBackend,
-                       filters.SearchFilter, filters.OrderingFilter]
+                       filters.OrderingFilter, VolunteerSearchFilter]
     search_fields = ['first_name', 'last_name', 'email', 'phone']
     ordering_fields = ['last_name', 'first_name', 'created_at']
     ordering = ['last_name', 'first_name']
+    # ?cursor= pagination key, backed by the volunteers name index
+    keyset_ordering = ('last_name', 'first_name', 'id')
 
     def get_queryset(self):
         """
         Return volunteers, excluding archived by default
         Use ?show_archived=true to include archived volunteers
         """
+        # Interaction stats come from annotations, not a query per row,
+        # and are skipped when ?fields= leaves them out
         queryset = Volunteer.objects.all()
+        if self.wants_field('interaction_count', 'last_interaction_date',
+                            'days_since_last_interaction'):
+            queryset = queryset.with_interaction_stats()
 
         # Check if we should show archived volunteers
         show_archived = self.request.query_params.get(
@@ -42,6 +64,13 @@ class VolunteerViewSet(viewsets.ModelViewSet):
             # Default: only show active volunteers
             queryset = queryset.filter(is_archived=False)
 
+        # ?team=<team id or name>, answered from the membership indexes
+        team = self.request.query_params.get('team')
+        if team:
+            memberships = TeamMembership.objects.filter(
+                Q(team_id=int(team)) if team.isdigit() else Q(team__name__iexact=team))
+            queryset = queryset.filter(id__in=memberships.values('volunteer_id'))
+
         return queryset.order_by('last_name', 'first_name')
 
     def get_serializer_class(self):
@@ -95,15 +124,12 @@ class VolunteerViewSet(viewsets.ModelViewSet):
 
         try:
             pco_service = PCOService()
-            teams = pco_service.fetch_person_teams(volunteer.pco_person_id)
-
-            logger.info(f"Teams fetched: {teams}")
+            memberships = pco_service.person_team_memberships(volunteer.pco_person_id)
 
-            # Update volunteer with fetched teams
-            volunteer.teams = teams
-            volunteer.save(update_fields=['teams'])
+            # Update the volunteer's team memberships and name list
+            teams = set_volunteer_teams(volunteer.id, memberships)
 
-            logger.info(f"Teams saved to database: {volunteer.teams}")
+            logger.info(f"Teams saved to database: {teams}")
 
             return Response({'teams': teams})
         except Exception as e:
@@ -137,13 +163,129 @@ class VolunteerViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['post'])
     def sync(self, request):
-        """Sync volunteers from Planning Center Online"""
+        """
+        Queue a sync from Planning Center Online and return the job right away
+        Incremental by default; pass {"full": true}, {"since": "<ISO date>"}
+        or {"teams": true}. Repeat requests return the already active job.
+        Poll GET /api/volunteers/sync/<job id>/ for progress. The job runs
+        in run_sync_worker if PCO_SYNC_WORKER is set, else on a thread here.
+        """
+        kind = SyncJob.KIND_PEOPLE
+        options = {}
+        if str(request.data.get('teams', 'false')).lower() == 'true':
+            kind = SyncJob.KIND_TEAMS
+        elif str(request.data.get('full', 'false')).lower() == 'true':
+            options['full'] = True
+        elif request.data.get('since'):
+            try:
+                options['since'] = parse_since(request.data['since']).isoformat()
+            except ValueError as e:
+                return Response({'error': str(e)},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+        # Without a worker process this web process runs the job itself
+        run_here = not settings.PCO_SYNC_WORKER
         try:
-            pco_service = PCOService()
-            result = pco_service.sync_volunteers()
-            return Response(result)
+            fail_stale_jobs()
+            job, created = enqueue_sync(
+                kind=kind, options=options, requested_by=request.user, start=run_here)
+            if created and run_here:
+                run_job_in_background(job)
         except Exception as e:
             return Response(
                 {'error': f'Failed to sync volunteers: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+        data = SyncJobSerializer(job).data
+        data['already_running'] = not created
+        return Response(data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """
+        Active volunteers whose name, email or phone starts with ?q=, for
+        pickers. Answered from this worker's in-memory index.
+        """
+        try:
+            limit = int(request.query_params.get('limit', DEFAULT_LIMIT))
+        except ValueError:
+            limit = DEFAULT_LIMIT
+        results = autocomplete(request.query_params.get('q', ''), limit=limit)
+        return Response({'results': results})
+
+    @action(detail=False, methods=['get'], url_path=r'sync/(?P<job_id>[0-9]+)')
+    def sync_status(self, request, job_id=None):
+        """Progress and result of a queued sync job"""
+        try:
+            job = SyncJob.objects.get(pk=job_id)
+        except SyncJob.DoesNotExist:
+            return Response({'error': 'Sync job not found'},
+                            status=status.HTTP_404_NOT_FOUND)
+        return Response(SyncJobSerializer(job).data)
+
+
+class TeamViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Teams with their size and care coverage: the share of active members
+    with an interaction in the last ?days= days (default 30, at most 3650)
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = TeamSerializer
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    search_fields = ['name', 'service_type_name']
+    ordering_fields = ['name', 'member_count', 'active_member_count', 'coverage']
+    ordering = ['name']
+
+    def get_queryset(self):
+        days = int_param(self.request.query_params, 'days', 30, 0, 3650)
+        cutoff = timezone.now().date() - timedelta(days=days)
+        contacted = Interaction.objects.filter(
+            interaction_date__gte=cutoff).values('volunteer_id')
+        active = Q(memberships__volunteer__is_archived=False)
+
+        return Team.objects.annotate(
+            member_count=Count('memberships'),
+            active_member_count=Count('memberships', filter=active),
+            leader_count=Count(
+                'memberships',
+                filter=active & Q(memberships__role=TeamMembership.ROLE_LEADER)),
+            contacted_count=Count(
+                'memberships',
+                filter=active & Q(memberships__volunteer_id__in=contacted)),
+        ).annotate(
+            coverage=Cast('contacted_count', FloatField())
+            / NullIf('active_member_count', 0),
+        )
+
+
+class PCOWebhookView(APIView):
+    """
+    Receive Planning Center webhook deliveries.
+
+    Only verifies and queues the events; process_pco_webhooks applies them,
+    so PCO gets its acknowledgement without waiting on any API calls.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        body = request.body
+        if not verify_signature(body, request.headers.get(SIGNATURE_HEADER)):
+            return Response(
+                {'error': 'Invalid webhook signature'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+
+        try:
+            received, stored = store_deliveries(body)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Malformed PCO webhook delivery: {e}")
+            return Response(
+                {'error': 'Malformed webhook delivery'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if stored < received:
+            logger.info(f"PCO webhook: {received - stored} of {received} deliveries already stored")
+        return Response({'received': received, 'stored': stored}, status=status.HTTP_202_ACCEPTED)
@@ -0,0 +1,159 @@
+"""
+Planning Center webhook deliveries: signature checks, the event inbox and
+the worker that turns queued events into volunteer updates.
+"""
+import hashlib
+import hmac
+import json
+import logging
+from collections import defaultdict
+from django.conf import settings
+from django.utils import timezone
+from .models import PCOWebhookEvent, Volunteer, volunteers_changed
+from .services import PCOService
+from .sync import VolunteerUpserter, set_volunteer_teams, sync_fields
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = 'X-PCO-Webhooks-Authenticity'
+
+
+def webhook_secrets():
+    return [
+        secret.strip() for secret in settings.PCO_WEBHOOK_SECRETS.split(',')
+        if secret.strip()
+    ]
+
+
+def sign(body, secret):
+    """Hex HMAC-SHA256 of a delivery body, as sent by PCO"""
+    return hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(body, signature):
+    """Check a delivery against every configured secret (one per subscription)"""
+    if not signature:
+        return False
+    return any(
+        hmac.compare_digest(sign(body, secret), signature)
+        for secret in webhook_secrets()
+    )
+
+
+def _person_id(resource):
+    """PCO person id a webhook resource is about"""
+    if resource.get('type') == 'Person':
+        return resource.get('id') or ''
+    person = ((resource.get('relationships') or {}).get('person') or {}).get('data')
+    return (person or {}).get('id') or ''
+
+
+def parse_deliveries(body):
+    """
+    Turn a webhook POST body ({"data": [EventDelivery, ...]}) into unsaved
+    PCOWebhookEvent rows. The delivery's payload attribute is itself a JSON
+    string holding the affected resource.
+    """
+    events = []
+    for delivery in json.loads(body).get('data') or []:
+        attributes = delivery.get('attributes') or {}
+        payload = attributes.get('payload') or {}
+        if isinstance(payload, str):
+            payload = json.loads(payload)
+        resource = payload.get('data') or {}
+
+        events.append(PCOWebhookEvent(
+            event_id=delivery['id'],
+            name=attributes.get('name', ''),
+            person_id=_person_id(resource),
+            payload=payload,
+        ))
+    return events
+
+
+def store_deliveries(body):
+    """
+    Append deliveries to the inbox, ignoring redelivered event ids.
+    Returns (deliveries received, events stored).
+    """
+    events = parse_deliveries(body)
+    # bulk_create can't report which rows ignore_conflicts dropped, so
+    # count the event ids that weren't in the inbox yet
+    event_ids = {event.event_id for event in events}
+    known = set(PCOWebhookEvent.objects.filter(
+        event_id__in=event_ids).values_list('event_id', flat=True))
+    PCOWebhookEvent.objects.bulk_create(events, ignore_conflicts=True)
+    return len(events), len(event_ids - known)
+
+
+def process_webhook_events(service=None, limit=1000):
+    """
+    Drain the inbox. Events are coalesced per person so a burst of
+    person/email/phone/address changes costs one PCO fetch and one upsert
+    per person. Events whose fetch fails stay queued for the next run.
+    """
+    results = {
+        'events': 0, 'people': 0, 'created': 0, 'updated': 0,
+        'unchanged': 0, 'archived': 0, 'teams_updated': 0, 'errors': [],
+    }
+
+    events = list(PCOWebhookEvent.objects.filter(
+        processed_at__isnull=True
+    ).order_by('received_at', 'id').only('id', 'name', 'person_id')[:limit])
+    if not events:
+        return results
+
+    by_person = defaultdict(list)
+    for event in events:
+        by_person[event.person_id].append(event)
+    # Events we cannot tie to a person have nothing to refresh
+    done = [event.id for event in by_person.pop('', [])]
+
+    service = service or PCOService()
+    # The same fields as the people sync, so the two agree on fingerprints
+    addresses = settings.PCO_SYNC_ADDRESSES
+    people = []
+    team_lists = {}
+    for person_id, person_events in by_person.items():
+        try:
+            person = service.fetch_person(person_id, addresses=addresses)
+            if person is not None and any('team' in event.name for event in person_events):
+                team_lists[person_id] = service.person_team_memberships(person_id)
+        except Exception as e:
+            logger.error(f"Error fetching PCO person {person_id} for webhooks: {e}")
+            results['errors'].append({'id': person_id, 'error': str(e)})
+            continue
+
+        if person is None:
+            # Deleted in PCO; keep the volunteer and its history
+            archived = Volunteer.objects.filter(
+                pco_person_id=person_id, is_archived=False
+            ).update(is_archived=True, status='archived', updated_at=timezone.now())
+            if archived:
+                volunteers_changed()
+            results['archived'] += archived
+        else:
+            people.append(person)
+        done.extend(event.id for event in person_events)
+
+    counts = VolunteerUpserter(fields=sync_fields(addresses)).upsert(people)
+    failed = {error['id'] for error in counts['errors']}
+    volunteer_ids = dict(Volunteer.objects.filter(
+        pco_person_id__in=list(team_lists)
+    ).values_list('pco_person_id', 'id'))
+    for person_id, teams in team_lists.items():
+        if person_id not in failed and person_id in volunteer_ids:
+            set_volunteer_teams(volunteer_ids[person_id], teams)
+            results['teams_updated'] += 1
+
+    done = set(done)
+    done = [event.id for event in events
+            if event.id in done and event.person_id not in failed]
+    PCOWebhookEvent.objects.filter(id__in=done).update(processed_at=timezone.now())
+
+    results['events'] = len(done)
+    results['people'] = len(people)
+    for key in ('created', 'updated', 'unchanged'):
+        results[key] = counts[key]
+    results['errors'].extend(counts['errors'])
+    return results